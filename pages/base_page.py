@@ -4,9 +4,14 @@ Base Page Object Model class.
 import os
 import time
 import logging
-from typing import List, Tuple, Optional
+from typing import Dict, Iterable, List, Tuple, Optional
 from selenium.webdriver.remote.webdriver import WebDriver
 from utils.wait_helper import WaitHelper
+from utils.locator_health import LocatorSet, get_locator_index
+from utils.dom_probe import probe_locators
+from utils.dom_snapshot import DomSnapshot, active_snapshot, invalidate_snapshot, take_snapshot
+from utils.site import site_url
+from utils.web_vitals import bind_page, harvest_vitals
 from selenium.common.exceptions import (
     TimeoutException,
     StaleElementReferenceException,
@@ -15,27 +20,107 @@ from selenium.common.exceptions import (
 
 DEFAULT_TIMEOUT = 10
 
+
+def page_changing(driver) -> None:
+    """
+    The driver's page is about to change (action, navigation or refresh):
+    record the page's metrics and drop the snapshot.
+
+    Args:
+        driver: WebDriver instance
+    """
+    harvest_vitals(driver)
+    invalidate_snapshot(driver)
+
 class BasePage:
     """
     BasePage: All page objects inherit from this class.
     Handles common Selenium actions with logging and wait mechanisms.
     """
 
+    # Upper limits for the page's metrics (see utils.web_vitals.BUDGET_METRICS)
+    PERF_BUDGETS: Dict[str, float] = {}
+
     def __init__(self, driver: WebDriver):
         self.driver = driver
         self.logger = logging.getLogger(self.__class__.__name__)
         self.logger.setLevel(logging.INFO)
         self.wait = WaitHelper(driver, timeout=DEFAULT_TIMEOUT)
+        self.locator_index = get_locator_index()
+        bind_page(driver, self.__class__.__name__, self.PERF_BUDGETS)
+
+    # ------------------
+    # Snapshot
+    # ------------------
+    def snapshot(self) -> DomSnapshot:
+        """
+        Take a DOM snapshot; read-only queries of page objects on this
+        driver use it until the next action invalidates it.
+        
+        Returns:
+            DomSnapshot: Fresh snapshot of the current page
+        """
+        return take_snapshot(self.driver)
+
+    @property
+    def current_snapshot(self) -> Optional[DomSnapshot]:
+        """Active snapshot of this driver, or None when reads must go to the live page."""
+        return active_snapshot(self.driver)
+
+    def invalidate_snapshot(self) -> None:
+        """Drop the driver's active snapshot."""
+        invalidate_snapshot(self.driver)
+
+    def _before_action(self) -> None:
+        """Page state is about to change: record the page's metrics and drop the snapshot."""
+        page_changing(self.driver)
 
     # ------------------
     # Navigation
     # ------------------
     def navigate_to(self, url: str) -> None:
         """Navigate to URL and wait for page load."""
+        self._before_action()
+        url = site_url(url)
         self.driver.get(url)
         self.wait.wait_for_page_load()
+        # A document this page object navigated to is its own, whatever object acts on it next
+        harvest_vitals(self.driver)
         self.logger.info(f"Navigated to: {url}")
 
+    # ------------------
+    # Locator Resolution
+    # ------------------
+    def resolve(self, locator, timeout: int = DEFAULT_TIMEOUT) -> Tuple[str, str]:
+        """
+        Resolve a LocatorSet to its fastest working alternative.
+        
+        Args:
+            locator: Tuple of (By, value) or LocatorSet of alternatives
+            timeout: Maximum wait time in seconds
+            
+        Returns:
+            Tuple[str, str]: Concrete (By, value) locator
+        """
+        if isinstance(locator, LocatorSet):
+            return self.locator_index.resolve(self.driver, locator, timeout)
+        return locator
+
+    def resolve_all(self, locator, timeout: int = DEFAULT_TIMEOUT) -> Tuple[Tuple[str, str], List]:
+        """
+        Resolve a locator and return its current matches in the same pass.
+        
+        Args:
+            locator: Tuple of (By, value) or LocatorSet of alternatives
+            timeout: Maximum wait time in seconds for a LocatorSet to match
+            
+        Returns:
+            Tuple: Concrete (By, value) locator and the elements it matched
+        """
+        if isinstance(locator, LocatorSet):
+            return self.locator_index.resolve_elements(self.driver, locator, timeout)
+        return locator, self.driver.find_elements(*locator)
+
     # ------------------
     # Find Methods
     # ------------------
@@ -50,6 +135,7 @@ class BasePage:
         Returns:
             WebElement: The found element
         """
+        locator = self.resolve(locator, timeout)
         self.wait.for_element_visible(locator, timeout)
         return self.driver.find_element(*locator)
 
@@ -64,6 +150,7 @@ class BasePage:
         Returns:
             List[WebElement]: List of found elements
         """
+        locator = self.resolve(locator, timeout)
         self.wait.for_element_visible(locator, timeout)
         return self.driver.find_elements(*locator)
 
@@ -78,6 +165,8 @@ class BasePage:
             locator: Tuple of (By, value) for element location
             timeout: Maximum wait time in seconds
         """
+        self._before_action()
+        locator = self.resolve(locator, timeout)
         try:
             self.wait.for_element_clickable(locator, timeout)
             self.driver.find_element(*locator).click()
@@ -100,6 +189,7 @@ class BasePage:
         Raises:
             IndexError: If index is out of range
         """
+        self._before_action()
         elements = self.find_all(locator, timeout)
         if index < 1 or index > len(elements):
             raise IndexError(f"Index {index} out of range. Found {len(elements)} elements.")
@@ -116,6 +206,8 @@ class BasePage:
             timeout: Maximum wait time in seconds
             clear: Whether to clear field before typing
         """
+        self._before_action()
+        locator = self.resolve(locator, timeout)
         self.wait.for_element_visible(locator, timeout)
         element = self.driver.find_element(*locator)
         if clear:
@@ -131,6 +223,8 @@ class BasePage:
             locator: Tuple of (By, value) for element location
             timeout: Maximum wait time in seconds
         """
+        self._before_action()
+        locator = self.resolve(locator, timeout)
         self.wait.for_element_visible(locator, timeout)
         element = self.driver.find_element(*locator)
         self.driver.execute_script("arguments[0].click();", element)
@@ -147,6 +241,8 @@ class BasePage:
             locator: Tuple of (By, value) for element location
             timeout: Maximum wait time in seconds
         """
+        self._before_action()
+        locator = self.resolve(locator, timeout)
         self.wait.for_element_visible(locator, timeout)
         element = self.driver.find_element(*locator)
         self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
@@ -184,6 +280,7 @@ class BasePage:
             locator: Tuple of (By, value) for element location
             timeout: Maximum wait time in seconds
         """
+        locator = self.resolve(locator, timeout)
         self.wait.for_element_visible(locator, timeout)
         self.logger.info(f"Element is visible: {locator}")
 
@@ -195,6 +292,7 @@ class BasePage:
             locator: Tuple of (By, value) for element location
             timeout: Maximum wait time in seconds
         """
+        locator = self.resolve(locator, timeout)
         self.wait.for_element_clickable(locator, timeout)
         self.logger.info(f"Element is clickable: {locator}")
 
@@ -217,6 +315,24 @@ class BasePage:
         self.logger.info(f"Got text '{text}' from: {locator}")
         return text
 
+    def probe(self, locators: Iterable) -> Dict[tuple, dict]:
+        """
+        Check presence, visibility and count of several locators in one script call.
+        
+        Never raises and never waits, so a page can inspect all of its
+        conditional UI at once.
+        
+        Args:
+            locators: Iterable of (By, value) tuples or LocatorSets
+            
+        Returns:
+            Dict[tuple, dict]: locator -> {"present": bool, "visible": bool (any match),
+            "first_visible": bool (first match), "count": int}
+        """
+        results = probe_locators(self.driver, locators)
+        self.logger.debug(f"Probed {len(results)} locators")
+        return results
+
     def is_element_present(self, locator: Tuple[str, str]) -> bool:
         """
         Check if element is present in DOM (without waiting).
@@ -227,24 +343,18 @@ class BasePage:
         Returns:
             bool: True if element exists, False otherwise
         """
-        try:
-            self.driver.find_element(*locator)
-            return True
-        except:
-            return False
+        return self.probe([locator])[locator]["present"]
 
     def is_element_visible(self, locator: Tuple[str, str]) -> bool:
         """
         Check if element is visible (without waiting).
         
+        Like ``find_element(...).is_displayed()``, only the first match counts.
+        
         Args:
             locator: Tuple of (By, value) for element location
             
         Returns:
             bool: True if element is visible, False otherwise
         """
-        try:
-            element = self.driver.find_element(*locator)
-            return element.is_displayed()
-        except:
-            return False
+        return self.probe([locator])[locator]["first_visible"]
@@ -17,6 +17,9 @@ class HomePage(BasePage):
     
     HOME_URL = "https://www.n11.com"
 
+    # Core Web Vitals "good" thresholds
+    PERF_BUDGETS = {"lcp_ms": 2500, "cls": 0.1, "ttfb_ms": 800}
+
     def __init__(self, driver):
         """Initialize HomePage."""
         super().__init__(driver)
@@ -0,0 +1,96 @@
+"""
+Product card and SKU variant records read from result listings.
+"""
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+# Maps one product card element to a plain record inside the browser.
+# textContent is used (not innerText) so the same mapper works on
+# prefetched pages parsed with DOMParser, which are never rendered.
+PRODUCT_CARD_MAPPER_JS = """
+function (el) {
+    const text = sel => {
+        const node = el.querySelector(sel);
+        return node ? node.textContent.replace(/\\s+/g, ' ').trim() : '';
+    };
+    const link = el.querySelector('a[href]');
+    const rating = el.querySelector('.rating');
+    const stars = rating && rating.className.match(/\\br(\\d+)\\b/);
+    return {
+        title: text('.productName') || (link && link.getAttribute('title')) || '',
+        url: link ? link.href : '',
+        price: text('.newPrice ins') || text('.newPrice') || text('.price'),
+        rating: stars ? Number(stars[1]) / 20 : null,
+        comment_count: text('.ratingCont > .ratingText'),
+        free_shipping: !!el.querySelector('.cargoBadgeField'),
+    };
+}
+"""
+
+
+def parse_price(text: str) -> Optional[float]:
+    """
+    Parses a Turkish formatted price such as "1.299,90 TL".
+
+    Args:
+        text: Price text
+
+    Returns:
+        Price as float, None when the text holds no number
+    """
+    match = re.search(r"\d[\d.]*(?:,\d+)?", text or "")
+    if not match:
+        return None
+    return float(match.group(0).replace(".", "").replace(",", "."))
+
+
+def parse_count(text: str) -> int:
+    """Keeps only the digits of a count text such as "(1.234)"."""
+    digits = re.sub(r"[^\d]", "", text or "")
+    return int(digits) if digits else 0
+
+
+@dataclass
+class ProductCard:
+    """One product of a result listing."""
+
+    title: str
+    url: str
+    price: Optional[float]
+    rating: Optional[float]
+    comment_count: int
+    free_shipping: bool
+    position: int = 0
+
+    @classmethod
+    def from_record(cls, record: dict, position: int = 0) -> "ProductCard":
+        """
+        Builds a card from a record produced by ``PRODUCT_CARD_MAPPER_JS``.
+
+        Args:
+            record: Raw record read in the browser
+            position: 1-based position in the whole listing
+
+        Returns:
+            ProductCard: Parsed card
+        """
+        return cls(
+            title=record.get("title", ""),
+            url=record.get("url", ""),
+            price=parse_price(record.get("price", "")),
+            rating=record.get("rating"),
+            comment_count=parse_count(record.get("comment_count", "")),
+            free_shipping=bool(record.get("free_shipping")),
+            position=position,
+        )
+
+
+@dataclass
+class SkuVariant:
+    """One SKU variant of the product whose variant panel is open."""
+
+    index: int
+    label: str
+    available: bool
+    selected: bool
@@ -3,14 +3,42 @@ N11 Product Listing Page Object Model.
 """
 import logging
 import time
-import re
+from typing import List, Optional, Tuple
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
-from pages.base_page import BasePage
+from pages.base_page import BasePage, page_changing
+from utils.wait_helper import WaitHelper
+from utils.locator_health import LocatorSet
+from utils.list_stream import ListStream
+from pages.product_card import PRODUCT_CARD_MAPPER_JS, ProductCard, SkuVariant
+from utils.sort_verifier import SortCheckResult, check_sort_order
+from utils.dom_snapshot import hidden_by_markup, normalize_text
+from utils.site import site_url
+from utils.listing_url import UrlEncodings, get_url_encodings, is_unfiltered, listing_steps, search_url, with_params
 
 
+# Combined "SKU panel ready" / "added without panel" condition; null keeps the wait going
+_SKU_STATE_SCRIPT = """
+const [skuSelector, addedSelector] = arguments;
+const visible = el => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+const items = Array.from(document.querySelectorAll(skuSelector));
+if (items.some(visible)) {
+    if (document.readyState !== 'complete') return null;
+    return {variants: items.map((el, i) => ({
+        index: i + 1,
+        label: el.textContent.replace(/\\s+/g, ' ').trim(),
+        available: !/disabled|passive|sold-?out|out-of-stock/i.test(el.className)
+            && el.getAttribute('aria-disabled') !== 'true',
+        selected: /selected|active|checked/i.test(el.className)
+            || el.getAttribute('aria-checked') === 'true' || el.getAttribute('aria-selected') === 'true',
+    }))};
+}
+const added = document.querySelector(addedSelector);
+return added && visible(added) ? {variants: []} : null;
+"""
+
 class SearchResultPage(BasePage):
     """N11 Product Listing page for search results."""
 
@@ -24,15 +52,26 @@ class SearchResultPage(BasePage):
     _JS_ADD_BASKET_SKU = (By.ID, "js-addBasketSku")
     _BASKET_ICON = (By.CSS_SELECTOR, ".basket-icon")
     _PROD_DETAIL = (By.CSS_SELECTOR, ".prodDetail")
-    _RATING_TEXT = (By.CSS_SELECTOR, ".ratingCont > .ratingText")
     _CARGO_BADGE_FIELD = (By.CSS_SELECTOR, ".cargoBadgeField")
     _IMG_HOLDER = (By.CSS_SELECTOR, ".imgHolder")
+    _PRODUCT_CARDS = LocatorSet(
+        "product cards",
+        (By.CSS_SELECTOR, ".productList > li.column"),
+        (By.CSS_SELECTOR, ".productList .productItem"),
+    )
+    _NEXT_PAGE = (By.CSS_SELECTOR, ".pagination a.next")
     
     # Filter and sort locators
     _ICON_SORT_BY = (By.CSS_SELECTOR, ".iconSortBy")
     _ITEM_I4 = (By.CSS_SELECTOR, ".item.i4")
     _CARGO_FILTER = (By.CSS_SELECTOR, ".filter.cargoFilter.acc")
     _FREE_SHIPMENT_OPTION = (By.ID, "freeShipmentOption")
+    # XPath alternatives so a label can be indexed over the whole document
+    _BRAND_LABELS = LocatorSet(
+        "brand filter labels",
+        (By.XPATH, "//label[starts-with(@for, 'brand-m-')]"),
+        (By.XPATH, "//label[contains(@for, 'brand-m-')]"),
+    )
 
     # Private locators for result view page
     RESULT_VIEW = (By.CSS_SELECTOR, ".resultView")
@@ -41,14 +80,143 @@ class SearchResultPage(BasePage):
     STORE_PRODUCTS = (By.CSS_SELECTOR, ".storeProducts")
     RESULT_TEXT = (By.CSS_SELECTOR, ".resultText")
 
+    # Listings are heavier than the home page; INP covers the filter/sort clicks
+    PERF_BUDGETS = {"lcp_ms": 3000, "cls": 0.1, "inp_ms": 200}
+
     def __init__(self, driver):
         """Initialize ProductListingPage."""
         super().__init__(driver)
         self.logger = logging.getLogger(__name__)
         # URL'e navigate etmeye gerek yok, zaten result sayfasındayız
+        self.clicked_steps = []
         
         self.check()
 
+    @classmethod
+    def open(cls, driver, url: str) -> "SearchResultPage":
+        """
+        Navigates straight to a result URL (search, store or filtered listing).
+
+        Args:
+            driver: WebDriver instance
+            url: Result page URL
+
+        Returns:
+            SearchResultPage: Page object for the loaded result page
+        """
+        url = site_url(url)
+        # The previous page's snapshot must not answer for the new one
+        page_changing(driver)
+        driver.get(url)
+        WaitHelper(driver).wait_for_page_load()
+        logging.getLogger(__name__).info(f"Opened result page: {url}")
+        return cls(driver)
+
+    @staticmethod
+    def build_url(keyword: str, brand_index: Optional[int] = None, sort_option: Optional[int] = None,
+                  free_shipping: bool = False, encodings: Optional[UrlEncodings] = None) -> Tuple[str, List[str]]:
+        """
+        Builds the listing URL for a search/filter/sort state.
+        
+        Every step whose URL encoding has been learned is put into the query,
+        up to the first step that still has to be learned; from there on
+        every step is clicked after navigation, so each one is applied (and
+        learned) on the same page state as in the UI.
+        
+        Args:
+            keyword: Search keyword
+            brand_index: Brand checkbox index (1-based, None: no brand filter)
+            sort_option: Sort option number (None: default order)
+            free_shipping: Only products with free shipping
+            encodings: Learned URL encodings (default: process-wide encodings)
+            
+        Returns:
+            (url, step keys that still need a UI click)
+        """
+        encodings = encodings or get_url_encodings()
+        url = search_url(keyword)
+        pending = []
+        learning = False
+        for step in listing_steps(keyword, brand_index, sort_option, free_shipping):
+            learning = learning or not encodings.is_known(step)
+            params = encodings.get(step)
+            if params and not learning:
+                url = with_params(url, params)
+            else:
+                pending.append(step)
+        return url, pending
+
+    @classmethod
+    def open_listing(cls, driver, keyword: str, brand_index: Optional[int] = None, sort_option: Optional[int] = None,
+                     free_shipping: bool = False, encodings: Optional[UrlEncodings] = None) -> "SearchResultPage":
+        """
+        Opens a listing state with one navigation, clicking only the steps
+        the URL cannot express yet (their encoding is learned on the way).
+        
+        Args:
+            driver: WebDriver instance
+            keyword: Search keyword
+            brand_index: Brand checkbox index (1-based, None: no brand filter)
+            sort_option: Sort option number (None: default order)
+            free_shipping: Only products with free shipping
+            encodings: Learned URL encodings (default: process-wide encodings)
+            
+        Returns:
+            SearchResultPage: Page in the requested state; ``clicked_steps`` lists
+            the steps that were clicked
+        """
+        encodings = encodings or get_url_encodings()
+        url, pending = cls.build_url(keyword, brand_index, sort_option, free_shipping, encodings)
+        page = cls.open(driver, url)
+        if brand_index is not None:
+            brand_step = listing_steps(keyword, brand_index)[0]
+            if brand_step not in pending and not page.is_brand_selected(brand_index):
+                # The brand list changed since the encoding was learned; click it again
+                page.logger.warning(f"{brand_step} no longer selects brand {brand_index}, learning it again")
+                encodings.forget(brand_step)
+                return cls.open_listing(driver, keyword, brand_index, sort_option, free_shipping, encodings)
+        for step in pending:
+            page.apply_step(step, encodings)
+        page.clicked_steps = pending
+        return page
+
+    def apply_step(self, step: str, encodings: Optional[UrlEncodings] = None) -> None:
+        """
+        Applies one listing step through the UI and learns its URL encoding.
+        
+        Args:
+            step: Step key from ``listing_steps`` (e.g. "sort:4")
+            encodings: Learned URL encodings (default: process-wide encodings)
+        """
+        encodings = encodings or get_url_encodings()
+        before = self.driver.current_url
+        kind, value = step.split(":")[0], step.split(":")[-1]
+        if kind == "brand":
+            self.click_brand_checkbox_by_index(int(value))
+        elif kind == "sort":
+            self.click_sort_by_icon()
+            self.click_sort_option(int(value))
+        elif step == "free_shipping":
+            self.click_cargo_filter()
+            self.click_free_shipment_option()
+        else:
+            raise ValueError(f"Unknown listing step: {step}")
+
+        try:
+            WebDriverWait(self.driver, 10).until(lambda driver: driver.current_url != before)
+            self.wait.wait_for_page_load()
+        except TimeoutException:
+            # Nothing to learn from a click whose effect never reached the URL
+            self.logger.info(f"URL did not change after step {step}")
+            return
+        if encodings.is_known(step):
+            return
+        if kind == "brand" and not is_unfiltered(before):
+            # Brand indexes refer to the unfiltered brand list of the keyword
+            self.logger.info(f"Not learning {step}: the listing was already filtered")
+            return
+        encodings.learn(step, before, self.driver.current_url)
+
     def check(self):
         """Check if search result page is loaded correctly by verifying add to cart button visibility."""
         try:
@@ -116,8 +284,11 @@ class SearchResultPage(BasePage):
             H1 text (e.g., "saatgroup")
         """
         try:
-            result_element = self.find(self.RESULT_TEXT)
-            result_text = result_element.text.strip()
+            snapshot = self.current_snapshot
+            if snapshot:
+                result_text = snapshot.text(self.RESULT_TEXT)
+            else:
+                result_text = self.find(self.RESULT_TEXT).text.strip()
             self.logger.info(f"Found result text: {result_text}")
             return result_text
         except Exception as e:
@@ -149,6 +320,7 @@ class SearchResultPage(BasePage):
         Args:
             index: Index of add to cart button to click (1-based, default: 1)
         """
+        self._before_action()
         try:
             # Tüm add to cart buttonları bul
             elements = self.driver.find_elements(*self._ADD_TO_CART_BUTTON)
@@ -181,6 +353,7 @@ class SearchResultPage(BasePage):
     # Private yardımcı metodlar - Kod tekrarını önler
     def _click_element_by_index(self, locator: tuple, index: int, element_name: str) -> None:
         """Generic method to click element by index."""
+        self._before_action()
         try:
             # Tüm elementleri bul
             elements = self.driver.find_elements(*locator)
@@ -225,14 +398,114 @@ class SearchResultPage(BasePage):
             Number of items found
         """
         try:
-            elements = self.driver.find_elements(*locator)
-            count = len(elements)
+            snapshot = self.current_snapshot
+            count = snapshot.count(locator) if snapshot else len(self.driver.find_elements(*locator))
             self.logger.info(f"Found {count} {item_name} elements")
             return count
         except Exception as e:
             self.logger.error(f"Error getting {item_name} count: {e}")
             return 0
     
+    def iter_product_batches(self, batch_size: int = 24, max_items: int = None):
+        """
+        Streams the product cards of the listing batch by batch.
+        
+        Lazily loaded cards are reached by scrolling and later result pages
+        are fetched in the background, so the whole listing is covered
+        without holding it in memory.
+        
+        Args:
+            batch_size: Cards per batch (default: 24)
+            max_items: Stop after this many cards (default: whole listing)
+            
+        Yields:
+            List of ProductCard
+        """
+        _, cards = self.resolve(self._PRODUCT_CARDS, timeout=0)
+        stream = ListStream(self.driver, cards, PRODUCT_CARD_MAPPER_JS, batch_size=batch_size,
+                            next_selector=self._NEXT_PAGE[1], max_items=max_items)
+        position = 0
+        for records in stream:
+            batch = []
+            for record in records:
+                position += 1
+                batch.append(ProductCard.from_record(record, position))
+            yield batch
+
+    def resolve_skus(self, timeout: int = 10) -> List[SkuVariant]:
+        """
+        Waits for the add-to-cart result in one combined condition: either the
+        SKU panel is shown, or the product went to the cart without a panel.
+        
+        Args:
+            timeout: Seconds to wait for either outcome (default: 10)
+            
+        Returns:
+            Every SKU variant with availability and selection state (empty list
+            when the product went to the cart without a SKU panel)
+            
+        Raises:
+            TimeoutException: If neither outcome appeared within ``timeout``
+        """
+        try:
+            state = WebDriverWait(self.driver, timeout, poll_frequency=0.2).until(lambda driver: self._sku_state())
+        except TimeoutException:
+            # Not the same as "no SKU panel": nothing happened at all
+            raise TimeoutException(f"Neither SKU panel nor cart confirmation appeared within {timeout}s")
+        variants = [SkuVariant(**variant) for variant in state["variants"]]
+        self.logger.info(f"SKU panel: {len(variants)} variants "
+                         f"({sum(v.available for v in variants)} available)" if variants else "Product has no SKU panel")
+        return variants
+
+    def select_skus(self, indexes: List[int]) -> List[SkuVariant]:
+        """
+        Selects SKU variants one by one, skipping unavailable ones.
+        
+        Every variant is clicked through ``click`` and the panel's re-render
+        is awaited before the next one, since a selection can change which
+        variants are available.
+        
+        Args:
+            indexes: 1-based variant indexes, clicked in the given order
+            
+        Returns:
+            Variant states after the selection
+        """
+        clicked, skipped = [], []
+        for index in indexes:
+            state = self._sku_state() or {"variants": []}
+            variant = next((v for v in state["variants"] if v["index"] == index), None)
+            if variant is None or not variant["available"]:
+                skipped.append(index)
+                continue
+            locator = self._sku_locator(index)
+            before = self.driver.find_element(*locator)
+            self.click(locator)
+            try:
+                # Re-rendered: the node was replaced, or it now shows as selected
+                WebDriverWait(self.driver, 5, poll_frequency=0.1).until(
+                    lambda driver: EC.staleness_of(before)(driver) or self._sku_selected(index)
+                )
+            except TimeoutException:
+                self.logger.warning(f"SKU panel did not update after selecting variant {index}")
+            clicked.append(index)
+        if skipped:
+            self.logger.warning(f"Skipped missing or unavailable SKU variants: {skipped}")
+        self.logger.info(f"Selected SKU variants: {clicked}")
+        return self.resolve_skus(timeout=2)
+
+    def _sku_state(self) -> Optional[dict]:
+        """SKU panel state ({"variants": [...]}), None while neither the panel nor the cart confirmation shows."""
+        return self.driver.execute_script(_SKU_STATE_SCRIPT, self._SKUS_ITEM[1], self._ITEMS_INFO[1])
+
+    def _sku_selected(self, index: int) -> bool:
+        state = self._sku_state()
+        return bool(state) and any(v["index"] == index and v["selected"] for v in state["variants"])
+
+    def _sku_locator(self, index: int) -> tuple:
+        """Locator of the SKU variant at a 1-based index over the whole panel."""
+        return (By.XPATH, f"(//*[contains(concat(' ', normalize-space(@class), ' '), ' skus-item ')])[{index}]")
+
     def get_skus_items_count(self) -> int:
         """
         Gets the number of SKUS items available.
@@ -263,15 +536,8 @@ class SearchResultPage(BasePage):
             True if SKU items exist, False otherwise
         """
         try:
-            # Sayfa tamamen yüklenene kadar bekle
-            self.wait.wait_for_page_load(timeout=5)
-            
-            # DOM'un sakinleşmesini bekle
-            self.wait.dom_idle(idle_ms=500, timeout=5)
-            
-            skus_count = self.get_skus_items_count()
-            has_skus = skus_count > 0
-            self.logger.info(f"Product has SKUs: {has_skus} (count: {skus_count})")
+            has_skus = bool(self.resolve_skus())
+            self.logger.info(f"Product has SKUs: {has_skus}")
             return has_skus
         except Exception as e:
             self.logger.error(f"Error checking SKUs existence: {e}")
@@ -284,10 +550,33 @@ class SearchResultPage(BasePage):
         Args:
             index: Index of brand checkbox to click (1-based)
         """
-        locator = (By.XPATH, f"(//label[contains(@for, 'brand-m-')])[{index}]")
-        self.click(locator)
+        self.click(self._brand_label_locator(index))
         self.logger.info(f"Clicked brand checkbox at index: {index}")
     
+    def is_brand_selected(self, index: int) -> bool:
+        """
+        Checks whether the brand checkbox at an index is checked.
+        
+        Args:
+            index: Brand checkbox index (1-based)
+            
+        Returns:
+            True if the label's checkbox is checked
+        """
+        try:
+            label = self.find(self._brand_label_locator(index), timeout=5)
+        except TimeoutException:
+            return False
+        return bool(self.driver.execute_script(
+            "const input = document.getElementById(arguments[0].htmlFor); return !!input && input.checked;",
+            label,
+        ))
+
+    def _brand_label_locator(self, index: int) -> tuple:
+        """Indexed brand label locator built on the fastest working label locator."""
+        by, labels = self.resolve(self._BRAND_LABELS)
+        return (by, f"({labels})[{index}]")
+
     def click_sort_option(self, option_number: int) -> None:
         """
         Clicks on sort option by number.
@@ -326,63 +615,49 @@ class SearchResultPage(BasePage):
         self.logger.info(f"Found {prod_detail_count} prod detail elements")
         return prod_detail_count
     
-    def get_rating_text_by_index(self, index: int) -> str:
+    def verify_sort_order(self, field: str, descending: bool = True, count: int = 100,
+                          batch_size: int = 48) -> SortCheckResult:
         """
-        Gets the rating text by index with only numbers extracted.
+        Verifies the listing is sorted by a product card field over the first
+        ``count`` products, following result pages as needed.
         
         Args:
-            index: Index of rating element (1-based)
+            field: ProductCard field - "price", "rating" or "comment_count"
+            descending: Expect biggest first (default: True)
+            count: Number of products to check (default: 100)
+            batch_size: Products read per script call (default: 48)
             
         Returns:
-            Rating text with only numeric characters
+            SortCheckResult with the first offending pair when the order is broken
         """
-        try:
-            rating_elements = self.driver.find_elements(*self._RATING_TEXT)
-            if index < 1 or index > len(rating_elements):
-                self.logger.error(f"Index {index} out of range. Found {len(rating_elements)} rating elements")
-                return "0"
-            
-            rating_element = rating_elements[index - 1]  # 1-based index
-            rating_text = rating_element.text
-            cleaned = re.sub(r"[^\d]", "", rating_text)
-            self.logger.info(f"Rating at index {index}: {rating_text}, cleaned: {cleaned}")
-            return cleaned
-        except Exception as e:
-            self.logger.error(f"Error getting rating at index {index}: {e}")
-            return "0"
+        batches = self.iter_product_batches(batch_size=min(batch_size, count), max_items=count)
+        result = check_sort_order(batches, field, descending=descending)
+        direction = "descending" if descending else "ascending"
+        if result.ok:
+            self.logger.info(f"✅ {result.checked} products sorted {direction} by {field} ({result.skipped} without value)")
+        else:
+            self.logger.error(f"❌ Not sorted {direction}: {result.violation}")
+        return result
 
-    def verify_rating_sort_descending(self, count: int = 5) -> bool:
+    def _read_cargo_badges(self) -> List[Tuple[str, str]]:
         """
-        Verifies that ratings are sorted in descending order (biggest to smallest).
-        
-        Args:
-            count: Number of ratings to check (default: 5)
-            
-        Returns:
-            True if ratings are sorted descending, False otherwise
+        Cargo badge state ("visible", "hidden" or "missing") and text of every
+        imgHolder, read locally from one DOM snapshot (taken when none is
+        active) instead of several round trips per product. Snapshots carry
+        no layout: a badge is "hidden" only when its markup hides it.
         """
-        try:
-            ratings = []
-            for i in range(1, count + 1):
-                rating_str = self.get_rating_text_by_index(i)
-                rating_num = int(rating_str) if rating_str.isdigit() else 0
-                ratings.append(rating_num)
-            
-            self.logger.info(f"Found ratings: {ratings}")
-            
-            # Check if list is sorted in descending order
-            is_sorted_desc = all(ratings[i] >= ratings[i + 1] for i in range(len(ratings) - 1))
-            
-            if is_sorted_desc:
-                self.logger.info(f"✅ Ratings are correctly sorted descending: {ratings}")
+        snapshot = self.current_snapshot or self.snapshot()
+        badges = []
+        for holder in snapshot.find_all(self._IMG_HOLDER):
+            badge = holder.cssselect(".cargoBadgeField")
+            if not badge:
+                badges.append(("missing", ""))
+            elif hidden_by_markup(badge[0]):
+                badges.append(("hidden", ""))
             else:
-                self.logger.error(f"❌ Ratings are NOT sorted descending: {ratings}")
-                
-            return is_sorted_desc
-            
-        except Exception as e:
-            self.logger.error(f"Error verifying rating sort: {e}")
-            return False
+                text = badge[0].cssselect(".cargoBadgeText")
+                badges.append(("visible", normalize_text(text[0]) if text else ""))
+        return badges
 
     def verify_cargo_badge_field_all_products(self) -> bool:
         """
@@ -392,29 +667,24 @@ class SearchResultPage(BasePage):
             True if all products have cargo badge field, False otherwise
         """
         try:
-            # imgHolder elementlerini bul
-            img_holder_elements = self.driver.find_elements(*self._IMG_HOLDER)
-            self.logger.info(f"Found {len(img_holder_elements)} imgHolder elements")
+            badges = self._read_cargo_badges()
+            self.logger.info(f"Found {len(badges)} imgHolder elements")
             
             products_with_cargo = 0
             products_without_cargo = 0
             
-            for i, img_holder in enumerate(img_holder_elements, 1):
-                try:
-                    # Her imgHolder içinde cargoBadgeField var mı kontrol et
-                    cargo_badge = img_holder.find_element(By.CSS_SELECTOR, ".cargoBadgeField")
-                    if cargo_badge.is_displayed():
-                        cargo_text = cargo_badge.find_element(By.CSS_SELECTOR, ".cargoBadgeText").text
-                        self.logger.info(f"✅ Product {i}: Has cargo badge - '{cargo_text}'")
-                        products_with_cargo += 1
-                    else:
-                        self.logger.warning(f"⚠️ Product {i}: Cargo badge exists but not visible")
-                        products_without_cargo += 1
-                except:
+            for i, (state, cargo_text) in enumerate(badges, 1):
+                if state == "visible":
+                    self.logger.info(f"✅ Product {i}: Has cargo badge - '{cargo_text}'")
+                    products_with_cargo += 1
+                elif state == "hidden":
+                    self.logger.warning(f"⚠️ Product {i}: Cargo badge exists but not visible")
+                    products_without_cargo += 1
+                else:
                     self.logger.warning(f"❌ Product {i}: No cargo badge found")
                     products_without_cargo += 1
             
-            total_products = len(img_holder_elements)
+            total_products = len(badges)
             self.logger.info(f"📊 SUMMARY: {products_with_cargo}/{total_products} products have cargo badges")
             
             if products_with_cargo == total_products:
@@ -3,23 +3,53 @@ N11 Stores Page Object Model.
 """
 from selenium.webdriver.common.by import By
 from pages.base_page import BasePage
+from utils.locator_health import LocatorSet
+from utils.list_stream import ListStream
 import random
 import logging
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 
+# One store row -> record; textContent keeps it usable on prefetched pages
+_STORE_ROW_MAPPER_JS = """
+function (li) {
+    const a = li.querySelector('a');
+    const name = a ? a.textContent.trim().toLowerCase() : '';
+    return name ? {name: name, url: a.href} : null;
+}
+"""
+
+
 class StoresPage(BasePage):
     """N11 Stores page  of https://www.n11.com/magazalar"""
     
     # Private locators
     LETTERS_CONTAINER = (By.CLASS_NAME, "letters")
+    _LETTERS = (By.CSS_SELECTOR, ".letters span[data-has-seller]")
     SELLER_TITLE = (By.XPATH, "//a[contains(@class, 'btnGreen') and @title='Mağaza Aç']")
+    _NEXT_PAGE = (By.CSS_SELECTOR, ".pagination a.next")
+    _STORE_ROWS = LocatorSet(
+        "store rows",
+        (By.CSS_SELECTOR, ".allSellers .sellerListHolder > ul > li"),
+        (By.CSS_SELECTOR, "div.tabPanel.allSellers > div.sellerListHolder > ul > li"),
+    )
     
     STORES_URL = "https://www.n11.com/magazalar"
+
+    PERF_BUDGETS = {"lcp_ms": 2500, "cls": 0.1}
     
-    def __init__(self, driver):
+    def __init__(self, driver, catalog=None):
+        """
+        Initialize StoresPage.
+
+        Args:
+            driver: WebDriver instance
+            catalog: Optional StoreCatalog random stores are picked from while its letters are fresh
+        """
         super().__init__(driver)
+        self.catalog = catalog
+        self._rows_locator = None
         self.logger = logging.getLogger(__name__)  # Modül bazlı logger
         self.navigate_to(self.STORES_URL)  # Generic method kullan
         self.check()
@@ -45,11 +75,77 @@ class StoresPage(BasePage):
         
         # Use BasePage click method
         self.click(letter_locator)
+        self._rows_locator = None
         
         # Wait for page to load using WaitHelper
         self.wait.wait_for_page_load()
         self.logger.info("Filtered stores by letter: {}".format(letter))
 
+    def get_available_letters(self) -> list:
+        """
+        Gets every letter of the store directory in one script call.
+        
+        Returns:
+            List of letter values (data-has-seller attributes)
+        """
+        letters = self.driver.execute_script(
+            "return Array.from(document.querySelectorAll(arguments[0]))"
+            ".map(el => el.getAttribute('data-has-seller'));",
+            self._LETTERS[1],
+        )
+        self.logger.info(f"Found {len(letters)} store letters")
+        return letters
+
+    def get_store_records(self, letter: str) -> list:
+        """
+        Reads name, URL and position of every store currently listed, in one script call.
+        
+        Args:
+            letter: Letter the list is filtered by (stored on each record)
+            
+        Returns:
+            List of dicts with name, url, letter and index (1-based)
+        """
+        _, rows = self._store_rows_locator()
+        records = self.driver.execute_script(
+            """
+            return Array.from(document.querySelectorAll(arguments[0])).map((li, i) => {
+                const a = li.querySelector('a');
+                return a ? {name: a.innerText.trim().toLowerCase(), url: a.href, index: i + 1} : null;
+            }).filter(r => r && r.name);
+            """,
+            rows,
+        )
+        for record in records:
+            record["letter"] = letter
+        self.logger.info(f"Read {len(records)} store records for letter: {letter}")
+        return records
+
+    def iter_store_batches(self, letter: str, batch_size: int = 50, max_items: int = None):
+        """
+        Streams the stores of the current list batch by batch, including rows
+        that are loaded lazily or listed on later pages.
+        
+        Args:
+            letter: Letter the list is filtered by (stored on each record)
+            batch_size: Stores per batch (default: 50)
+            max_items: Stop after this many stores (default: whole list)
+            
+        Yields:
+            List of dicts with name, url, letter and index (1-based over the whole list)
+        """
+        _, rows = self._store_rows_locator()
+        stream = ListStream(self.driver, rows, _STORE_ROW_MAPPER_JS, batch_size=batch_size,
+                            next_selector=self._NEXT_PAGE[1], max_items=max_items)
+        index = 0
+        for records in stream:
+            batch = []
+            for record in records:
+                index += 1
+                record.update(index=index, letter=letter)
+                batch.append(record)
+            yield batch
+
     def get_store_count(self) -> int:
         """
         Gets total number of stores in the list.
@@ -57,9 +153,12 @@ class StoresPage(BasePage):
         Returns:
             Number of stores
         """
-        store_list_locator = "div.tabPanel.allSellers > div.sellerListHolder > ul > li"
-        stores = self.driver.find_elements(By.CSS_SELECTOR, store_list_locator)
-        count = len(stores)
+        if self._rows_locator is None:
+            # Resolving already found the rows; count them instead of querying again
+            _, rows = self._resolve_rows()
+        else:
+            rows = self.driver.find_elements(*self._rows_locator)
+        count = len(rows)
         self.logger.info(f"Found {count} stores in the list")
         return count
     
@@ -86,7 +185,7 @@ class StoresPage(BasePage):
             index: Store index (1-based)
         """
         # Try to find the store link directly
-        store_link_locator = (By.CSS_SELECTOR, "div.tabPanel.allSellers > div.sellerListHolder > ul > li:nth-child({}) a".format(index))
+        store_link_locator = self._store_link_locator(index)
 
         # Use BasePage click method
         self.click(store_link_locator)
@@ -105,12 +204,92 @@ class StoresPage(BasePage):
         Returns:
             Store name at the specified index
         """
-        store_link_locator = (By.CSS_SELECTOR, "div.tabPanel.allSellers > div.sellerListHolder > ul > li:nth-child({}) a".format(index))
-        store_name = self.driver.find_element(*store_link_locator).text.lower()
+        store_name = self.driver.find_element(*self._store_link_locator(index)).text.lower()
         self.logger.info(f"Found store name: {store_name} at index: {index}")
         return store_name
 
-    def filter_and_click_random_store(self, letter: str) -> int:
+    def _store_rows_locator(self) -> tuple:
+        """Fastest working store row locator, resolved once per filtered list."""
+        if self._rows_locator is None:
+            return self._resolve_rows()[0]
+        return self._rows_locator
+
+    def _resolve_rows(self) -> tuple:
+        """
+        Resolve the store row locator against the current list. It is cached
+        only once it has matched rows; a list that has not rendered yet is
+        resolved again on the next read.
+
+        Returns:
+            Tuple of the chosen locator and the rows it matched
+        """
+        locator, rows = self.resolve_all(self._STORE_ROWS, timeout=0)
+        if rows:
+            self._rows_locator = locator
+        return locator, rows
+
+    def _store_link_locator(self, index: int) -> tuple:
+        """Store link locator built on the fastest working store row locator."""
+        by, rows = self._store_rows_locator()
+        return (by, "{}:nth-child({}) a".format(rows, index))
+
+    def pick_random_store(self, letter: str) -> dict:
+        """
+        Picks a random store of the filtered letter.
+
+        A fresh catalog serves the pick in O(1) without touching the page;
+        otherwise the listed stores are read in one script call.
+
+        Args:
+            letter: Letter the list is filtered by
+
+        Returns:
+            Store record (name, url, letter, index)
+        """
+        if self.catalog is not None and self.catalog.is_fresh(letter):
+            store = self.catalog.random_store(letter)
+            self.logger.info(f"Picked store from catalog: {store['name']}")
+            return store
+        records = self.get_store_records(letter)
+        if not records:
+            raise Exception("No stores found in the list")
+        store = random.choice(records)
+        self.logger.info(f"Picked store from page: {store['name']} at index: {store['index']}")
+        return store
+
+    def click_store(self, store: dict):
+        """
+        Opens a store record's result page.
+
+        The store is clicked in the list when it is listed on the current
+        page; stores on later pages of the list are opened by URL.
+
+        Args:
+            store: Store record (name, url, ...)
+
+        Returns:
+            SearchResultPage of the store
+        """
+        from pages.search_result_page import SearchResultPage
+        _, rows = self._store_rows_locator()
+        index = self.driver.execute_script(
+            """
+            const rows = document.querySelectorAll(arguments[0]);
+            for (let i = 0; i < rows.length; i++) {
+                const a = rows[i].querySelector('a');
+                if (a && a.href === arguments[1]) return i + 1;
+            }
+            return 0;
+            """,
+            rows,
+            store["url"],
+        )
+        if index:
+            return self.click_store_by_index(index)
+        self.logger.info(f"Store not listed on this page, opening by URL: {store['url']}")
+        return SearchResultPage.open(self.driver, store["url"])
+
+    def filter_and_click_random_store(self, letter: str) -> dict:
         """
         Filters stores by letter and clicks on a random one.
         
@@ -118,18 +297,16 @@ class StoresPage(BasePage):
             letter: Letter to filter by (e.g., "S")
             
         Returns:
-            Index of the clicked store
+            Record of the clicked store
         """
         # Step 1: Filter by letter
         self.click_letter(letter)
         
-        # Step 2: Get random index
-        random_index = self.generate_random_store_index()
+        # Step 2: Pick a random store (catalog first)
+        store = self.pick_random_store(letter)
         
-        # Step 3: Click on random store
-        self.click_store_by_index(random_index)
+        # Step 3: Click on it
+        self.click_store(store)
         
-        self.logger.info("Filtered by '{}' and clicked store at index: {}".format(letter, random_index))
-        return random_index
-    
-    
\ No newline at end of file
+        self.logger.info("Filtered by '{}' and clicked store: {}".format(letter, store["name"]))
+        return store
@@ -0,0 +1,168 @@
+"""
+Resource-aware worker count for ``pytest -n auto``.
+
+Instead of one worker per CPU, ``-n auto`` picks
+
+    min(usable CPUs * --workers-per-cpu,
+        (available memory - reserve) / (browser footprint + worker overhead))
+
+where the browser footprint is the 90th percentile of the peak RSS that
+``plugins.resource_monitor`` recorded in the "Browser resources" report
+section (``DEFAULT_FOOTPRINT_MB`` until something has been measured).
+
+Every xdist worker also gets a ``LaunchGate``: browser launches wait for
+memory one at a time across workers, so the chosen parallelism stays safe
+even when memory is tighter than at start. Serial runs start one browser at
+a time anyway and are not gated.
+"""
+import logging
+import os
+from typing import List
+
+import psutil
+import pytest
+
+from plugins.duration_scheduler import DEFAULT_RESULTS_FILE
+from utils.latency import percentile
+from utils.launch_gate import LaunchGate, available_memory_mb, configure_launch_gate
+
+DEFAULT_FOOTPRINT_MB = 700.0
+WORKER_OVERHEAD_MB = 100.0  # pytest worker process itself
+FOOTPRINT_PERCENTILE = 90
+
+logger = logging.getLogger(__name__)
+
+_state_key = pytest.StashKey[dict]()
+
+
+def measured_footprints(results_file: str = DEFAULT_RESULTS_FILE) -> List[float]:
+    """
+    Peak browser RSS values recorded by earlier runs.
+
+    Args:
+        results_file: Path of the SimpleReporter pickle file
+
+    Returns:
+        List[float]: Peak RSS in MB per recorded test
+    """
+    from simple_report import read_results_file
+    # Read quietly: this runs in the controller and in every worker
+    try:
+        _, stats = read_results_file(results_file)
+    except Exception as e:
+        logger.warning(f"Could not read browser footprints from {results_file}: {e}")
+        return []
+    rows = stats.get("Browser resources", {})
+    return [row["peak_rss_mb"] for row in rows.values() if row.get("peak_rss_mb")]
+
+
+def browser_footprint_mb(config) -> float:
+    """Footprint from --browser-footprint-mb, else from recorded runs, else the default."""
+    explicit = config.getoption("browser_footprint_mb")
+    if explicit:
+        return explicit
+    samples = measured_footprints()
+    return percentile(samples, FOOTPRINT_PERCENTILE) if samples else DEFAULT_FOOTPRINT_MB
+
+
+def usable_cpus() -> int:
+    """CPUs this process may run on (CPU affinity / cpusets), as xdist counts them for -n auto."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return psutil.cpu_count(logical=True) or 1
+
+
+def plan_workers(cpus: int, available_mb: float, footprint_mb: float, reserve_mb: float,
+                 workers_per_cpu: float = 1.0) -> dict:
+    """
+    Pick a worker count from CPU and memory limits.
+
+    Args:
+        cpus: Logical CPUs
+        available_mb: Memory available now
+        footprint_mb: Peak RSS of one browser
+        reserve_mb: Memory kept free for the OS and the controller
+        workers_per_cpu: Browsers per CPU the host handles without thrashing
+
+    Returns:
+        dict: ``workers`` plus the ``cpu_limit`` and ``memory_limit`` it came from
+    """
+    cpu_limit = max(1, int(cpus * workers_per_cpu))
+    memory_limit = max(1, int((available_mb - reserve_mb) // (footprint_mb + WORKER_OVERHEAD_MB)))
+    return {"workers": min(cpu_limit, memory_limit), "cpu_limit": cpu_limit, "memory_limit": memory_limit}
+
+
+# ------------------
+# Pytest hooks
+# ------------------
+def pytest_addoption(parser):
+    group = parser.getgroup("auto workers")
+    group.addoption(
+        "--browser-footprint-mb",
+        type=float,
+        default=None,
+        help="peak RSS of one browser (default: measured by earlier runs)",
+    )
+    group.addoption(
+        "--memory-reserve-mb",
+        type=float,
+        default=1024.0,
+        help="memory kept free when sizing workers and launching browsers",
+    )
+    group.addoption(
+        "--workers-per-cpu",
+        type=float,
+        default=1.0,
+        help="upper bound of browsers per logical CPU for -n auto",
+    )
+    group.addoption(
+        "--no-launch-gate",
+        action="store_true",
+        default=False,
+        help="start browsers without waiting for free memory",
+    )
+
+
+def pytest_configure(config):
+    # pytest_xdist_auto_num_workers runs before configure and may have stored the plan
+    config.stash.setdefault(_state_key, {"plan": None})
+    # Only xdist workers launch browsers side by side
+    if not hasattr(config, "workerinput") or config.getoption("no_launch_gate"):
+        return
+    footprint = browser_footprint_mb(config)
+    configure_launch_gate(LaunchGate(footprint, config.getoption("memory_reserve_mb")))
+
+
+def pytest_unconfigure(config):
+    configure_launch_gate(None)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_auto_num_workers(config):
+    """Worker count for ``-n auto`` from CPUs, free memory and the browser footprint."""
+    footprint = browser_footprint_mb(config)
+    plan = plan_workers(
+        cpus=usable_cpus(),
+        available_mb=available_memory_mb(),
+        footprint_mb=footprint,
+        reserve_mb=config.getoption("memory_reserve_mb"),
+        workers_per_cpu=config.getoption("workers_per_cpu"),
+    )
+    plan["footprint_mb"] = round(footprint)
+    config.stash[_state_key] = {"plan": plan}
+    logger.info(f"🧮 -n auto: {plan['workers']} workers (cpu limit {plan['cpu_limit']}, "
+                f"memory limit {plan['memory_limit']}, browser footprint {plan['footprint_mb']} MB)")
+    return plan["workers"]
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Show how the automatic worker count was chosen."""
+    state = config.stash.get(_state_key, None)
+    plan = state and state["plan"]
+    if not plan:
+        return
+    terminalreporter.write_sep("-", "auto workers")
+    terminalreporter.write_line(
+        f"workers: {plan['workers']}  cpu limit: {plan['cpu_limit']}  memory limit: {plan['memory_limit']}  "
+        f"browser footprint: {plan['footprint_mb']} MB"
+    )
@@ -0,0 +1,230 @@
+"""
+Duration-aware test scheduling for pytest-xdist.
+
+Reads historical per-test durations from the SimpleReporter result store and
+hands tests out to xdist workers longest-first ("lpt") or pre-packed into
+balanced bins ("bins"). Predicted and actual makespan are printed at the end
+of the session.
+
+Scheduling is opt-in (``--duration-schedule``) and only replaces xdist's
+``--dist load`` scheduler; ``each``, ``loadfile``, ``loadscope`` and the
+other modes keep their own semantics.
+"""
+import heapq
+import logging
+import statistics
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import pytest
+
+try:
+    from xdist.scheduler import LoadScheduling
+except ImportError:  # pytest-xdist is optional
+    LoadScheduling = None
+
+DEFAULT_RESULTS_FILE = "reports/test_results.pkl"
+DEFAULT_UNKNOWN_DURATION = 10.0
+
+logger = logging.getLogger(__name__)
+
+_state_key = pytest.StashKey[dict]()
+
+
+# ------------------
+# Duration history
+# ------------------
+def load_durations(results_file: str = DEFAULT_RESULTS_FILE) -> Dict[str, float]:
+    """
+    Load recorded test durations from the reporter's result store.
+
+    Args:
+        results_file: Path of the SimpleReporter pickle file
+
+    Returns:
+        Dict[str, float]: Node id -> last recorded duration in seconds
+    """
+    from simple_report import SimpleReporter
+    return SimpleReporter(results_file).get_durations()
+
+
+def estimate_durations(nodeids: List[str], history: Dict[str, float],
+                       default: Optional[float] = None) -> Dict[str, float]:
+    """
+    Estimate a duration for every node id.
+
+    Tests without history get the median of the known durations, or
+    ``DEFAULT_UNKNOWN_DURATION`` when nothing is known at all.
+
+    Args:
+        nodeids: Collected pytest node ids
+        history: Node id -> duration mapping
+        default: Optional explicit estimate for unknown tests
+
+    Returns:
+        Dict[str, float]: Node id -> estimated duration in seconds
+    """
+    if default is None:
+        default = statistics.median(history.values()) if history else DEFAULT_UNKNOWN_DURATION
+    return {nodeid: history.get(nodeid, default) for nodeid in nodeids}
+
+
+def pack_bins(durations: Dict[str, float], bin_count: int) -> List[List[str]]:
+    """
+    Pack tests into ``bin_count`` balanced bins (greedy longest-processing-time).
+
+    Ties are broken by node id so the result is deterministic.
+
+    Args:
+        durations: Node id -> estimated duration
+        bin_count: Number of bins (workers / shards)
+
+    Returns:
+        List[List[str]]: Node ids per bin, each bin longest-first
+    """
+    bins: List[List[str]] = [[] for _ in range(bin_count)]
+    heap = [(0.0, i) for i in range(bin_count)]
+    for nodeid in sorted(durations, key=lambda n: (-durations[n], n)):
+        load, index = heapq.heappop(heap)
+        bins[index].append(nodeid)
+        heapq.heappush(heap, (load + durations[nodeid], index))
+    return bins
+
+
+def predict_makespan(durations: Dict[str, float], bin_count: int) -> float:
+    """Return the largest bin load produced by ``pack_bins``."""
+    if not durations or bin_count < 1:
+        return 0.0
+    return max(sum(durations[n] for n in b) for b in pack_bins(durations, bin_count))
+
+
+# ------------------
+# xdist scheduler
+# ------------------
+if LoadScheduling is not None:
+
+    class DurationScheduling(LoadScheduling):
+        """
+        LoadScheduling variant that orders the pending queue by expected duration.
+
+        - ``lpt``: every worker keeps at most two queued tests and always pulls
+          the longest remaining one when it frees up.
+        - ``bins``: tests are packed into one balanced bin per worker up front.
+        """
+
+        def __init__(self, config, log=None, mode: str = "lpt", history: Optional[Dict[str, float]] = None):
+            super().__init__(config, log)
+            self.mode = mode
+            self.history = history or {}
+            self.durations: Dict[str, float] = {}
+
+        def schedule(self) -> None:
+            """Initial distribution ordered by historical duration."""
+            assert self.collection_is_completed
+
+            if self.collection is not None:
+                for node in self.nodes:
+                    self.check_schedule(node)
+                return
+
+            if not self._check_nodes_have_same_collection():
+                self.log("**Different tests collected, aborting run**")
+                return
+
+            self.collection = next(iter(self.node2collection.values()))
+            if not self.collection:
+                return
+
+            self.durations = estimate_durations(self.collection, self.history)
+            state = self.config.stash.get(_state_key, None)
+            if state is not None:
+                state["predicted"] = predict_makespan(self.durations, len(self.nodes))
+                state["workers"] = len(self.nodes)
+
+            index_of = {nodeid: i for i, nodeid in enumerate(self.collection)}
+            if self.mode == "bins":
+                bins = pack_bins(self.durations, len(self.nodes))
+                for node, nodeids in zip(self.nodes, bins):
+                    indices = [index_of[n] for n in nodeids]
+                    if indices:
+                        self.node2pending[node].extend(indices)
+                        node.send_runtest_some(indices)
+                for node in self.nodes:
+                    node.shutdown()
+                return
+
+            ordered = sorted(self.collection, key=lambda n: (-self.durations[n], n))
+            self.pending[:] = [index_of[n] for n in ordered]
+            self.maxschedchunk = 1
+            # Two rounds so the N longest tests start on N different workers
+            for _ in range(2):
+                for node in self.nodes:
+                    self._send_tests(node, 1)
+            if not self.pending:
+                for node in self.nodes:
+                    node.shutdown()
+
+
+# ------------------
+# Pytest hooks
+# ------------------
+def pytest_addoption(parser):
+    group = parser.getgroup("duration scheduling")
+    group.addoption(
+        "--duration-schedule",
+        choices=["off", "lpt", "bins"],
+        default="off",
+        help="xdist ordering by recorded duration with --dist load: longest-first (lpt), balanced bins or off",
+    )
+    group.addoption(
+        "--duration-history",
+        default=DEFAULT_RESULTS_FILE,
+        help="SimpleReporter result store to read test durations from",
+    )
+
+
+def pytest_configure(config):
+    config.stash[_state_key] = {
+        "predicted": None,
+        "workers": 0,
+        "worker_busy": defaultdict(float),
+        "start": time.time(),
+    }
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    """Return the duration-aware scheduler for ``--dist load`` unless disabled."""
+    mode = config.getoption("duration_schedule")
+    if mode == "off" or LoadScheduling is None or config.getvalue("dist") != "load":
+        return None
+    history = load_durations(config.getoption("duration_history"))
+    logger.info(f"Duration scheduling '{mode}' with {len(history)} recorded durations")
+    return DurationScheduling(config, log, mode=mode, history=history)
+
+
+def pytest_runtest_logreport(report):
+    """Accumulate per-worker busy time on the xdist controller."""
+    node = getattr(report, "node", None)
+    if node is None:
+        return
+    state = node.config.stash.get(_state_key, None)
+    if state is not None:
+        state["worker_busy"][node.gateway.id] += report.duration
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Print predicted vs. actual makespan."""
+    state = config.stash.get(_state_key, None)
+    if not state or state["predicted"] is None:
+        return
+    busy = state["worker_busy"]
+    actual = max(busy.values()) if busy else 0.0
+    terminalreporter.write_sep("-", "duration scheduling")
+    terminalreporter.write_line(
+        f"workers: {state['workers']}  predicted makespan: {state['predicted']:.2f}s  "
+        f"actual makespan: {actual:.2f}s  wall time: {time.time() - state['start']:.2f}s"
+    )
+    for worker, seconds in sorted(busy.items()):
+        terminalreporter.write_line(f"  {worker}: {seconds:.2f}s busy")
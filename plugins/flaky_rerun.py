@@ -0,0 +1,284 @@
+"""
+Flaky-failure classifier with targeted, budgeted reruns.
+
+Failures are classified from the raised exception:
+
+- ``timing``: waits and DOM races (timeouts, stale / intercepted elements)
+- ``infrastructure``: browser or driver problems (dead session, connection errors)
+- ``assertion``: the test's own checks failed
+- ``error``: anything else (usually a bug in the test code)
+
+Only ``timing`` and ``infrastructure`` failures in setup or the test call are
+rerun (teardown failures are not), and only while the per-session rerun
+budget lasts. Reruns are off unless ``--flaky-reruns`` is given. With ``--reuse-browser`` the rerun picks up a
+warm browser from the pool; a crashed browser fails the pool health check and
+is replaced. Per-test and per-exception flakiness rates are written to the
+SimpleReporter report once, at the end of the session; under xdist the
+workers hand their counters to the controller, which saves them.
+
+A rerun is decided while the failing phase is reported (its report becomes
+a "rerun"), and the test is run again through the regular
+``pytest_runtest_protocol`` hook, so no pytest internals are needed.
+"""
+import logging
+
+import pytest
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    InvalidArgumentException,
+    InvalidSelectorException,
+    InvalidSessionIdException,
+    JavascriptException,
+    MoveTargetOutOfBoundsException,
+    NoSuchElementException,
+    NoSuchWindowException,
+    SessionNotCreatedException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+
+TIMING = "timing"
+INFRASTRUCTURE = "infrastructure"
+ASSERTION = "assertion"
+ERROR = "error"
+
+RERUNNABLE = (TIMING, INFRASTRUCTURE)
+
+TIMING_EXCEPTIONS = (
+    TimeoutException,
+    StaleElementReferenceException,
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    MoveTargetOutOfBoundsException,
+    NoSuchElementException,
+)
+INFRASTRUCTURE_EXCEPTIONS = (
+    InvalidSessionIdException,
+    NoSuchWindowException,
+    SessionNotCreatedException,
+    ConnectionError,
+    Urllib3HTTPError,
+)
+# WebDriverException subclasses that point at the test code, not the environment
+CODE_EXCEPTIONS = (
+    InvalidSelectorException,
+    InvalidArgumentException,
+    JavascriptException,
+)
+
+STATS_BY_TEST = "Flakiness by test"
+STATS_BY_EXCEPTION = "Flakiness by exception type"
+WORKER_OUTPUT_KEY = "flaky_rerun"
+RERUN_PHASES = ("setup", "call")
+
+logger = logging.getLogger(__name__)
+
+_state_key = pytest.StashKey[dict]()
+# Present on an item while its attempts run: attempt number, causes, this attempt's time and rerun decision
+_attempt_key = pytest.StashKey[dict]()
+
+
+def classify_exception(exc: BaseException) -> str:
+    """
+    Classify a test failure.
+
+    Args:
+        exc: Exception raised by the test or its fixtures
+
+    Returns:
+        str: One of ``timing``, ``infrastructure``, ``assertion``, ``error``
+    """
+    if isinstance(exc, AssertionError):
+        return ASSERTION
+    if isinstance(exc, CODE_EXCEPTIONS):
+        return ERROR
+    if isinstance(exc, TIMING_EXCEPTIONS):
+        return TIMING
+    if isinstance(exc, INFRASTRUCTURE_EXCEPTIONS):
+        return INFRASTRUCTURE
+    if isinstance(exc, WebDriverException):
+        # Unknown driver errors (e.g. "chrome not reachable") are environment problems
+        return INFRASTRUCTURE
+    return ERROR
+
+
+def _rate(part: int, total: int) -> str:
+    return f"{100.0 * part / total:.1f}%" if total else "0.0%"
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("flaky reruns")
+    group.addoption(
+        "--flaky-reruns",
+        type=int,
+        default=0,
+        help="max reruns for timing/infrastructure failures (default 0: disabled)",
+    )
+    group.addoption(
+        "--flaky-budget",
+        type=float,
+        default=300.0,
+        help="total seconds per session that may be spent on reruns",
+    )
+
+
+def pytest_configure(config):
+    config.stash[_state_key] = {"spent": 0.0, "reruns": 0, "by_test": {}, "by_exception": {}}
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Tag failed reports with the failure category; turn rerunnable failures into reruns."""
+    outcome = yield
+    report = outcome.get_result()
+    if report.failed and call.excinfo is not None:
+        report.failure_category = classify_exception(call.excinfo.value)
+        report.failure_exception = call.excinfo.typename
+
+    attempt = item.stash.get(_attempt_key, None)
+    if attempt is None:
+        return
+    attempt["elapsed"] += call.duration
+    if report.failed and _should_rerun(item, report, attempt):
+        attempt["rerun"] = True
+        attempt["causes"].append(report.failure_exception)
+        report.outcome = "rerun"
+        logger.warning(f"🔁 Rerunning {item.nodeid} ({report.failure_category}: {report.failure_exception}), "
+                       f"attempt {attempt['attempt'] + 2}")
+    elif report.failed:
+        attempt["failed"] = True
+
+
+def _should_rerun(item, report, attempt) -> bool:
+    """Whether a failed report is rerun: setup/call, rerunnable, reruns left, and within the session budget."""
+    if attempt["rerun"] or report.when not in RERUN_PHASES:
+        return False
+    if getattr(report, "failure_category", None) not in RERUNNABLE:
+        return False
+    if attempt["attempt"] >= item.config.getoption("flaky_reruns"):
+        return False
+    state = item.config.stash[_state_key]
+    budget = item.config.getoption("flaky_budget")
+    # Expect the rerun to take about as long as this attempt so far
+    if state["spent"] + attempt["elapsed"] > budget:
+        logger.warning(f"Flaky rerun budget exhausted ({state['spent']:.1f}s of {budget:.0f}s), not rerunning {item.nodeid}")
+        return False
+    state["spent"] += attempt["elapsed"]
+    state["reruns"] += 1
+    return True
+
+
+def pytest_report_teststatus(report, config):
+    if report.outcome == "rerun":
+        return "rerun", "R", ("RERUN", {"yellow": True})
+    return None
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Run the test through the regular protocol again for every rerun decided while reporting."""
+    if item.config.getoption("flaky_reruns") < 1 or item.stash.get(_attempt_key, None) is not None:
+        # Disabled, or one attempt of the loop below: the default protocol runs it
+        return None
+
+    attempt = item.stash[_attempt_key] = {"attempt": 0, "causes": [], "elapsed": 0.0, "rerun": False, "failed": False}
+    try:
+        while True:
+            attempt.update(elapsed=0.0, rerun=False, failed=False)
+            item.ihook.pytest_runtest_protocol(item=item, nextitem=nextitem)
+            if not attempt["rerun"]:
+                break
+            attempt["attempt"] += 1
+            # Replace, not append: the report shows the latest count and causes
+            item.user_properties[:] = [
+                prop for prop in item.user_properties if prop[0] not in ("reruns", "rerun_cause")
+            ]
+            item.user_properties.append(("reruns", attempt["attempt"]))
+            item.user_properties.append(("rerun_cause", ", ".join(attempt["causes"])))
+    finally:
+        del item.stash[_attempt_key]
+
+    _count_flakiness(item, attempt["causes"], passed=not attempt["failed"])
+    return True
+
+
+def _count_flakiness(item, causes, passed: bool) -> None:
+    """Add one test's outcome to the session's flakiness counters."""
+    state = item.config.stash[_state_key]
+    row = state["by_test"].setdefault(item.name, {"runs": 0, "reruns": 0, "flaky": 0})
+    row["runs"] += 1
+    row["reruns"] += len(causes)
+    row["flaky"] += 1 if causes and passed else 0
+    for exception_type in causes:
+        row = state["by_exception"].setdefault(exception_type, {"reruns": 0, "recovered": 0})
+        row["reruns"] += 1
+        row["recovered"] += 1 if passed else 0
+
+
+def _merge_counts(state: dict, other: dict) -> None:
+    """Add another process's counters to this one's."""
+    state["spent"] += other["spent"]
+    state["reruns"] += other["reruns"]
+    for section in ("by_test", "by_exception"):
+        for key, counts in other[section].items():
+            row = state[section].setdefault(key, dict.fromkeys(counts, 0))
+            for name, value in counts.items():
+                row[name] += value
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """xdist controller: collect a finished worker's counters."""
+    output = getattr(node, "workeroutput", {}).get(WORKER_OUTPUT_KEY)
+    if output:
+        state = node.config.stash[_state_key]
+        _merge_counts(state, output)
+        state["from_workers"] = True
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_sessionfinish(session):
+    """Add the session's flakiness counters to the report in one save (before the HTML report)."""
+    config = session.config
+    state = config.stash.get(_state_key, None)
+    if state and hasattr(config, "workeroutput"):
+        # xdist worker: the controller merges every worker's counters and saves once
+        config.workeroutput[WORKER_OUTPUT_KEY] = {
+            key: state[key] for key in ("spent", "reruns", "by_test", "by_exception")
+        }
+        return
+    reporter = getattr(config, "simple_reporter", None)
+    if not state or reporter is None or not state["by_test"]:
+        return
+    if state.get("from_workers"):
+        # The controller's copy predates the workers' results; save on top of them
+        reporter.load_existing_results()
+
+    for name, counts in state["by_test"].items():
+        row = reporter.get_stat(STATS_BY_TEST, name)
+        row["runs"] = row.get("runs", 0) + counts["runs"]
+        row["reruns"] = row.get("reruns", 0) + counts["reruns"]
+        row["flaky"] = row.get("flaky", 0) + counts["flaky"]
+        row["flaky_rate"] = _rate(row["flaky"], row["runs"])
+        reporter.stats.setdefault(STATS_BY_TEST, {})[name] = row
+
+    for exception_type, counts in state["by_exception"].items():
+        row = reporter.get_stat(STATS_BY_EXCEPTION, exception_type)
+        row["reruns"] = row.get("reruns", 0) + counts["reruns"]
+        row["recovered"] = row.get("recovered", 0) + counts["recovered"]
+        row["recovery_rate"] = _rate(row["recovered"], row["reruns"])
+        reporter.stats.setdefault(STATS_BY_EXCEPTION, {})[exception_type] = row
+    reporter.save_results()
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    state = config.stash.get(_state_key, None)
+    if state and state["reruns"]:
+        terminalreporter.write_sep("-", "flaky reruns")
+        terminalreporter.write_line(
+            f"reruns: {state['reruns']}  time spent: {state['spent']:.1f}s "
+            f"of {config.getoption('flaky_budget'):.0f}s budget"
+        )
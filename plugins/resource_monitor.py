@@ -0,0 +1,86 @@
+"""
+Browser resource usage per test.
+
+While each test runs, the chromedriver/Chrome process tree of its
+``driver`` is sampled for RSS and CPU, and the JS heap is read at the start
+and end through CDP. Peak and average values are attached to the test's
+report row (``browser_resources``) and kept in the "Browser resources"
+report section, which ``plugins.auto_workers`` reads as the measured
+per-browser footprint.
+
+With ``--reuse-browser`` the idle RSS of every pooled session is measured
+after the pool has reset it. A session whose idle memory keeps growing
+across tests is flagged as a suspected leak; the pool quits it instead of
+handing it to the next test. The rows are kept in memory and saved to the
+report once, at the end of the session.
+"""
+import logging
+
+import pytest
+
+from utils.resource_monitor import ResourceSampler, get_leak_tracker
+
+STATS_SECTION = "Browser resources"
+
+logger = logging.getLogger(__name__)
+
+# Node id -> chromedriver PID of the test's session, measured again after teardown
+_session_pids = {}
+# Test name -> report row of this session, saved at session finish
+_rows = {}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("resource monitor")
+    group.addoption(
+        "--no-resource-monitor",
+        action="store_true",
+        default=False,
+        help="do not sample browser RSS/CPU/JS heap during tests",
+    )
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    driver = item.funcargs.get("driver")
+    if driver is None or item.config.getoption("no_resource_monitor"):
+        yield
+        return
+    sampler = ResourceSampler(driver).start()
+    yield
+    usage = sampler.stop()
+    if usage is None:
+        return
+    _session_pids[item.nodeid] = sampler.pid
+    item.user_properties.append(("browser_resources", str(usage)))
+    _rows[item.name] = usage.as_stats()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item, nextitem):
+    yield
+    pid = _session_pids.pop(item.nodeid, None)
+    if pid is None:
+        return
+    tracker = get_leak_tracker()
+    # Quit sessions are gone (None); pooled ones have been reset to a blank page
+    if tracker.record_idle(pid) is None or not tracker.is_leaking(pid):
+        return
+    growth = tracker.growth_mb(pid)
+    logger.warning(
+        f"💧 Suspected memory leak: pooled browser grew {growth:.0f} MB idle RSS over "
+        f"{tracker.window} tests (last: {item.name}); it will be retired"
+    )
+    if item.name in _rows:
+        _rows[item.name]["leak_suspected"] = f"+{growth:.0f} MB over {tracker.window} tests"
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_sessionfinish(session):
+    """Add the session's rows to the report in one save (before the HTML report)."""
+    reporter = getattr(session.config, "simple_reporter", None)
+    if reporter is None or not _rows:
+        return
+    reporter.stats.setdefault(STATS_SECTION, {}).update(_rows)
+    reporter.save_results()
+    _rows.clear()
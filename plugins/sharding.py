@@ -0,0 +1,220 @@
+"""
+Deterministic multi-machine sharding.
+
+Each CI machine runs ``pytest --shard-index=i --shard-count=n``. The split
+must be identical on every machine, so durations come from the first of:
+
+* ``--shard-durations FILE`` or, when it exists, the committed
+  ``tests/shard_durations.json`` (written by ``python -m plugins.sharding
+  export``);
+* the SimpleReporter result history, which only splits consistently when
+  every machine starts from the same results file (a warning is logged).
+
+Tests are packed into ``n`` bins balanced by duration, as the xdist duration
+scheduler does. With no durations at all every test goes to the shard given
+by a stable hash of its node id.
+
+At the end each shard writes a self-contained JSON result bundle that
+``python simple_report.py merge`` combines into one HTML report.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import zlib
+
+import pytest
+
+from plugins.duration_scheduler import (
+    DEFAULT_RESULTS_FILE,
+    estimate_durations,
+    load_durations,
+    pack_bins,
+)
+
+DEFAULT_BUNDLE_PATH = "reports/shard-{index}-of-{count}.json"
+DEFAULT_DURATIONS_FILE = "tests/shard_durations.json"
+
+logger = logging.getLogger(__name__)
+
+# Node ids of tests reported in this session; only this shard's results go into the bundle
+_reported_nodeids = set()
+
+
+def shard_nodeids(nodeids, history, shard_index: int, shard_count: int):
+    """
+    Return the node ids belonging to one shard.
+
+    With a duration history node ids are sorted and packed, so the split does
+    not depend on collection order; without one each node id is assigned by
+    a stable hash. Either way every machine given the same history computes
+    the same split.
+
+    Args:
+        nodeids: All collected node ids
+        history: Node id -> duration mapping shared by all machines (None: hash assignment)
+        shard_index: Zero-based shard index
+        shard_count: Total number of shards
+
+    Returns:
+        set: Node ids assigned to ``shard_index``
+    """
+    if history is None:
+        return {nodeid for nodeid in nodeids if zlib.crc32(nodeid.encode("utf-8")) % shard_count == shard_index}
+    durations = estimate_durations(sorted(nodeids), history)
+    return set(pack_bins(durations, shard_count)[shard_index])
+
+
+def load_shard_durations(path: str) -> dict:
+    """
+    Load a committed durations file.
+
+    Args:
+        path: JSON file of node id -> duration in seconds
+
+    Returns:
+        dict: Node id -> duration
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return {name: float(duration) for name, duration in json.load(f).items()}
+
+
+def resolve_shard_history(durations_file=None, results_file: str = DEFAULT_RESULTS_FILE):
+    """
+    Pick the duration history to shard by.
+
+    Args:
+        durations_file: Explicit durations file (``--shard-durations``), or None
+        results_file: SimpleReporter result store used when no durations file exists
+
+    Returns:
+        tuple: (node id -> duration mapping or None for hash assignment, source description)
+    """
+    if durations_file:
+        return load_shard_durations(durations_file), durations_file
+    if os.path.exists(DEFAULT_DURATIONS_FILE):
+        return load_shard_durations(DEFAULT_DURATIONS_FILE), DEFAULT_DURATIONS_FILE
+    history = load_durations(results_file)
+    if history:
+        return history, results_file
+    return None, "node id hash"
+
+
+def export_durations(results_file: str = DEFAULT_RESULTS_FILE, path: str = DEFAULT_DURATIONS_FILE) -> dict:
+    """
+    Write the reporter's recorded durations to a durations file for committing.
+
+    Args:
+        results_file: SimpleReporter result store to read durations from
+        path: Durations file to write
+
+    Returns:
+        dict: The exported node id -> duration mapping
+    """
+    durations = {name: round(duration, 2) for name, duration in sorted(load_durations(results_file).items())}
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(durations, f, indent=2, sort_keys=True)
+    return durations
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("sharding")
+    group.addoption("--shard-index", type=int, default=0, help="zero-based index of this shard")
+    group.addoption("--shard-count", type=int, default=1, help="total number of shards")
+    group.addoption(
+        "--shard-durations",
+        default=None,
+        help=f"committed JSON durations file to balance shards by (default: {DEFAULT_DURATIONS_FILE} "
+             "if present, else the result history, else a stable hash split)",
+    )
+    group.addoption(
+        "--shard-bundle",
+        default=None,
+        help=f"result bundle path for this shard (default: {DEFAULT_BUNDLE_PATH})",
+    )
+
+
+def pytest_configure(config):
+    index = config.getoption("shard_index")
+    count = config.getoption("shard_count")
+    if count < 1 or not 0 <= index < count:
+        raise pytest.UsageError(f"Invalid shard {index}/{count}: need 0 <= --shard-index < --shard-count")
+    durations_file = config.getoption("shard_durations")
+    if count > 1 and durations_file and not os.path.exists(durations_file):
+        # Falling back on some machines only would give them a different split
+        raise pytest.UsageError(f"Shard durations file not found: {durations_file}")
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config, items):
+    """Keep only the items assigned to this shard."""
+    count = config.getoption("shard_count")
+    if count == 1:
+        return
+    index = config.getoption("shard_index")
+    session_reporter = getattr(config, "simple_reporter", None)
+    results_file = session_reporter.results_file if session_reporter else DEFAULT_RESULTS_FILE
+    history, source = resolve_shard_history(config.getoption("shard_durations"), results_file)
+    if source == results_file:
+        logger.warning(f"⚠️ Sharding by local result history ({results_file}); "
+                       f"every machine must share it, or commit {DEFAULT_DURATIONS_FILE}")
+    keep = shard_nodeids([item.nodeid for item in items], history, index, count)
+
+    selected = [item for item in items if item.nodeid in keep]
+    deselected = [item for item in items if item.nodeid not in keep]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+    items[:] = selected
+    logger.info(f"Shard {index}/{count}: running {len(selected)} of {len(selected) + len(deselected)} tests "
+                f"(split by {source})")
+
+
+def pytest_runtest_logreport(report):
+    """Remember which tests ran in this session (works on the xdist controller too)."""
+    if report.when == "call":
+        _reported_nodeids.add(report.nodeid)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Write this shard's result bundle (controller / single process only)."""
+    config = session.config
+    if hasattr(config, "workerinput"):
+        return
+    count = config.getoption("shard_count")
+    bundle_path = config.getoption("shard_bundle")
+    if count == 1 and not bundle_path:
+        return
+    index = config.getoption("shard_index")
+    bundle_path = bundle_path or DEFAULT_BUNDLE_PATH.format(index=index, count=count)
+
+    from simple_report import SimpleReporter
+    # The results this session's reporter wrote, wherever duration history is read from
+    session_reporter = getattr(config, "simple_reporter", None)
+    reporter = SimpleReporter(session_reporter.results_file if session_reporter else DEFAULT_RESULTS_FILE)
+    reporter.export_bundle(
+        bundle_path,
+        test_keys=set(_reported_nodeids),
+        metadata={
+            "shard_index": index,
+            "shard_count": count,
+            "host": platform.node(),
+            "exitstatus": int(exitstatus),
+        },
+    )
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Shard helpers")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export", help="write recorded test durations to a durations file to commit")
+    export.add_argument("--results", default=DEFAULT_RESULTS_FILE, help="SimpleReporter result store")
+    export.add_argument("--out", default=DEFAULT_DURATIONS_FILE)
+    args = parser.parse_args(argv)
+    durations = export_durations(args.results, args.out)
+    print(f"📦 {len(durations)} test durations written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Performance-under-constraint runs with throttle profiles.
+
+A test runs under a profile from ``utils.throttling.PROFILES`` chosen by
+
+- marker: ``@pytest.mark.throttle("slow-4g")`` pins the test to a profile
+- CLI: ``--throttle=none,slow-4g,mobile`` runs every other test once per
+  profile (``test_x[slow-4g]`` ...)
+
+The ``driver`` fixture applies the profile through CDP and clears it again
+before the browser is reused. Results are tagged with the profile
+(``throttle``) and the call durations per profile go into the "Durations by
+profile" report section, one row per test and one column per profile.
+"""
+import logging
+
+import pytest
+
+from utils.throttling import get_profile
+
+STATS_SECTION = "Durations by profile"
+
+logger = logging.getLogger(__name__)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("throttling")
+    group.addoption(
+        "--throttle",
+        default=None,
+        help="comma separated throttle profiles to run each test under (e.g. none,slow-4g,mobile)",
+    )
+
+
+def _cli_profiles(config):
+    value = config.getoption("throttle")
+    return [name.strip() for name in value.split(",") if name.strip()] if value else []
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "throttle(name): run the test under a network/CPU throttle profile")
+    for name in _cli_profiles(config):
+        try:
+            get_profile(name)
+        except ValueError as e:
+            raise pytest.UsageError(str(e))
+
+
+def pytest_generate_tests(metafunc):
+    names = _cli_profiles(metafunc.config)
+    if not names or "throttle_profile" not in metafunc.fixturenames:
+        return
+    if metafunc.definition.get_closest_marker("throttle") is not None:
+        return
+    metafunc.parametrize("throttle_profile", names, indirect=True, ids=names)
+
+
+@pytest.fixture
+def throttle_profile(request):
+    """
+    Throttle profile of the current test (None: unthrottled, untagged).
+
+    Returns:
+        Optional[ThrottleProfile]: Profile from the marker or the CLI parameter
+    """
+    marker = request.node.get_closest_marker("throttle")
+    name = marker.args[0] if marker is not None else getattr(request, "param", None)
+    if name is None:
+        return None
+    request.node.user_properties.append(("throttle", name))
+    return get_profile(name)
+
+
+def _row_key(item, profile: str) -> str:
+    """
+    One row per test across profiles: the node id without the profile's
+    parameter id; other parameters keep their own rows.
+    """
+    callspec = getattr(item, "callspec", None)
+    if callspec is None or "throttle_profile" not in callspec.params:
+        return item.nodeid
+    base = item.nodeid[:-len(f"[{callspec.id}]")]
+    param_id = callspec.id
+    if param_id == profile:
+        return base
+    if param_id.startswith(f"{profile}-"):
+        rest = param_id[len(profile) + 1:]
+    elif param_id.endswith(f"-{profile}"):
+        rest = param_id[:-len(profile) - 1]
+    else:
+        rest = param_id.replace(f"-{profile}-", "-", 1)
+    return f"{base}[{rest}]"
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    if report.when != "call":
+        return
+    profile = dict(item.user_properties).get("throttle")
+    reporter = getattr(item.config, "simple_reporter", None)
+    if profile is None or reporter is None:
+        return
+    key = _row_key(item, profile)
+    row = reporter.get_stat(STATS_SECTION, key)
+    row[profile] = f"{report.duration:.2f}s" + ("" if report.passed else " ❌")
+    reporter.set_stat(STATS_SECTION, key, row)
@@ -0,0 +1,71 @@
+"""
+Navigation Timing / Core Web Vitals in the test report.
+
+With ``--web-vitals``, turns on ``utils.web_vitals`` collection (an extra
+script round trip per page object action): page objects harvest TTFB,
+DOMContentLoaded, load, LCP, CLS, INP, long tasks and resource counts/bytes
+of every document they drive. After each test the documents are attached
+to the test's report row (``web_vitals``), metrics above the page class's
+``PERF_BUDGETS`` are listed as ``budget_violations`` and the worst values
+per page class go into the "Web vitals" report section. Budget violations
+are reported, they do not fail the test.
+"""
+import logging
+
+import pytest
+
+from utils.web_vitals import collect_vitals, set_enabled
+
+STATS_SECTION = "Web vitals"
+WORST_OF = ("ttfb_ms", "lcp_ms", "cls", "inp_ms", "long_task_ms", "transfer_kb")
+
+logger = logging.getLogger(__name__)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("web vitals")
+    group.addoption(
+        "--web-vitals",
+        action="store_true",
+        default=False,
+        help="collect navigation timing / web vitals of page objects (one script call per action)",
+    )
+
+
+def pytest_configure(config):
+    set_enabled(config.getoption("web_vitals"))
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    yield
+    driver = item.funcargs.get("driver")
+    if driver is None:
+        return
+    vitals, violations = collect_vitals(driver)
+    if not vitals:
+        return
+    item.user_properties.append(("web_vitals", "; ".join(str(v) for v in vitals)))
+    if violations:
+        item.user_properties.append(("budget_violations", ", ".join(str(v) for v in violations)))
+        logger.warning(f"⏱️ Performance budget exceeded in {item.name}: {', '.join(map(str, violations))}")
+    _record_worst(item.config, vitals, violations)
+
+
+def _record_worst(config, vitals, violations) -> None:
+    """Keep per page class sample counts, worst values and violation counts in the report."""
+    reporter = getattr(config, "simple_reporter", None)
+    if reporter is None:
+        return
+    for page in dict.fromkeys(v.page for v in vitals):
+        row = reporter.get_stat(STATS_SECTION, page)
+        page_vitals = [v for v in vitals if v.page == page]
+        row["samples"] = row.get("samples", 0) + len(page_vitals)
+        for metric in WORST_OF:
+            values = [getattr(v, metric) for v in page_vitals if getattr(v, metric) is not None]
+            if row.get(f"max_{metric}") is not None:
+                values.append(row[f"max_{metric}"])
+            if values:
+                row[f"max_{metric}"] = max(values)
+        row["budget_violations"] = row.get("budget_violations", 0) + sum(1 for v in violations if v.page == page)
+        reporter.set_stat(STATS_SECTION, page, row)
@@ -0,0 +1,99 @@
+"""
+Pooled WebDriver command executor for the suite's drivers.
+
+Every driver ``create_driver`` starts gets a ``PooledRemoteConnection``
+with the pool size and timeouts given on the command line. At the end of
+the session the per-command latencies are written to the "WebDriver
+commands" report section. Each row shows p50/p95, how much of a command is
+browser time and how much is transport, and how many connections the
+command had to open. The busiest commands are also printed in the
+terminal summary.
+"""
+import os
+
+import pytest
+
+from utils.command_executor import ExecutorSettings, configure_command_executor, get_command_stats
+
+STATS_SECTION = "WebDriver commands"
+SUMMARY_COMMANDS = 10
+
+
+def pytest_addoption(parser):
+    defaults = ExecutorSettings()
+    group = parser.getgroup("webdriver executor")
+    group.addoption(
+        "--wd-pool-size",
+        type=int,
+        default=defaults.pool_size,
+        help="keep-alive connections kept per WebDriver host",
+    )
+    group.addoption(
+        "--wd-pool-block",
+        action="store_true",
+        default=False,
+        help="wait for a free pooled connection instead of opening a throwaway one",
+    )
+    group.addoption(
+        "--wd-shared-pool",
+        action="store_true",
+        default=False,
+        help="one connection pool for all drivers of a worker (grids)",
+    )
+    group.addoption(
+        "--wd-connect-timeout",
+        type=float,
+        default=defaults.connect_timeout,
+        help="seconds to connect to chromedriver/grid",
+    )
+    group.addoption(
+        "--wd-read-timeout",
+        type=float,
+        default=defaults.read_timeout,
+        help="seconds to wait for a WebDriver command's response",
+    )
+    group.addoption(
+        "--no-wd-executor",
+        action="store_true",
+        default=False,
+        help="use selenium's default command executor",
+    )
+
+
+def pytest_configure(config):
+    if config.getoption("no_wd_executor"):
+        return
+    configure_command_executor(ExecutorSettings(
+        pool_size=config.getoption("wd_pool_size"),
+        pool_block=config.getoption("wd_pool_block"),
+        shared=config.getoption("wd_shared_pool"),
+        connect_timeout=config.getoption("wd_connect_timeout"),
+        read_timeout=config.getoption("wd_read_timeout"),
+    ))
+
+
+def pytest_unconfigure(config):
+    configure_command_executor(None)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_sessionfinish(session):
+    """Store the command stats before conftest renders the HTML report."""
+    reporter = getattr(session.config, "simple_reporter", None)
+    summary = get_command_stats().summary()
+    if reporter is None or not summary:
+        return
+    # xdist workers each time their own drivers
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    for command, row in summary.items():
+        reporter.set_stat(STATS_SECTION, f"{command} [{worker}]" if worker else command, row)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Show the commands that took the most time."""
+    stats = get_command_stats()
+    if not stats.summary():
+        return
+    terminalreporter.write_sep("-", "webdriver commands")
+    for line in stats.format_table(limit=SUMMARY_COMMANDS).splitlines():
+        terminalreporter.write_line(line)
@@ -9,37 +9,62 @@ import os
 from datetime import datetime
 import pickle
 
+BUNDLE_FORMAT = "n11-result-bundle/1"
+
+
+def read_results_file(results_file):
+    """
+    Sonuç dosyasını ekrana yazmadan oku (eklentilerin geçmiş verisi için).
+
+    Dosya yoksa ([], {}) döner; bozuk dosyada hata fırlatır.
+    """
+    if not os.path.exists(results_file):
+        return [], {}
+    with open(results_file, 'rb') as f:
+        data = pickle.load(f)
+    if isinstance(data, dict):
+        return data.get('results', []), data.get('stats', {})
+    # Eski format: sadece sonuç listesi
+    return data, {}
+
+
+def result_key(result):
+    """Sonucun benzersiz anahtarı: test node id'si (eski sonuçlarda test adı)."""
+    return result.get('nodeid') or result['name']
+
 class SimpleReporter:
     def __init__(self, results_file="reports/test_results.pkl"):
         self.results_file = results_file
         self.test_results = []
+        self.stats = {}  # Bölüm -> anahtar -> değerler (ör. flaky oranları)
         self.load_existing_results()
         
     def load_existing_results(self):
         """Önceki test sonuçlarını yükle."""
         try:
             if os.path.exists(self.results_file):
-                with open(self.results_file, 'rb') as f:
-                    self.test_results = pickle.load(f)
+                self.test_results, self.stats = read_results_file(self.results_file)
                 print(f"📂 Loaded {len(self.test_results)} existing test results")
             else:
                 print("🆕 Starting with empty test results")
         except Exception as e:
             print(f"⚠️ Could not load existing results: {e}")
             self.test_results = []
+            self.stats = {}
     
     def save_results(self):
         """Test sonuçlarını dosyaya kaydet."""
         try:
             os.makedirs(os.path.dirname(self.results_file), exist_ok=True)
             with open(self.results_file, 'wb') as f:
-                pickle.dump(self.test_results, f)
+                pickle.dump({'results': self.test_results, 'stats': self.stats}, f)
         except Exception as e:
             print(f"⚠️ Could not save results: {e}")
     
     def clear_results(self):
         """Tüm test sonuçlarını temizle."""
         self.test_results = []
+        self.stats = {}
         try:
             if os.path.exists(self.results_file):
                 os.remove(self.results_file)
@@ -47,12 +72,13 @@ class SimpleReporter:
         except Exception as e:
             print(f"⚠️ Could not clear results: {e}")
         
-    def add_result(self, test_name, status, duration=0, error_msg="", logs=""):
-        """Test sonucu ekle."""
+    def add_result(self, test_name, status, duration=0, error_msg="", logs="", extra=None, nodeid=None):
+        """Test sonucu ekle (nodeid verilirse farklı modüllerdeki aynı isimli testler ayrı tutulur)."""
         # Aynı test varsa güncelle, yoksa ekle
+        key = nodeid or test_name
         existing_index = None
         for i, result in enumerate(self.test_results):
-            if result['name'] == test_name:
+            if result_key(result) == key:
                 existing_index = i
                 break
         
@@ -62,9 +88,12 @@ class SimpleReporter:
             'duration': duration,
             'error': error_msg,
             'logs': logs,  # Detaylı log bilgileri
+            'extra': extra or {},  # Eklentilerin eklediği metrikler (user_properties)
             'timestamp': datetime.now().strftime('%H:%M:%S'),
             'date': datetime.now().strftime('%Y-%m-%d')
         }
+        if nodeid:
+            new_result['nodeid'] = nodeid
         
         if existing_index is not None:
             # Aynı test varsa güncelle
@@ -78,6 +107,68 @@ class SimpleReporter:
         # Sonuçları kaydet
         self.save_results()
     
+    def get_durations(self):
+        """Test sürelerini node id bazında döndür (zamanlama eklentileri için)."""
+        return {result_key(r): r['duration'] for r in self.test_results if r.get('duration')}
+
+    def get_stat(self, section, key):
+        """Bir istatistik satırını döndür (yoksa boş sözlük)."""
+        return dict(self.stats.get(section, {}).get(key, {}))
+
+    def set_stat(self, section, key, values):
+        """Bir istatistik satırını güncelle ve kaydet."""
+        self.stats.setdefault(section, {})[key] = values
+        self.save_results()
+
+    def export_bundle(self, bundle_path, test_keys=None, metadata=None):
+        """
+        Sonuçları taşınabilir, tek dosyalık bir JSON paketine yaz.
+
+        Paket loglar dahil her şeyi içerir; birleştirme için başka dosyaya gerek yoktur.
+        test_keys verilirse sadece bu node id'lere ait sonuçlar yazılır.
+        """
+        results = [r for r in self.test_results if test_keys is None or result_key(r) in test_keys]
+        bundle = {
+            'format': BUNDLE_FORMAT,
+            'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'metadata': metadata or {},
+            'results': results,
+            'stats': self.stats,
+        }
+        os.makedirs(os.path.dirname(bundle_path) or '.', exist_ok=True)
+        with open(bundle_path, 'w', encoding='utf-8') as f:
+            json.dump(bundle, f, ensure_ascii=False, indent=2)
+        print(f"📦 Result bundle written: {bundle_path} ({len(results)} results)")
+        return bundle_path
+
+    @staticmethod
+    def load_bundle(bundle_path):
+        """Bir sonuç paketini oku ve formatını doğrula."""
+        with open(bundle_path, 'r', encoding='utf-8') as f:
+            bundle = json.load(f)
+        if bundle.get('format') != BUNDLE_FORMAT:
+            raise ValueError(f"Unsupported result bundle format in {bundle_path}: {bundle.get('format')}")
+        return bundle
+
+    def merge_bundles(self, bundle_paths):
+        """
+        Paketleri bu raporlayıcıya birleştir.
+
+        Paketler shard sırasına göre işlenir; aynı test birden fazla pakette
+        varsa sonraki paketteki sonuç geçerli olur.
+        """
+        bundles = [self.load_bundle(p) for p in bundle_paths]
+        bundles.sort(key=lambda b: b['metadata'].get('shard_index', 0))
+        merged = {result_key(r): r for r in self.test_results}
+        for bundle in bundles:
+            for result in bundle['results']:
+                merged[result_key(result)] = result
+            for section, rows in bundle.get('stats', {}).items():
+                self.stats.setdefault(section, {}).update(rows)
+        self.test_results = list(merged.values())
+        self.save_results()
+        print(f"🔗 Merged {len(bundles)} bundles into {len(self.test_results)} test results")
+
     def generate_html(self, output_path="reports/simple_report.html"):
         """Basit HTML rapor oluştur."""
         
@@ -271,6 +362,17 @@ class SimpleReporter:
             color: #666;
             margin-bottom: 20px;
         }}
+        
+        .extra {{
+            color: #555;
+            font-size: 0.85em;
+            margin-top: 5px;
+        }}
+        
+        .stats-title {{
+            color: #333;
+            margin-top: 30px;
+        }}
     </style>
 </head>
 <body>
@@ -334,6 +436,7 @@ class SimpleReporter:
                     <td>{result['timestamp']}</td>
                     <td>
                         {f'<div class="error">{error_text}</div>' if error_text else ""}
+                        {self._render_extra(result.get('extra', {}))}
                         <div class="logs-section">
                             <button class="logs-toggle" onclick="toggleLogs('logs-{i}')">
                                 📋 Detaylı Loglar
@@ -349,7 +452,9 @@ class SimpleReporter:
         html_content += """
             </tbody>
         </table>
-        
+"""
+        html_content += self._render_stats()
+        html_content += """
         <div class="footer">
             <p>🚀 N11 Automation Framework</p>
             <p>Powered by Python + Selenium</p>
@@ -397,6 +502,36 @@ class SimpleReporter:
         print(f"✅ Basit HTML raporu oluşturuldu: {output_path}")
         return output_path
 
+    def _render_extra(self, extra):
+        """Test başına ek metrikleri HTML satırları olarak döndür."""
+        if not extra:
+            return ""
+        lines = "".join(f"<div>{key}: {value}</div>" for key, value in extra.items())
+        return f'<div class="extra">{lines}</div>'
+
+    def _render_stats(self):
+        """İstatistik bölümlerini (ör. flaky oranları) tablolar halinde döndür."""
+        html = ""
+        for section, rows in self.stats.items():
+            if not rows:
+                continue
+            columns = []
+            for values in rows.values():
+                columns += [c for c in values if c not in columns]
+            header = "".join(f"<th>{c}</th>" for c in columns)
+            body = ""
+            for key, values in rows.items():
+                cells = "".join(f"<td>{values.get(c, '')}</td>" for c in columns)
+                body += f"<tr><td><strong>{key}</strong></td>{cells}</tr>"
+            html += f"""
+        <h2 class="stats-title">{section}</h2>
+        <table>
+            <thead><tr><th></th>{header}</tr></thead>
+            <tbody>{body}</tbody>
+        </table>
+"""
+        return html
+
 # Demo kullanım
 def create_demo():
     """Demo rapor oluştur."""
@@ -417,10 +552,19 @@ def clear_all_results():
     reporter.clear_results()
     return reporter.generate_html()
 
+def merge_result_bundles(bundle_paths, output_path="reports/merged_report.html"):
+    """Shard paketlerini tek bir HTML raporda birleştir (çevrimdışı çalışır)."""
+    reporter = SimpleReporter("reports/merged_results.pkl")
+    reporter.clear_results()
+    reporter.merge_bundles(bundle_paths)
+    return reporter.generate_html(output_path)
+
 if __name__ == "__main__":
     import sys
     if len(sys.argv) > 1 and sys.argv[1] == "clear":
         clear_all_results()
         print("🗑️ All results cleared and report regenerated")
+    elif len(sys.argv) > 2 and sys.argv[1] == "merge":
+        merge_result_bundles(sys.argv[2:])
     else:
         create_demo()
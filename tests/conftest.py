@@ -2,14 +2,29 @@
 Pytest configuration and fixtures.
 """
 import pytest
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 import logging
 from datetime import datetime
 import time
 from simple_report import SimpleReporter
+from utils.browser_pool import BrowserPool
+from utils.browser_context import IsolatedContext
+from utils.driver_factory import create_driver
+from utils.locator_health import get_locator_index
+from utils.listing_url import get_url_encodings
+from utils.throttling import apply_profile, clear_profile
+from utils.resource_monitor import leak_suspected
+from pages.base_page import page_changing
+
+pytest_plugins = [
+    "plugins.duration_scheduler",
+    "plugins.sharding",
+    "plugins.flaky_rerun",
+    "plugins.web_vitals",
+    "plugins.throttling",
+    "plugins.resource_monitor",
+    "plugins.auto_workers",
+    "plugins.webdriver_executor",
+]
 
 # Configure logging
 logging.basicConfig(
@@ -20,45 +35,70 @@ logging.basicConfig(
 # Global reporter instance (reset at session start)
 reporter = None
 
+@pytest.fixture(scope="session")
+def browser_pool(request):
+    """
+    Session-wide browser pool (used when --reuse-browser or --isolate-context is given).
+    
+    Yields:
+        BrowserPool: Pool of warm Chrome instances
+    """
+    # Sessions whose idle memory keeps growing across tests are retired instead of reused
+    pool = BrowserPool(factory=lambda: create_driver(headless=request.config.getoption("headless")),
+                       retire=leak_suspected)
+    yield pool
+    pool.close_all()
+
 @pytest.fixture(scope="function")
-def driver():
+def driver(request, throttle_profile):
     """
     WebDriver fixture for each test.
     
+    Args:
+        throttle_profile: Network/CPU throttle profile of the test (None: unthrottled)
+    
     Yields:
         WebDriver: Chrome WebDriver instance
     """
-    # Chrome options for better stability
-    chrome_options = Options()
-    chrome_options.add_argument("--start-maximized")
-    chrome_options.add_argument("--disable-notifications")
-    chrome_options.add_argument("--disable-popup-blocking")
-    chrome_options.add_argument("--disable-extensions")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-web-security")
-    chrome_options.add_argument("--allow-running-insecure-content")
-    chrome_options.add_argument("--disable-features=VizDisplayCompositor")
-    
-    # Performance preferences
-    chrome_options.add_experimental_option("prefs", {
-        "profile.default_content_setting_values.notifications": 2,
-        "profile.default_content_settings.popups": 0
-    })
-    
-    # Create service and driver
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    
-    # Set timeouts for better stability
-    driver.set_page_load_timeout(30)  # Page load timeout
-    driver.set_script_timeout(30)     # Script timeout
-    
-    # DO NOT use implicit wait - it can cause issues with explicit waits
-    # driver.implicitly_wait(10)  # KALDIR!
-    
+    isolate = request.config.getoption("isolate_context")
+    if request.config.getoption("reuse_browser") or isolate:
+        pool = request.getfixturevalue("browser_pool")
+        driver = pool.acquire()
+        logging.info("WebDriver acquired from browser pool")
+        # A fresh context per test: isolated cookies/storage without a new Chrome process
+        try:
+            context = IsolatedContext(driver).open() if isolate else None
+            if throttle_profile is not None:
+                apply_profile(driver, throttle_profile)
+        except Exception:
+            # Setup failed before the test got the browser; it may hold a half-made context or throttling
+            pool.release(driver, reusable=False)
+            raise
+        yield driver
+        reusable = True
+        if context is not None:
+            # Throttling belonged to the context's tab and goes away with it;
+            # a context that could not be disposed must not serve the next test
+            if not context.close():
+                reusable = False
+        elif throttle_profile is not None:
+            try:
+                clear_profile(driver)
+            except Exception as e:
+                # A browser that keeps its throttling must not serve the next test
+                logging.warning(f"Could not clear throttle profile: {e}")
+                reusable = False
+        pool.release(driver, reusable=reusable)
+        return
+
+    driver = create_driver(headless=request.config.getoption("headless"))
     logging.info("WebDriver initialized with optimized settings")
+    if throttle_profile is not None:
+        try:
+            apply_profile(driver, throttle_profile)
+        except Exception:
+            driver.quit()
+            raise
     
     yield driver
     
@@ -106,6 +146,7 @@ def handle_cookie_popup(driver):
         logging.info("Cookie consent data set in localStorage")
         
         # Refresh page to apply the consent
+        page_changing(driver)
         driver.refresh()
         
         # Wait for page to load after refresh
@@ -151,15 +192,25 @@ def stores_page(driver):
         StoresPage: Initialized stores page object
     """
     from pages.stores_page import StoresPage
+    from utils.store_catalog import StoreCatalog
     
-    # Navigate to stores page
-    stores_page = StoresPage(driver)
+    # Navigate to stores page; random stores come from the crawled catalog while it is fresh
+    stores_page = StoresPage(driver, catalog=StoreCatalog())
     
     # Handle cookie popup if present
     handle_cookie_popup(driver)
     
     return stores_page
 
+# Command line options
+def pytest_addoption(parser):
+    """Browser options."""
+    parser.addoption("--headless", action="store_true", default=False, help="run Chrome headless")
+    parser.addoption("--reuse-browser", action="store_true", default=False,
+                     help="reuse pooled browsers between tests instead of starting a new Chrome per test")
+    parser.addoption("--isolate-context", action="store_true", default=False,
+                     help="run each test in a fresh browser context of a pooled browser (implies --reuse-browser)")
+
 # Pytest hooks for simple reporting
 def pytest_configure(config):
     """Configure custom markers."""
@@ -176,6 +227,8 @@ def pytest_sessionstart(session):
         logging.info("🆕 Simple reporter initialized")
     else:
         logging.info("📄 Existing reporter found, keeping previous test results")
+    # Eklentiler (flaky, metrikler vb.) aynı raporlayıcıya yazsın
+    session.config.simple_reporter = reporter
 
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
@@ -214,12 +267,24 @@ def pytest_runtest_makereport(item, call):
         except Exception as e:
             logs = f"Log bilgisi alınamadı: {str(e)}"
         
+        # Metrics attached by plugins through item.user_properties
+        extra = dict(report.user_properties)
+        
         # Add to reporter
-        reporter.add_result(test_name, status, duration, error_msg, logs)
+        reporter.add_result(test_name, status, duration, error_msg, logs, extra, nodeid=item.nodeid)
         logging.info(f"📝 Captured test result: {test_name} = {status}")
 
 def pytest_sessionfinish(session, exitstatus):
     """Generate simple HTML report when session finishes."""
+    # Persist this session's locator health (merged with other workers) and show it in the report
+    locator_index = get_locator_index()
+    if locator_index.save():
+        reporter.stats["Locator health"] = locator_index.summary()
+        reporter.save_results()
+    
+    # Persist URL encodings learned by SearchResultPage.open_listing
+    get_url_encodings().save()
+    
     try:
         output_path = reporter.generate_html("reports/live_report.html")
         print(f"\n🎉 Live HTML Report: file://{output_path}")
@@ -0,0 +1,107 @@
+"""Unit tests for the CDP connection's command/event routing over a fake websocket (no browser needed)."""
+import asyncio
+import json
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from utils.async_driver import CdpConnection, CdpError
+
+
+class _FakeWebSocket:
+    """Records sent frames; frames pushed with ``receive`` are yielded to the reader."""
+
+    def __init__(self):
+        self.sent = []
+        self._incoming = asyncio.Queue()
+
+    async def send(self, raw):
+        self.sent.append(json.loads(raw))
+
+    def receive(self, message):
+        self._incoming.put_nowait(json.dumps(message))
+
+    async def close(self):
+        self._incoming.put_nowait(None)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        raw = await self._incoming.get()
+        if raw is None:
+            raise StopAsyncIteration
+        return raw
+
+
+async def _sent(websocket, count):
+    while len(websocket.sent) < count:
+        await asyncio.sleep(0)
+    return websocket.sent[count - 1]
+
+
+def test_send_matches_answers_by_id():
+    async def scenario():
+        websocket = _FakeWebSocket()
+        connection = CdpConnection(websocket)
+        first = asyncio.ensure_future(connection.send("Page.navigate", {"url": "about:blank"}, session_id="S1"))
+        second = asyncio.ensure_future(connection.send("Target.getTargets"))
+        assert await _sent(websocket, 1) == {"id": 1, "method": "Page.navigate",
+                                             "params": {"url": "about:blank"}, "sessionId": "S1"}
+        assert await _sent(websocket, 2) == {"id": 2, "method": "Target.getTargets", "params": {}}
+        # Answers arrive out of order
+        websocket.receive({"id": 2, "result": {"targetInfos": []}})
+        websocket.receive({"id": 1, "result": {"frameId": "F"}})
+        assert await first == {"frameId": "F"}
+        assert await second == {"targetInfos": []}
+        assert connection._pending == {}
+        await connection.close()
+
+    asyncio.run(scenario())
+
+
+def test_send_raises_protocol_errors_and_timeouts():
+    async def scenario():
+        websocket = _FakeWebSocket()
+        connection = CdpConnection(websocket)
+        failing = asyncio.ensure_future(connection.send("DOM.getDocument"))
+        await _sent(websocket, 1)
+        websocket.receive({"id": 1, "error": {"code": -32000, "message": "No node"}})
+        with pytest.raises(CdpError, match="No node"):
+            await failing
+        with pytest.raises(TimeoutException, match="Runtime.evaluate"):
+            await connection.send("Runtime.evaluate", timeout=0.01)
+        assert connection._pending == {}
+        await connection.close()
+
+    asyncio.run(scenario())
+
+
+def test_expect_resolves_only_for_matching_method_and_session():
+    async def scenario():
+        websocket = _FakeWebSocket()
+        connection = CdpConnection(websocket)
+        loaded = connection.expect("Page.loadEventFired", session_id="S1")
+        websocket.receive({"method": "Page.loadEventFired", "sessionId": "S2", "params": {"timestamp": 1}})
+        websocket.receive({"method": "Page.frameNavigated", "sessionId": "S1", "params": {}})
+        websocket.receive({"method": "Page.loadEventFired", "sessionId": "S1", "params": {"timestamp": 2}})
+        assert await asyncio.wait_for(loaded, 1) == {"timestamp": 2}
+        assert connection._waiters == []
+        await connection.close()
+
+    asyncio.run(scenario())
+
+
+def test_close_fails_pending_commands_and_waiters():
+    async def scenario():
+        websocket = _FakeWebSocket()
+        connection = CdpConnection(websocket)
+        command = asyncio.ensure_future(connection.send("Page.navigate"))
+        event = connection.expect("Page.loadEventFired")
+        await _sent(websocket, 1)
+        await connection.close()
+        for future in (command, event):
+            with pytest.raises(CdpError, match="closed"):
+                await future
+
+    asyncio.run(scenario())
@@ -0,0 +1,69 @@
+"""
+Cart API helper against the local cart stand-in (no browser needed).
+"""
+import pytest
+
+from utils.cart_api import CartApi, CartApiError, CartEndpoints
+from utils.cart_stub_server import STUB_ENDPOINTS, CartStubServer
+
+
+@pytest.fixture
+def cart_server():
+    """Cart stand-in on a free local port."""
+    with CartStubServer() as server:
+        yield server
+
+
+@pytest.fixture
+def api(cart_server):
+    """CartApi bound to the stand-in."""
+    api = CartApi(STUB_ENDPOINTS, base_url=cart_server.base_url)
+    yield api
+    api.close()
+
+
+def test_add_list_and_clear(api, cart_server):
+    """Items added over HTTP are listed and cleared in the same session."""
+    items = api.add_item("123", quantity=2)
+    assert [(item["productId"], item["quantity"]) for item in items] == [("123", 2)]
+
+    api.add_item("456", sku_id="789")
+    listed = api.list_items()
+    assert [item["productId"] for item in listed] == ["123", "456"]
+    assert listed[1]["skuId"] == "789"
+
+    assert api.clear() == 2
+    assert api.list_items() == []
+    # All calls reused the session cookie set by the first response
+    assert len(cart_server.carts) == 1
+
+
+def test_remove_item(api):
+    """Removing one item keeps the others."""
+    api.add_item("123")
+    kept = api.add_item("456")[1]
+    first = api.list_items()[0]
+    assert api.remove_item(first["id"]) == [kept]
+
+
+def test_sessions_have_separate_carts(cart_server):
+    """A helper without the session cookie sees its own, empty cart."""
+    first = CartApi(STUB_ENDPOINTS, base_url=cart_server.base_url)
+    second = CartApi(STUB_ENDPOINTS, base_url=cart_server.base_url)
+    try:
+        first.add_item("123")
+        assert second.list_items() == []
+    finally:
+        first.close()
+        second.close()
+
+
+def test_unknown_endpoint_raises(cart_server):
+    """Paths the server does not serve surface as CartApiError."""
+    endpoints = CartEndpoints(add="/nope/add", items="/nope/items", remove="/nope/remove", clear="/nope/clear")
+    api = CartApi(endpoints, base_url=cart_server.base_url)
+    try:
+        with pytest.raises(CartApiError, match="404"):
+            api.list_items()
+    finally:
+        api.close()
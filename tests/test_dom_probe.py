@@ -0,0 +1,65 @@
+"""Unit tests for the batch presence probe with a fake driver (no browser needed)."""
+from selenium.common.exceptions import JavascriptException, WebDriverException
+from selenium.webdriver.common.by import By
+
+from utils.dom_probe import EMPTY_PROBE, probe_locators, to_probe_query
+from utils.locator_health import LocatorSet
+
+UNSUPPORTED = ("accessibility id", "cart-button")
+
+
+class _ProbeDriver:
+    """Answers the probe script from a css/xpath value -> (count, visible) table."""
+
+    def __init__(self, matches=None, error=None):
+        self.matches = matches or {}
+        self.error = error
+        self.calls = []
+
+    def execute_script(self, script, queries):
+        self.calls.append(queries)
+        if self.error is not None:
+            raise self.error
+        results = []
+        for query in queries:
+            count, visible = self.matches.get(query["value"], (0, False))
+            results.append({"count": count, "visible": visible, "firstVisible": visible, "error": None})
+        return results
+
+
+def test_translates_selenium_strategies():
+    assert to_probe_query((By.ID, 'a"b')) == {"kind": "css", "value": '[id="a\\"b"]'}
+    assert to_probe_query((By.CLASS_NAME, "btn  primary")) == {"kind": "css", "value": ".btn.primary"}
+    assert to_probe_query((By.LINK_TEXT, "Sepet")) == {"kind": "link", "value": "Sepet"}
+    assert to_probe_query(UNSUPPORTED) is None
+
+
+def test_unsupported_strategy_is_absent_and_not_sent(caplog):
+    driver = _ProbeDriver({"#cart": (1, True)})
+    results = probe_locators(driver, [(By.CSS_SELECTOR, "#cart"), UNSUPPORTED])
+    assert results[UNSUPPORTED] == EMPTY_PROBE
+    assert results[(By.CSS_SELECTOR, "#cart")]["visible"]
+    assert driver.calls == [[{"kind": "css", "value": "#cart"}]]
+    assert "Unsupported locator strategy" in caplog.text
+
+
+def test_only_unsupported_strategies_skip_the_script():
+    driver = _ProbeDriver()
+    assert probe_locators(driver, [UNSUPPORTED]) == {UNSUPPORTED: EMPTY_PROBE}
+    assert driver.calls == []
+
+
+def test_locator_set_reports_first_matching_alternative():
+    locator = LocatorSet("badge", (By.CSS_SELECTOR, ".old"), (By.CSS_SELECTOR, ".new"))
+    results = probe_locators(_ProbeDriver({".new": (2, True)}), [locator])
+    assert results[locator] == {"present": True, "visible": True, "first_visible": True, "count": 2}
+
+
+def test_script_errors_report_every_locator_absent(caplog):
+    locators = [(By.CSS_SELECTOR, "#cart"), (By.XPATH, "//a")]
+    for error, message in ((JavascriptException("Array.from is not a function"), "raised in the page"),
+                           (WebDriverException("disconnected"), "Probe script failed")):
+        caplog.clear()
+        results = probe_locators(_ProbeDriver({"#cart": (1, True)}, error=error), locators)
+        assert results == {locator: EMPTY_PROBE for locator in locators}
+        assert message in caplog.text
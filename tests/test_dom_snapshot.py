@@ -0,0 +1,104 @@
+"""
+DOM snapshot queries against static HTML (no browser needed).
+"""
+import pytest
+from selenium.webdriver.common.by import By
+
+from pages.search_result_page import SearchResultPage
+from utils.dom_snapshot import DomSnapshot, StaleSnapshotError, hidden_by_markup, invalidate_snapshot, xpath_literal
+from utils.locator_health import LocatorSet
+
+LISTING_HTML = """
+<html><body>
+  <h1 class="resultText">  telefon
+     araması </h1>
+  <div id='say "hi"' name="it's">quoted</div>
+  <ul class="productList">
+    <li class="column"><div class="imgHolder">
+      <div class="cargoBadgeField"><span class="cargoBadgeText">Ücretsiz  Kargo</span></div>
+    </div></li>
+    <li class="column"><div class="imgHolder">
+      <div class="cargoBadgeField" style="display: none"><span class="cargoBadgeText">Kargo</span></div>
+    </div></li>
+    <li class="column"><div class="imgHolder"></div></li>
+  </ul>
+  <a href="/a">Mağaza "A" & 'B'</a>
+</body></html>
+"""
+
+
+class _StaticDriver:
+    """Just enough of a WebDriver for snapshots: a fixed page source."""
+
+    current_url = "http://127.0.0.1/arama?q=telefon"
+
+    def __init__(self, html):
+        self.html = html
+        self.page_source_reads = 0
+
+    @property
+    def page_source(self):
+        self.page_source_reads += 1
+        return self.html
+
+
+@pytest.fixture
+def snapshot():
+    return DomSnapshot(LISTING_HTML)
+
+
+def test_xpath_literal_quotes_any_value():
+    """Values with one or both quote kinds become valid literals."""
+    assert xpath_literal("plain") == '"plain"'
+    assert xpath_literal('say "hi"') == "'say \"hi\"'"
+    assert xpath_literal("""a"b'c""") == """concat("a", '"', "b'c")"""
+
+
+def test_id_and_name_with_quotes(snapshot):
+    """ID/NAME values are quoted, not pasted into the XPath."""
+    assert snapshot.text((By.ID, 'say "hi"')) == "quoted"
+    assert snapshot.text((By.NAME, "it's")) == "quoted"
+
+
+def test_link_text_with_both_quotes(snapshot):
+    """Link texts with both quote kinds go through concat()."""
+    assert snapshot.attribute((By.LINK_TEXT, """Mağaza "A" & 'B'"""), "href") == "/a"
+    assert snapshot.exists((By.PARTIAL_LINK_TEXT, """"A" & 'B'"""))
+
+
+def test_css_class_and_locator_set(snapshot):
+    """CSS and class locators count locally; a LocatorSet falls back to the alternative with matches."""
+    assert snapshot.count((By.CSS_SELECTOR, ".imgHolder")) == 3
+    assert snapshot.count((By.CLASS_NAME, "cargoBadgeField")) == 2
+    cards = LocatorSet("cards", (By.CSS_SELECTOR, ".missing"), (By.CSS_SELECTOR, ".productList > li.column"))
+    assert snapshot.count(cards) == 3
+    assert snapshot.text((By.CSS_SELECTOR, ".resultText")) == "telefon araması"
+
+
+def test_invalidated_snapshot_raises(snapshot):
+    """Queries on an outdated snapshot fail instead of answering from old HTML."""
+    snapshot.invalidate()
+    with pytest.raises(StaleSnapshotError):
+        snapshot.count((By.CSS_SELECTOR, ".imgHolder"))
+
+
+def test_hidden_by_markup(snapshot):
+    """Inline display:none on the element or an ancestor hides it."""
+    badges = snapshot.find_all((By.CSS_SELECTOR, ".cargoBadgeField"))
+    assert [hidden_by_markup(badge) for badge in badges] == [False, True]
+    assert hidden_by_markup(badges[1].cssselect(".cargoBadgeText")[0])
+
+
+def test_cargo_badges_read_from_one_snapshot():
+    """The listing's badge check reads every product from a single page source."""
+    driver = _StaticDriver(LISTING_HTML)
+    # Page object without its live-page checks: only the snapshot read is under test
+    page = SearchResultPage.__new__(SearchResultPage)
+    page.driver = driver
+    try:
+        assert page._read_cargo_badges() == [("visible", "Ücretsiz Kargo"), ("hidden", ""), ("missing", "")]
+        # The snapshot stays active, so a second read makes no round trip
+        page._read_cargo_badges()
+        assert driver.page_source_reads == 1
+    finally:
+        invalidate_snapshot(driver)
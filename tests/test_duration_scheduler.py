@@ -0,0 +1,49 @@
+"""Unit tests for duration estimation and bin packing (no browser needed)."""
+from plugins.duration_scheduler import (
+    DEFAULT_UNKNOWN_DURATION,
+    estimate_durations,
+    pack_bins,
+    predict_makespan,
+)
+
+
+def test_pack_bins_balances_longest_first():
+    durations = {"a": 8.0, "b": 7.0, "c": 6.0, "d": 5.0, "e": 4.0}
+    bins = pack_bins(durations, 2)
+    assert bins == [["a", "d", "e"], ["b", "c"]]
+    assert predict_makespan(durations, 2) == 17.0
+
+
+def test_pack_bins_breaks_ties_by_nodeid():
+    durations = {"t2": 1.0, "t1": 1.0, "t3": 1.0}
+    assert pack_bins(durations, 3) == [["t1"], ["t2"], ["t3"]]
+    assert pack_bins(durations, 3) == pack_bins(dict(reversed(list(durations.items()))), 3)
+
+
+def test_pack_bins_with_more_bins_than_tests_leaves_empty_bins():
+    assert pack_bins({"only": 3.0}, 3) == [["only"], [], []]
+
+
+def test_estimate_durations_keeps_same_named_tests_apart():
+    history = {"tests/a_case.py::TestA::test_run": 30.0, "tests/b_case.py::TestB::test_run": 2.0}
+    durations = estimate_durations(sorted(history), history)
+    assert durations == history
+
+
+def test_estimate_durations_defaults_unknown_tests():
+    history = {"x": 1.0, "y": 3.0, "z": 20.0}
+    assert estimate_durations(["new"], history) == {"new": 3.0}
+    assert estimate_durations(["new"], {}) == {"new": DEFAULT_UNKNOWN_DURATION}
+    assert estimate_durations(["new"], history, default=0.5) == {"new": 0.5}
+
+
+def test_reporter_records_durations_per_nodeid(tmp_path):
+    from simple_report import SimpleReporter
+    reporter = SimpleReporter(str(tmp_path / "results.pkl"))
+    reporter.add_result("test_run", "PASS", 30.0, nodeid="tests/a_case.py::TestA::test_run")
+    reporter.add_result("test_run", "PASS", 2.0, nodeid="tests/b_case.py::TestB::test_run")
+    reporter.add_result("test_run", "PASS", 31.0, nodeid="tests/a_case.py::TestA::test_run")
+    assert SimpleReporter(reporter.results_file).get_durations() == {
+        "tests/a_case.py::TestA::test_run": 31.0,
+        "tests/b_case.py::TestB::test_run": 2.0,
+    }
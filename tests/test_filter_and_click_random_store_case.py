@@ -34,17 +34,22 @@ class TestStores:
         assert store_count > 0, "Should find stores after filtering by 'S'"
         logger.info(f"✅ SUCCESS: Found {store_count} stores after filtering by 'S'")
 
-        # Act - Step 3: Get random index and click
-        logger.info("🎲 STEP 3: Generating random store index for selection")
-        random_index = stores_page.generate_random_store_index()
-        assert 1 <= random_index <= store_count, "Random index should be within valid range"
-        logger.info(f"✅ SUCCESS: Generated random index: {random_index} (valid range: 1-{store_count})")
+        # Act - Step 3: Pick a random store (from the store catalog when it is fresh)
+        logger.info("🎲 STEP 3: Picking a random store for selection")
+        store = stores_page.pick_random_store("S")
+        random_store_name = store["name"]
+        assert random_store_name, "Random store should have a name"
+        # Catalog indexes run over the whole list, page indexes over the listed rows
+        catalog_count = stores_page.catalog.count("S") if stores_page.catalog is not None else 0
+        store_range = max(store_count, catalog_count)
+        assert 1 <= store["index"] <= store_range, "Random store index should be within valid range"
+        logger.info(f"✅ SUCCESS: Picked random store: {random_store_name} "
+                    f"at index {store['index']} (valid range: 1-{store_range})")
 
         # Act - Step 4: Click on the random store and get result view page
-        logger.info(f"🏪 STEP 4: Clicking on store at index {random_index}")
-        random_store_name = stores_page.get_random_store_name(random_index)
-        result_view_page = stores_page.click_store_by_index(random_index)
-        logger.info(f"✅ SUCCESS: Successfully clicked on store at index: {random_index}")
+        logger.info(f"🏪 STEP 4: Clicking on store '{random_store_name}'")
+        result_view_page = stores_page.click_store(store)
+        logger.info(f"✅ SUCCESS: Successfully clicked on store: {random_store_name}")
 
         # Act - Step 5: Verify result view page
         logger.info("📋 STEP 5: Waiting for store page to load completely")
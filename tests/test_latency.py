@@ -0,0 +1,40 @@
+"""
+Step latency statistics (no browser needed).
+"""
+from utils.latency import LatencyRecorder, format_prometheus, percentile
+
+
+def test_percentile_nearest_rank():
+    assert percentile([], 50) is None
+    assert percentile([3, 1, 2, 4], 50) == 2
+    assert percentile([3, 1, 2, 4], 95) == 4
+
+
+def test_failed_runs_stay_out_of_percentiles():
+    """A timeout does not drag the passed runs' p99; errors are counted and averaged on their own."""
+    recorder = LatencyRecorder()
+    for seconds in (0.1, 0.2, 0.3):
+        recorder.record("search_cart.search", seconds)
+    recorder.record("search_cart.search", 30.0, ok=False)
+
+    row = recorder.summary()["search_cart.search"]
+    assert row["count"] == 4 and row["errors"] == 1 and row["error_rate"] == 0.25
+    assert (row["p50_ms"], row["p99_ms"], row["max_ms"]) == (200, 300, 300)
+    assert row["error_avg_ms"] == 30000
+
+
+def test_only_failures_have_no_percentiles():
+    recorder = LatencyRecorder()
+    recorder.record("stores.open_store", 10.0, ok=False)
+    row = recorder.summary()["stores.open_store"]
+    assert row["p50_ms"] is None and row["max_ms"] is None and row["error_avg_ms"] == 10000
+
+
+def test_prometheus_export_splits_results():
+    recorder = LatencyRecorder()
+    recorder.record("stores.open_store", 0.2)
+    recorder.record("stores.open_store", 12.0, ok=False)
+    text = format_prometheus(recorder)
+    assert 'n11_step_runs_total{journey="stores",step="open_store",result="pass"} 1' in text
+    assert 'n11_step_runs_total{journey="stores",step="open_store",result="fail"} 1' in text
+    assert 'n11_step_duration_seconds_bucket{journey="stores",step="open_store",result="pass",le="0.25"} 1' in text
@@ -0,0 +1,78 @@
+"""
+Launch gate ledger (no browser needed).
+"""
+import pytest
+
+from utils import launch_gate
+from utils.launch_gate import LaunchGate, configure_launch_gate, forget_on_quit, launch_slot
+
+
+@pytest.fixture
+def gate(tmp_path, monkeypatch):
+    """Gate with plenty of free memory and its ledger in a temporary directory."""
+    monkeypatch.setattr(launch_gate, "available_memory_mb", lambda: 10000.0)
+    gate = LaunchGate(footprint_mb=1000, reserve_mb=500, lock_file=str(tmp_path / "launch.lock"))
+    configure_launch_gate(gate)
+    yield gate
+    configure_launch_gate(None)
+
+
+def _ledger(gate):
+    with gate._lock() as ledger:
+        return gate._read_ledger(ledger)
+
+
+class _FakeDriver:
+    def __init__(self):
+        self.quit_calls = 0
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+def test_recent_launch_counts_against_memory(gate):
+    """A browser that just started counts with its full footprint."""
+    with launch_slot() as launch_id:
+        pass
+    assert [launch[1] for launch in _ledger(gate)] == [launch_id]
+    assert gate.available_mb(_ledger(gate)) == pytest.approx(9000, abs=5)
+
+
+def test_quit_drops_the_launch(gate):
+    """Quitting the driver frees its share of the ledger."""
+    driver = _FakeDriver()
+    with launch_slot() as launch_id:
+        pass
+    forget_on_quit(driver, launch_id)
+    driver.quit()
+    assert driver.quit_calls == 1
+    assert _ledger(gate) == []
+
+
+def test_failed_launch_drops_the_launch(gate):
+    """A launch that raises leaves no ledger entry behind."""
+    with pytest.raises(RuntimeError):
+        with launch_slot():
+            raise RuntimeError("chrome did not start")
+    assert _ledger(gate) == []
+
+
+def test_lock_is_free_while_the_browser_starts(gate):
+    """The lock is released before the caller launches, so other processes can take it."""
+    fcntl = pytest.importorskip("fcntl")
+    with launch_slot():
+        with open(gate.lock_file, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def test_without_gate_slot_is_a_no_op():
+    """Serial runs have no gate: no launch id and quit stays untouched."""
+    configure_launch_gate(None)
+    driver = _FakeDriver()
+    original_quit = driver.quit
+    with launch_slot() as launch_id:
+        pass
+    forget_on_quit(driver, launch_id)
+    assert launch_id is None
+    assert driver.quit == original_quit
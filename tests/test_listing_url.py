@@ -0,0 +1,63 @@
+"""Unit tests for listing URL deltas and learned URL encodings (no browser needed)."""
+import json
+
+from utils.listing_url import UrlEncodings, is_unfiltered, param_delta, search_url, with_params
+
+BASE = "https://www.n11.com/arama?q=telefon"
+
+
+def test_param_delta_returns_added_and_changed_params():
+    assert param_delta(BASE, BASE + "&srt=REVIEWS") == {"srt": "REVIEWS"}
+    assert param_delta(BASE + "&srt=PRICE_LOW", BASE + "&srt=REVIEWS&m=Apple") == {"srt": "REVIEWS", "m": "Apple"}
+
+
+def test_param_delta_is_none_when_not_expressible_as_query():
+    assert param_delta(BASE, BASE) is None
+    assert param_delta(BASE, "https://www.n11.com/telefon-ve-aksesuarlari?q=telefon") is None
+    assert param_delta(BASE, "https://m.n11.com/arama?q=telefon&srt=REVIEWS") is None
+
+
+def test_with_params_replaces_existing_keys():
+    assert with_params(search_url("telefon"), {"q": "iphone", "srt": "REVIEWS"}) == \
+        "https://www.n11.com/arama?q=iphone&srt=REVIEWS"
+    assert is_unfiltered(search_url("telefon"))
+    assert not is_unfiltered(with_params(BASE, {"srt": "REVIEWS"}))
+
+
+def test_learned_encodings_round_trip_through_file(tmp_path):
+    path = str(tmp_path / "encodings.json")
+    encodings = UrlEncodings(path)
+    assert encodings.learn("sort:4", BASE, BASE + "&srt=REVIEWS") == {"srt": "REVIEWS"}
+    assert encodings.learn("brand:telefon:2", BASE, "https://www.n11.com/apple?q=telefon") is None
+    encodings.save()
+
+    reloaded = UrlEncodings(path)
+    assert reloaded.get("sort:4") == {"srt": "REVIEWS"}
+    assert reloaded.is_known("brand:telefon:2")
+    assert reloaded.get("brand:telefon:2") is None
+    assert not reloaded.is_known("free_shipping")
+
+
+def test_save_merges_with_other_processes_and_persists_forget(tmp_path):
+    path = str(tmp_path / "encodings.json")
+    first, second = UrlEncodings(path), UrlEncodings(path)
+    first.learn("sort:4", BASE, BASE + "&srt=REVIEWS")
+    first.save()
+    second.learn("free_shipping", BASE, BASE + "&kargo=ucretsiz")
+    second.save()
+    with open(path, encoding="utf-8") as f:
+        assert set(json.load(f)) == {"sort:4", "free_shipping"}
+
+    second.forget("sort:4")
+    second.save()
+    assert UrlEncodings(path).steps.keys() == {"free_shipping"}
+
+
+def test_expired_and_legacy_entries_are_relearned(tmp_path):
+    path = tmp_path / "encodings.json"
+    path.write_text(json.dumps({"sort:4": {"srt": "REVIEWS"}}))
+    assert not UrlEncodings(str(path)).is_known("sort:4")
+
+    encodings = UrlEncodings(str(tmp_path / "fresh.json"), ttl_seconds=0)
+    encodings.learn("sort:4", BASE, BASE + "&srt=REVIEWS")
+    assert encodings.get("sort:4") is None
@@ -0,0 +1,57 @@
+"""
+Locator health recording during resolution (no browser needed).
+"""
+import pytest
+from selenium.webdriver.common.by import By
+
+from utils.locator_health import LocatorHealthIndex, LocatorSet, locator_key
+
+PRIMARY = (By.CSS_SELECTOR, ".primary")
+FALLBACK = (By.CSS_SELECTOR, ".fallback")
+ROWS = LocatorSet("rows", PRIMARY, FALLBACK)
+
+
+class _PolledDriver:
+    """Answers find_elements from a script of polls: each poll is the set of selectors that match."""
+
+    def __init__(self, *polls):
+        self.polls = list(polls)
+        self.poll = 0
+
+    def find_elements(self, by, value):
+        matching = self.polls[min(self.poll, len(self.polls) - 1)] if self.polls else set()
+        if value == ROWS[-1][1]:
+            self.poll += 1
+        return ["row"] if value in matching else []
+
+
+@pytest.fixture
+def index(tmp_path):
+    return LocatorHealthIndex(str(tmp_path / "locator_health.json"))
+
+
+def _misses(index):
+    return {key: delta["attempts"] - delta["successes"] for key, delta in index._pending.items()}
+
+
+def test_misses_from_earlier_polls_are_recorded_once(index):
+    """An alternative that missed before the winner matched counts as one failure."""
+    driver = _PolledDriver(set(), set(), {".fallback"})
+    chosen, found = index.resolve_elements(driver, ROWS, timeout=2)
+    assert chosen == FALLBACK and found == ["row"]
+    assert _misses(index) == {locator_key(PRIMARY): 1, locator_key(FALLBACK): 0}
+
+
+def test_winner_is_not_penalized_for_loading_late(index):
+    """The winner's own misses on earlier polls are not failures."""
+    driver = _PolledDriver(set(), {".primary"})
+    chosen, _ = index.resolve_elements(driver, ROWS, timeout=2)
+    assert chosen == PRIMARY
+    assert _misses(index) == {locator_key(PRIMARY): 0, locator_key(FALLBACK): 1}
+
+
+def test_timeout_records_every_alternative(index):
+    """Nothing matched: every alternative is a miss, and no elements are returned."""
+    chosen, found = index.resolve_elements(_PolledDriver(set()), ROWS, timeout=0)
+    assert chosen == PRIMARY and found == []
+    assert _misses(index) == {locator_key(PRIMARY): 1, locator_key(FALLBACK): 1}
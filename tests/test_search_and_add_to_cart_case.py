@@ -2,7 +2,6 @@
 Test cases for N11 Search functionality.
 """
 import pytest
-from pages.home_page import HomePage
 from pages.search_result_page import SearchResultPage
 import logging
 
@@ -24,19 +23,15 @@ class TestSearch:
         product_listing_page.click_add_to_cart_button(cart_button_index)
         logger.info(f"✅ SUCCESS: Successfully added product to cart (button index: {cart_button_index})")
         
-        if product_listing_page.has_skus_items():
-            logger.info("📦 Product has SKU variants - selecting variants")
+        # Wait once for either the SKU panel or a direct cart addition
+        skus = product_listing_page.resolve_skus()
+        if skus:
+            logger.info(f"📦 Product has {len(skus)} SKU variants - selecting variants")
             
-            # Select first SKUS item
-            logger.info("🏷️ Selecting first SKU variant")
-            product_listing_page.click_skus_item(1)
-            logger.info("✅ SUCCESS: First SKU variant selected")
-        
-            # Select last SKUS item
-            skus_items_count = product_listing_page.get_skus_items_count()
-            logger.info(f"🏷️ Selecting last SKU variant (index: {skus_items_count})")
-            product_listing_page.click_skus_item(skus_items_count)
-            logger.info(f"✅ SUCCESS: Last SKU variant selected (index: {skus_items_count})")
+            # Select first and last SKU variants in one batch
+            logger.info(f"🏷️ Selecting first and last SKU variants (indexes: 1, {len(skus)})")
+            product_listing_page.select_skus([1, len(skus)])
+            logger.info("✅ SUCCESS: First and last SKU variants selected")
         
             # Click JS add basket sku
             logger.info("🛒 Clicking 'Add to Basket' button for SKU selection")
@@ -0,0 +1,50 @@
+"""Unit tests for the multi-machine shard split (no browser needed)."""
+import json
+
+import pytest
+
+from plugins import sharding
+from plugins.sharding import resolve_shard_history, shard_nodeids
+
+NODEIDS = [f"tests/test_{name}_case.py::TestCase::test_{name}" for name in "abcdefg"]
+
+
+@pytest.mark.parametrize("history", [None, {nodeid: float(i + 1) for i, nodeid in enumerate(NODEIDS)}])
+def test_shards_cover_every_test_exactly_once(history):
+    shards = [shard_nodeids(NODEIDS, history, index, 3) for index in range(3)]
+    assert set().union(*shards) == set(NODEIDS)
+    assert sum(len(shard) for shard in shards) == len(NODEIDS)
+
+
+@pytest.mark.parametrize("history", [None, {NODEIDS[0]: 9.0, NODEIDS[3]: 4.0}])
+def test_split_ignores_collection_order(history):
+    for index in range(3):
+        assert shard_nodeids(NODEIDS, history, index, 3) == shard_nodeids(NODEIDS[::-1], history, index, 3)
+
+
+def test_duration_split_balances_load():
+    history = {NODEIDS[0]: 10.0, NODEIDS[1]: 6.0, NODEIDS[2]: 4.0}
+    shards = [shard_nodeids(NODEIDS[:3], history, index, 2) for index in range(2)]
+    assert shards == [{NODEIDS[0]}, {NODEIDS[1], NODEIDS[2]}]
+
+
+def test_history_prefers_explicit_then_committed_file(tmp_path, monkeypatch):
+    explicit = tmp_path / "explicit.json"
+    explicit.write_text(json.dumps({"a": 1}))
+    committed = tmp_path / "shard_durations.json"
+    committed.write_text(json.dumps({"b": 2}))
+    monkeypatch.setattr(sharding, "DEFAULT_DURATIONS_FILE", str(committed))
+    missing_results = str(tmp_path / "none.pkl")
+
+    assert resolve_shard_history(str(explicit), missing_results) == ({"a": 1.0}, str(explicit))
+    assert resolve_shard_history(None, missing_results) == ({"b": 2.0}, str(committed))
+
+
+def test_history_falls_back_to_results_then_hash(tmp_path, monkeypatch):
+    from simple_report import SimpleReporter
+    monkeypatch.setattr(sharding, "DEFAULT_DURATIONS_FILE", str(tmp_path / "missing.json"))
+    results_file = str(tmp_path / "results.pkl")
+
+    assert resolve_shard_history(None, results_file) == (None, "node id hash")
+    SimpleReporter(results_file).add_result("test_a", "PASS", 3.5, nodeid=NODEIDS[0])
+    assert resolve_shard_history(None, results_file) == ({NODEIDS[0]: 3.5}, results_file)
@@ -0,0 +1,77 @@
+"""
+Sort-order checks and product card parsing (no browser needed).
+"""
+import pytest
+
+from pages.product_card import ProductCard, parse_count, parse_price
+from utils.sort_verifier import check_sort_order
+
+
+def _card(position, price=None, rating=None, comment_count=0):
+    return ProductCard(title=f"p{position}", url=f"/p{position}", price=price, rating=rating,
+                       comment_count=comment_count, free_shipping=False, position=position)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1.299,90 TL", 1299.90),
+    ("12.499 TL", 12499.0),
+    ("89,5", 89.5),
+    ("  749 TL ", 749.0),
+    ("Fiyat yok", None),
+    ("", None),
+    (None, None),
+])
+def test_parse_price(text, expected):
+    assert parse_price(text) == expected
+
+
+def test_parse_count():
+    assert parse_count("(1.234)") == 1234
+    assert parse_count("") == 0
+
+
+def test_descending_across_batches():
+    """Order is checked across batch (page) boundaries; ties are allowed."""
+    batches = [[_card(1, comment_count=50), _card(2, comment_count=40)],
+               [_card(3, comment_count=40), _card(4, comment_count=3)]]
+    result = check_sort_order(batches, "comment_count")
+    assert result.ok and result.checked == 4
+
+
+def test_violation_names_the_offending_pair():
+    batches = [[_card(1, price=10.0), _card(2, price=20.0)], [_card(3, price=15.0)]]
+    result = check_sort_order(batches, "price", descending=False)
+    assert not result.ok
+    assert (result.violation.previous.position, result.violation.current.position) == (2, 3)
+    assert "#2 'p2' = 20.0 followed by #3 'p3' = 15.0" in str(result.violation)
+
+
+def test_missing_values_are_skipped():
+    """Cards without a rating are counted as skipped and do not break the order."""
+    batches = [[_card(1, rating=4.5), _card(2), _card(3, rating=4.0)]]
+    result = check_sort_order(batches, "rating")
+    assert result.ok and (result.checked, result.skipped) == (2, 1)
+
+
+def test_stops_at_limit_and_first_violation():
+    """The stream is not read past the limit or the first violation."""
+    read = []
+
+    def batches():
+        for position in range(1, 100):
+            read.append(position)
+            yield [_card(position, comment_count=100 - position)]
+
+    assert check_sort_order(batches(), "comment_count", limit=5).checked == 5
+    assert read[-1] == 6
+
+    def broken():
+        yield [_card(1, comment_count=1), _card(2, comment_count=5)]
+        raise AssertionError("read past the violation")
+
+    assert not check_sort_order(broken(), "comment_count").ok
+
+
+def test_unknown_field_raises():
+    with pytest.raises(ValueError):
+        check_sort_order([], "title")
@@ -0,0 +1,53 @@
+"""
+Load/monitor journeys against the local site stand-in.
+"""
+import logging
+
+import pytest
+
+from utils.latency import LatencyRecorder
+from utils.load_runner import JOURNEYS, run_journey
+from utils.site import get_base_url, set_base_url
+from utils.site_stub_server import SiteStubServer
+
+
+@pytest.fixture(scope="module")
+def site_stub_server():
+    """Site stand-in on a free port; page objects navigate to it while the module runs."""
+    previous = get_base_url()
+    with SiteStubServer() as server:
+        set_base_url(server.base_url)
+        try:
+            yield server
+        finally:
+            set_base_url(previous)
+
+
+class TestStubJourneys:
+    """The synthetic-user journeys run end to end on the stand-in."""
+
+    @pytest.mark.parametrize("journey", ["search_cart", "stores"])
+    def test_journey_passes_on_stub(self, driver, site_stub_server, journey):
+        """
+        Test: A load/monitor journey passes against the site stand-in.
+
+        Steps:
+        1. Run every step of the journey on the test's browser
+        2. Verify every step passed and was timed
+        """
+        logger = logging.getLogger(__name__)
+        recorder = LatencyRecorder()
+
+        # Act - Step 1: Run the journey
+        logger.info(f"🚦 STEP 1: Running '{journey}' against {site_stub_server.base_url}")
+        steps = JOURNEYS[journey]()
+        ok = run_journey(driver, journey, steps, recorder)
+
+        # Assert - Step 2: Every step passed and has a latency
+        logger.info("🔍 STEP 2: Verifying step results")
+        summary = recorder.summary()
+        assert ok, f"Journey '{journey}' failed: {summary}"
+        for step_name, _ in steps:
+            row = summary[f"{journey}.{step_name}"]
+            assert row["errors"] == 0 and row["p50_ms"] is not None, f"{journey}.{step_name}: {row}"
+        logger.info(f"✅ SUCCESS: '{journey}' passed on the stand-in")
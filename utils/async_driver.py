@@ -0,0 +1,449 @@
+"""
+asyncio facade over the Chrome DevTools Protocol.
+
+Selenium commands are blocking HTTP calls, so one thread drives one browser
+operation at a time. ``AsyncBrowser`` talks CDP over a single websocket per
+browser instead: every tab is a flat CDP session on that connection and the
+core ``BasePage`` operations are coroutines on ``AsyncPage``::
+
+    browser = await AsyncBrowser.launch(headless=True)
+    pages = [await browser.new_page(isolated=True) for _ in range(8)]
+    await asyncio.gather(*(page.navigate_to(url) for page, url in zip(pages, urls)))
+    texts = await asyncio.gather(*(page.get_text(SearchResultPage.RESULT_TEXT) for page in pages))
+
+One event loop can drive many tabs and browsers concurrently. Locators are
+the page objects' ``(By, value)`` tuples or ``LocatorSet``s; timeouts raise
+selenium's ``TimeoutException`` so failures classify like the sync suite's.
+WebDriver BiDi is not used here: selenium's BiDi client is thread-based,
+and CDP covers the same operations for Chrome.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import time
+import urllib.request
+from typing import Any, Dict, List, Optional, Tuple
+
+import websockets
+from selenium.common.exceptions import JavascriptException, TimeoutException
+
+from utils.site import site_url
+
+DEFAULT_TIMEOUT = 10
+PAGE_LOAD_TIMEOUT = 30
+POLL_INTERVAL = 0.1
+
+# Finds the first alternative (By, value) that matches (and is visible when asked)
+_LOCATE_JS = """
+(alternatives, visible) => {
+  for (const [by, value] of alternatives) {
+    let el = null;
+    if (by === 'css selector') { el = document.querySelector(value); }
+    else if (by === 'id') { el = document.getElementById(value); }
+    else if (by === 'class name') { el = document.getElementsByClassName(value)[0] || null; }
+    else if (by === 'name') { el = document.getElementsByName(value)[0] || null; }
+    else if (by === 'tag name') { el = document.getElementsByTagName(value)[0] || null; }
+    else if (by === 'xpath') {
+      el = document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    if (el && (!visible || el.offsetWidth || el.offsetHeight || el.getClientRects().length)) { return el; }
+  }
+  return null;
+}
+"""
+
+
+class CdpError(Exception):
+    """Raised when a CDP command returns an error."""
+
+
+def _alternatives(locator) -> List[Tuple[str, str]]:
+    """A (By, value) tuple or a LocatorSet as a list of alternatives."""
+    if locator and isinstance(locator[0], (tuple, list)):
+        return [tuple(alternative) for alternative in locator]
+    return [tuple(locator)]
+
+
+class CdpConnection:
+    """One browser-level CDP websocket multiplexing commands and events of many sessions."""
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self.logger = logging.getLogger(__name__)
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._waiters: List[Tuple[str, Optional[str], asyncio.Future]] = []
+        self._reader = asyncio.get_running_loop().create_task(self._read())
+
+    @classmethod
+    async def connect(cls, ws_url: str) -> "CdpConnection":
+        """Open the websocket (no message size limit: DOM dumps and screenshots are large)."""
+        websocket = await websockets.connect(ws_url, max_size=None, ping_interval=None)
+        return cls(websocket)
+
+    async def send(self, method: str, params: Optional[dict] = None, session_id: Optional[str] = None,
+                   timeout: float = PAGE_LOAD_TIMEOUT) -> dict:
+        """
+        Send a command and wait for its result.
+
+        Args:
+            method: CDP method, e.g. "Page.navigate"
+            params: Command parameters
+            session_id: Target session (None: browser)
+            timeout: Seconds to wait for the answer
+
+        Returns:
+            dict: Command result
+        """
+        message_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = future
+        message = {"id": message_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        await self.websocket.send(json.dumps(message))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutException(f"CDP {method} did not answer in {timeout}s") from None
+        finally:
+            self._pending.pop(message_id, None)
+
+    def expect(self, method: str, session_id: Optional[str] = None) -> asyncio.Future:
+        """Future for the next ``method`` event of a session; register it before triggering the event."""
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((method, session_id, future))
+        return future
+
+    async def _read(self) -> None:
+        try:
+            async for raw in self.websocket:
+                message = json.loads(raw)
+                if "id" in message:
+                    future = self._pending.get(message["id"])
+                    if future is None or future.done():
+                        continue
+                    if "error" in message:
+                        future.set_exception(CdpError(message["error"].get("message", str(message["error"]))))
+                    else:
+                        future.set_result(message.get("result", {}))
+                    continue
+                self._dispatch(message.get("method"), message.get("sessionId"), message.get("params", {}))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            error = CdpError("CDP connection closed")
+            for future in list(self._pending.values()) + [w[2] for w in self._waiters]:
+                if not future.done():
+                    future.set_exception(error)
+
+    def _dispatch(self, method: str, session_id: Optional[str], params: dict) -> None:
+        remaining = []
+        for waiter in self._waiters:
+            wanted, wanted_session, future = waiter
+            if future.done():
+                continue
+            if wanted == method and wanted_session == session_id:
+                future.set_result(params)
+            else:
+                remaining.append(waiter)
+        self._waiters = remaining
+
+    async def close(self) -> None:
+        await self.websocket.close()
+        await self._reader
+
+
+class AsyncElement:
+    """A DOM element of an AsyncPage, held as a CDP remote object."""
+
+    def __init__(self, page: "AsyncPage", object_id: str):
+        self.page = page
+        self.object_id = object_id
+
+    async def call(self, function: str, *args) -> Any:
+        """Run ``function`` with ``this`` bound to the element and return its JSON value."""
+        result = await self.page.send("Runtime.callFunctionOn", {
+            "objectId": self.object_id,
+            "functionDeclaration": function,
+            "arguments": [{"value": arg} for arg in args],
+            "returnByValue": True,
+            "awaitPromise": True,
+        })
+        if "exceptionDetails" in result:
+            raise JavascriptException(result["exceptionDetails"].get("text", "script error"))
+        return result["result"].get("value")
+
+    async def text(self) -> str:
+        return (await self.call("function () { return (this.innerText || this.textContent || '').trim(); }")) or ""
+
+    async def click(self) -> None:
+        """Scroll into view and click the element's center with real mouse events."""
+        box = await self.call(
+            "function () { this.scrollIntoView({block: 'center'}); const r = this.getBoundingClientRect();"
+            " return {x: r.left + r.width / 2, y: r.top + r.height / 2}; }"
+        )
+        for event in ("mouseMoved", "mousePressed", "mouseReleased"):
+            await self.page.send("Input.dispatchMouseEvent", {
+                "type": event, "x": box["x"], "y": box["y"], "button": "left", "clickCount": 1,
+            })
+
+    async def type(self, value: str, clear: bool = True) -> None:
+        """Focus the element, optionally clear it, and insert text as keyboard input."""
+        await self.call(
+            "function (clear) { this.focus(); if (clear && 'value' in this) { this.value = '';"
+            " this.dispatchEvent(new Event('input', {bubbles: true})); } }",
+            clear,
+        )
+        await self.page.send("Input.insertText", {"text": value})
+
+
+class AsyncPage:
+    """One tab driven through a flat CDP session; BasePage operations as coroutines."""
+
+    def __init__(self, connection: CdpConnection, target_id: str, session_id: str,
+                 context_id: Optional[str] = None):
+        self.connection = connection
+        self.target_id = target_id
+        self.session_id = session_id
+        self.context_id = context_id
+        self.logger = logging.getLogger(__name__)
+
+    async def send(self, method: str, params: Optional[dict] = None, timeout: float = PAGE_LOAD_TIMEOUT) -> dict:
+        return await self.connection.send(method, params, self.session_id, timeout)
+
+    # ------------------
+    # Navigation
+    # ------------------
+    async def navigate_to(self, url: str, timeout: float = PAGE_LOAD_TIMEOUT) -> None:
+        """Navigate and wait for the load event."""
+        url = site_url(url)
+        loaded = self.connection.expect("Page.loadEventFired", self.session_id)
+        result = await self.send("Page.navigate", {"url": url})
+        if result.get("errorText"):
+            loaded.cancel()
+            raise CdpError(f"Navigation to {url} failed: {result['errorText']}")
+        try:
+            await asyncio.wait_for(loaded, timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutException(f"Page did not load in {timeout}s: {url}") from None
+        self.logger.info(f"Navigated to: {url}")
+
+    async def wait_for_page_load(self, timeout: float = PAGE_LOAD_TIMEOUT) -> None:
+        await self.wait_for("document.readyState === 'complete'", timeout)
+
+    # ------------------
+    # Scripts and waits
+    # ------------------
+    async def evaluate(self, expression: str) -> Any:
+        """Evaluate an expression (promises are awaited) and return its JSON value."""
+        result = await self.send("Runtime.evaluate", {
+            "expression": expression, "returnByValue": True, "awaitPromise": True,
+        })
+        if "exceptionDetails" in result:
+            raise JavascriptException(result["exceptionDetails"].get("text", "script error"))
+        return result["result"].get("value")
+
+    async def execute_script(self, script: str, *args) -> Any:
+        """Selenium-style script: a function body receiving ``arguments``."""
+        return await self.evaluate(f"(function () {{ {script} }}).apply(null, {json.dumps(list(args))})")
+
+    async def wait_for(self, expression: str, timeout: float = DEFAULT_TIMEOUT) -> Any:
+        """Poll an expression until it is truthy and return its value."""
+        deadline = time.monotonic() + timeout
+        while True:
+            value = await self.evaluate(expression)
+            if value:
+                return value
+            if time.monotonic() > deadline:
+                raise TimeoutException(f"Condition not met in {timeout}s: {expression}")
+            await asyncio.sleep(POLL_INTERVAL)
+
+    # ------------------
+    # Elements
+    # ------------------
+    async def _locate(self, locator, visible: bool) -> Optional[AsyncElement]:
+        expression = f"({_LOCATE_JS})({json.dumps(_alternatives(locator))}, {json.dumps(visible)})"
+        result = await self.send("Runtime.evaluate", {"expression": expression})
+        object_id = result.get("result", {}).get("objectId")
+        return AsyncElement(self, object_id) if object_id else None
+
+    async def find(self, locator, timeout: float = DEFAULT_TIMEOUT, visible: bool = True) -> AsyncElement:
+        """
+        Wait for an element to be present (and visible).
+
+        Args:
+            locator: (By, value) or LocatorSet
+            timeout: Maximum wait in seconds
+            visible: Also require the element to be rendered
+
+        Returns:
+            AsyncElement: The first matching element
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            element = await self._locate(locator, visible)
+            if element is not None:
+                return element
+            if time.monotonic() > deadline:
+                raise TimeoutException(f"Element not {'visible' if visible else 'present'} in {timeout}s: {locator}")
+            await asyncio.sleep(POLL_INTERVAL)
+
+    async def wait_visible(self, locator, timeout: float = DEFAULT_TIMEOUT) -> None:
+        await self.find(locator, timeout)
+
+    async def is_element_present(self, locator) -> bool:
+        return await self._locate(locator, visible=False) is not None
+
+    async def click(self, locator, timeout: float = DEFAULT_TIMEOUT) -> None:
+        await (await self.find(locator, timeout)).click()
+
+    async def type(self, locator, value: str, timeout: float = DEFAULT_TIMEOUT, clear: bool = True) -> None:
+        await (await self.find(locator, timeout)).type(value, clear)
+
+    async def get_text(self, locator, timeout: float = DEFAULT_TIMEOUT) -> str:
+        return await (await self.find(locator, timeout)).text()
+
+    async def close(self) -> None:
+        """Close the tab (and its isolated context)."""
+        await self.connection.send("Target.closeTarget", {"targetId": self.target_id})
+        if self.context_id:
+            await self.connection.send("Target.disposeBrowserContext", {"browserContextId": self.context_id})
+
+
+class AsyncBrowser:
+    """A Chrome instance driven over one CDP websocket."""
+
+    def __init__(self, connection: CdpConnection, driver=None):
+        """
+        Initialize AsyncBrowser.
+
+        Args:
+            connection: Browser-level CDP connection
+            driver: WebDriver that launched the browser (quit on close), if any
+        """
+        self.connection = connection
+        self.driver = driver
+        self.pages: List[AsyncPage] = []
+
+    @classmethod
+    async def connect(cls, debugger_address: str, driver=None) -> "AsyncBrowser":
+        """
+        Attach to a running Chrome.
+
+        Args:
+            debugger_address: "host:port" of Chrome's remote debugging endpoint
+            driver: Owning WebDriver, quit on close
+        """
+        def ws_url():
+            with urllib.request.urlopen(f"http://{debugger_address}/json/version", timeout=10) as response:
+                return json.load(response)["webSocketDebuggerUrl"]
+
+        return cls(await CdpConnection.connect(await asyncio.to_thread(ws_url)), driver)
+
+    @classmethod
+    async def from_driver(cls, driver, owns_driver: bool = False) -> "AsyncBrowser":
+        """Attach to the Chrome of an existing WebDriver session."""
+        address = driver.capabilities["goog:chromeOptions"]["debuggerAddress"]
+        return await cls.connect(address, driver if owns_driver else None)
+
+    @classmethod
+    async def launch(cls, headless: bool = True) -> "AsyncBrowser":
+        """Start Chrome with the suite's options (launch only goes through chromedriver)."""
+        from utils.driver_factory import create_driver
+        driver = await asyncio.to_thread(create_driver, headless)
+        return await cls.from_driver(driver, owns_driver=True)
+
+    async def new_page(self, isolated: bool = False) -> AsyncPage:
+        """
+        Open a tab and attach a session to it.
+
+        Args:
+            isolated: Give the tab its own browser context (cookies, storage)
+
+        Returns:
+            AsyncPage: Page ready for navigation
+        """
+        context_id = None
+        params = {"url": "about:blank"}
+        if isolated:
+            context_id = (await self.connection.send("Target.createBrowserContext"))["browserContextId"]
+            params["browserContextId"] = context_id
+        target_id = (await self.connection.send("Target.createTarget", params))["targetId"]
+        session_id = (await self.connection.send(
+            "Target.attachToTarget", {"targetId": target_id, "flatten": True}
+        ))["sessionId"]
+        page = AsyncPage(self.connection, target_id, session_id, context_id)
+        await page.send("Page.enable")
+        self.pages.append(page)
+        return page
+
+    async def close(self) -> None:
+        """Close the pages, the connection and, if launched here, the browser."""
+        for page in self.pages:
+            try:
+                await page.close()
+            except (CdpError, TimeoutException):
+                pass
+        self.pages = []
+        await self.connection.close()
+        if self.driver is not None:
+            await asyncio.to_thread(self.driver.quit)
+
+
+async def search_result_texts(keywords: List[str], tabs: int = 4, headless: bool = True) -> Dict[str, str]:
+    """
+    Open the search results of many keywords concurrently in one browser.
+
+    Args:
+        keywords: Search keywords
+        tabs: Tabs (isolated contexts) used at the same time
+        headless: Run Chrome headless
+
+    Returns:
+        Dict[str, str]: Keyword -> result text (or the error)
+    """
+    from pages.search_result_page import SearchResultPage
+    from utils.listing_url import search_url
+
+    browser = await AsyncBrowser.launch(headless=headless)
+    pending = list(keywords)
+    results: Dict[str, str] = {}
+
+    async def worker():
+        page = await browser.new_page(isolated=True)
+        while pending:
+            keyword = pending.pop(0)
+            try:
+                await page.navigate_to(search_url(keyword))
+                results[keyword] = await page.get_text(SearchResultPage.RESULT_TEXT)
+            except Exception as e:
+                results[keyword] = f"{type(e).__name__}: {e}"
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(min(tabs, len(keywords)))))
+    finally:
+        await browser.close()
+    return results
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Read search result texts of many keywords concurrently over CDP")
+    parser.add_argument("--keywords", default="telefon,laptop,kulaklik,saat", help="comma separated")
+    parser.add_argument("--tabs", type=int, default=4)
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    keywords = [k.strip() for k in args.keywords.split(",") if k.strip()]
+    started = time.monotonic()
+    results = asyncio.run(search_result_texts(keywords, args.tabs, headless=not args.headed))
+    for keyword, text in results.items():
+        print(f"{keyword}: {text}")
+    print(f"⏱️ {len(keywords)} keywords in {time.monotonic() - started:.1f}s with {args.tabs} tabs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Isolated browser contexts inside one running Chrome.
+
+``IsolatedContext`` gives a WebDriver session a fresh incognito-like
+context (own cookies, storage and cache) with one tab and switches the
+session to it; closing it throws the whole context away. Creating one takes
+milliseconds instead of the seconds of a new Chrome process, with the same
+state isolation.
+
+Two backends:
+
+- ``bidi``: WebDriver BiDi ``browser.createUserContext`` (sessions started
+  with BiDi enabled, i.e. a ``webSocketUrl`` capability)
+- ``cdp``: CDP ``Target.createBrowserContext`` + ``Target.createTarget``;
+  chromedriver's window handles are target ids, so the session can switch
+  to the new tab directly
+"""
+import logging
+import time
+from typing import Optional
+
+DEFAULT_TAB_TIMEOUT = 5.0
+
+
+class BrowserContextError(Exception):
+    """Raised when an isolated context cannot be created."""
+
+
+def bidi_enabled(driver) -> bool:
+    """True when the session was started with WebDriver BiDi."""
+    return isinstance(getattr(driver, "capabilities", {}).get("webSocketUrl"), str)
+
+
+class IsolatedContext:
+    """A fresh browser context with one tab, driven by an existing session."""
+
+    def __init__(self, driver, backend: str = "auto"):
+        """
+        Initialize IsolatedContext.
+
+        Args:
+            driver: Chrome WebDriver
+            backend: "bidi", "cdp" or "auto" (BiDi when the session has it)
+        """
+        if backend == "auto":
+            backend = "bidi" if bidi_enabled(driver) else "cdp"
+        if backend not in ("bidi", "cdp"):
+            raise ValueError(f"Unknown browser context backend '{backend}'")
+        self.driver = driver
+        self.backend = backend
+        self.context_id: Optional[str] = None
+        self.handle: Optional[str] = None
+        self.home_handle: Optional[str] = None
+        self.logger = logging.getLogger(__name__)
+
+    def open(self) -> "IsolatedContext":
+        """
+        Create the context and its tab and switch the session to the tab.
+
+        Returns:
+            IsolatedContext: self
+        """
+        started = time.perf_counter()
+        self.home_handle = self.driver.current_window_handle
+        try:
+            if self.backend == "bidi":
+                self.context_id = self.driver.browser.create_user_context()
+                self.handle = self.driver.browsing_context.create(type="tab", user_context=self.context_id)
+            else:
+                self.context_id = self.driver.execute_cdp_cmd("Target.createBrowserContext", {})["browserContextId"]
+                self.handle = self.driver.execute_cdp_cmd(
+                    "Target.createTarget", {"url": "about:blank", "browserContextId": self.context_id}
+                )["targetId"]
+                self._wait_for_handle()
+        except Exception as e:
+            self.close()
+            raise BrowserContextError(f"Could not create {self.backend} browser context: {e}") from e
+        self.driver.switch_to.window(self.handle)
+        self.logger.info(f"🧪 Isolated {self.backend} context ready in {(time.perf_counter() - started) * 1000:.0f}ms")
+        return self
+
+    def _wait_for_handle(self, timeout: float = DEFAULT_TAB_TIMEOUT) -> None:
+        """chromedriver learns about targets asynchronously; wait until the tab is a window handle."""
+        deadline = time.monotonic() + timeout
+        while self.handle not in self.driver.window_handles:
+            if time.monotonic() > deadline:
+                raise BrowserContextError(f"Tab {self.handle} did not appear as a window handle")
+            time.sleep(0.05)
+
+    def close(self) -> bool:
+        """
+        Dispose the context (closing its tabs) and switch back to the original window.
+
+        Returns:
+            bool: False when disposing failed and the context or its tab may be left behind
+        """
+        if self.context_id is None:
+            return True
+        try:
+            if self.home_handle is not None:
+                self.driver.switch_to.window(self.home_handle)
+            if self.backend == "bidi":
+                self.driver.browser.remove_user_context(self.context_id)
+            else:
+                self.driver.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": self.context_id})
+            return True
+        except Exception as e:
+            self.logger.warning(f"Could not dispose browser context {self.context_id}: {e}")
+            return False
+        finally:
+            self.context_id = None
+            self.handle = None
+
+    def __enter__(self) -> "IsolatedContext":
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
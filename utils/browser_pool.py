@@ -0,0 +1,113 @@
+"""
+Browser pool for reusing warm Chrome instances between tests.
+"""
+import logging
+import threading
+from typing import Callable, List, Optional
+
+from utils.driver_factory import create_driver
+from utils.dom_snapshot import invalidate_snapshot
+
+
+class BrowserPool:
+    """
+    Thread-safe pool of WebDriver instances.
+
+    Released browsers are reset (cookies, storage, blank page) and kept for
+    the next test. Browsers that fail the health check or the reset, or that
+    the ``retire`` check flags while idle, are quit and replaced on the next
+    acquire.
+    """
+
+    def __init__(self, factory: Optional[Callable] = None, max_idle: int = 2,
+                 retire: Optional[Callable] = None):
+        """
+        Initialize BrowserPool.
+
+        Args:
+            factory: Callable returning a new WebDriver (default: create_driver)
+            max_idle: Maximum number of idle browsers kept alive
+            retire: Callable returning True for an idle browser that must not be handed out again
+        """
+        self.factory = factory or create_driver
+        self.max_idle = max_idle
+        self.retire = retire
+        self.logger = logging.getLogger(__name__)
+        self._idle: List = []
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self):
+        """
+        Get a healthy browser from the pool or start a new one.
+
+        Returns:
+            WebDriver: Ready-to-use browser
+        """
+        while True:
+            with self._lock:
+                driver = self._idle.pop() if self._idle else None
+            if driver is None:
+                break
+            if self.retire is not None and self.retire(driver):
+                self.logger.info("🪦 Retiring pooled browser")
+            elif self.is_healthy(driver):
+                self.reused += 1
+                self.logger.info("♻️ Reusing pooled browser")
+                return driver
+            self._quit(driver)
+
+        self.created += 1
+        self.logger.info("🆕 Starting new pooled browser")
+        return self.factory()
+
+    def release(self, driver, reusable: bool = True) -> None:
+        """
+        Return a browser to the pool.
+
+        Args:
+            driver: WebDriver to return
+            reusable: False forces the browser to be quit (e.g. after a crash)
+        """
+        invalidate_snapshot(driver)
+        if reusable and self._reset(driver):
+            with self._lock:
+                if len(self._idle) < self.max_idle:
+                    self._idle.append(driver)
+                    return
+        self._quit(driver)
+
+    def close_all(self) -> None:
+        """Quit every idle browser."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._quit(driver)
+        self.logger.info(f"Browser pool closed (created: {self.created}, reused: {self.reused})")
+
+    @staticmethod
+    def is_healthy(driver) -> bool:
+        """Check that the browser session still answers commands."""
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _reset(self, driver) -> bool:
+        """Clear per-test browser state so the next test starts clean."""
+        try:
+            driver.delete_all_cookies()
+            driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+            driver.get("about:blank")
+            return True
+        except Exception as e:
+            self.logger.warning(f"Could not reset pooled browser: {e}")
+            return False
+
+    def _quit(self, driver) -> None:
+        try:
+            driver.quit()
+        except Exception as e:
+            self.logger.warning(f"Error closing pooled browser: {e}")
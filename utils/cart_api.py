@@ -0,0 +1,169 @@
+"""
+API-level cart helper.
+
+Adds, lists and clears cart items over HTTP using the browser's session
+cookies, so tests can set up or verify the cart without driving the UI.
+Requests go through one pooled keep-alive ``requests.Session``. The cart
+endpoints (``CartEndpoints``) are always given by the caller: the helper
+has no built-in paths for the live site. ``utils.cart_stub_server``
+serves ``STUB_ENDPOINTS`` locally.
+"""
+import logging
+from dataclasses import dataclass
+from typing import List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.site import get_base_url
+
+DEFAULT_POOL_SIZE = 4
+DEFAULT_TIMEOUT = 10
+
+
+class CartApiError(Exception):
+    """Raised when a cart endpoint answers with an error or unexpected body."""
+
+
+@dataclass(frozen=True)
+class CartEndpoints:
+    """Cart endpoint paths relative to the base URL."""
+
+    add: str
+    items: str
+    remove: str
+    clear: str
+
+
+class CartApi:
+    """Cart operations over HTTP sharing the browser's cookies."""
+
+    def __init__(self, endpoints: CartEndpoints, base_url: Optional[str] = None,
+                 pool_size: int = DEFAULT_POOL_SIZE, timeout: float = DEFAULT_TIMEOUT):
+        """
+        Initialize CartApi.
+
+        Args:
+            endpoints: Cart endpoint paths
+            base_url: Site root the endpoints are relative to (default: configured site origin)
+            pool_size: Keep-alive connections kept per host
+            timeout: Request timeout in seconds
+        """
+        self.base_url = (base_url or get_base_url()).rstrip("/")
+        self.endpoints = endpoints
+        self.timeout = timeout
+        self.logger = logging.getLogger(__name__)
+        self.session = requests.Session()
+        # Default allowed_methods: a POST (add/remove/clear) is only retried when it never reached the
+        # server (connect errors), since a retried add after a 5xx could add the item twice
+        retry = Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Accept": "application/json", "X-Requested-With": "XMLHttpRequest"})
+
+    @classmethod
+    def from_driver(cls, driver, endpoints: CartEndpoints, **kwargs) -> "CartApi":
+        """
+        Create a helper that shares the browser's session.
+
+        Args:
+            driver: WebDriver instance on the target site
+            endpoints: Cart endpoint paths
+            **kwargs: Other CartApi arguments
+
+        Returns:
+            CartApi: Helper with the browser's cookies and user agent
+        """
+        api = cls(endpoints, **kwargs)
+        api.sync_from_driver(driver)
+        return api
+
+    # ------------------
+    # Cookie sharing
+    # ------------------
+    def sync_from_driver(self, driver) -> None:
+        """Copy the browser's cookies and user agent into the HTTP session."""
+        for cookie in driver.get_cookies():
+            self.session.cookies.set(
+                cookie["name"], cookie["value"],
+                domain=cookie.get("domain", ""), path=cookie.get("path", "/"),
+            )
+        self.session.headers["User-Agent"] = driver.execute_script("return navigator.userAgent;")
+        self.logger.debug(f"Copied {len(driver.get_cookies())} cookies from the browser")
+
+    def sync_to_driver(self, driver) -> None:
+        """
+        Copy cookies set by cart responses back into the browser so the UI
+        sees the same cart. The browser must be on the cookies' domain.
+        """
+        for cookie in self.session.cookies:
+            driver.add_cookie({"name": cookie.name, "value": cookie.value, "path": cookie.path or "/"})
+
+    # ------------------
+    # Cart operations
+    # ------------------
+    def add_item(self, product_id: str, quantity: int = 1, sku_id: Optional[str] = None) -> List[dict]:
+        """
+        Add a product (optionally a SKU variant) to the cart.
+
+        Args:
+            product_id: Product id
+            quantity: Quantity to add
+            sku_id: Variant id for products with SKUs
+
+        Returns:
+            List[dict]: Cart items after the addition
+        """
+        payload = {"productId": product_id, "quantity": quantity}
+        if sku_id is not None:
+            payload["skuId"] = sku_id
+        items = self._call("post", self.endpoints.add, json=payload)["items"]
+        self.logger.info(f"🛒 Added product {product_id} x{quantity} via API ({len(items)} items in cart)")
+        return items
+
+    def list_items(self) -> List[dict]:
+        """Current cart items."""
+        return self._call("get", self.endpoints.items)["items"]
+
+    def remove_item(self, item_id: str) -> List[dict]:
+        """
+        Remove one cart item.
+
+        Returns:
+            List[dict]: Cart items after the removal
+        """
+        return self._call("post", self.endpoints.remove, json={"itemId": item_id})["items"]
+
+    def clear(self) -> int:
+        """
+        Empty the cart.
+
+        Returns:
+            int: Number of items removed
+        """
+        removed = len(self.list_items())
+        self._call("post", self.endpoints.clear)
+        self.logger.info(f"🧹 Cleared cart via API ({removed} items)")
+        return removed
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.session.close()
+
+    def _call(self, method: str, path: str, **kwargs) -> dict:
+        url = self.base_url + path
+        try:
+            response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+        except requests.RequestException as e:
+            raise CartApiError(f"{method.upper()} {path} failed: {e}") from e
+        if not response.ok:
+            raise CartApiError(f"{method.upper()} {path} returned {response.status_code}")
+        try:
+            body = response.json()
+        except ValueError as e:
+            raise CartApiError(f"{method.upper()} {path} did not return JSON") from e
+        if "items" not in body:
+            raise CartApiError(f"{method.upper()} {path} response has no 'items'")
+        return body
@@ -0,0 +1,142 @@
+"""
+Local stand-in for the cart endpoints used by ``utils.cart_api``.
+
+Keeps one in-memory cart per session cookie and answers the same JSON
+contract on ``STUB_ENDPOINTS``, so cart helpers and cart-related flows
+can be exercised without the live site:
+
+    with CartStubServer() as server:
+        api = CartApi(STUB_ENDPOINTS, base_url=server.base_url)
+        api.add_item("123")
+"""
+import argparse
+import json
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from http.cookies import SimpleCookie
+
+from utils.cart_api import CartEndpoints
+
+SESSION_COOKIE = "stub_session"
+STUB_ENDPOINTS = CartEndpoints(add="/cart/add", items="/cart/items", remove="/cart/remove", clear="/cart/clear")
+
+
+class _CartHandler(BaseHTTPRequestHandler):
+    server_version = "CartStub/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == self.server.endpoints.items:
+            self._respond(self._cart())
+        else:
+            self._respond({"error": "not found"}, status=404)
+
+    def do_POST(self):
+        endpoints = self.server.endpoints
+        body = self._read_json()
+        cart = self._cart()
+        if self.path == endpoints.add:
+            if "productId" not in body:
+                return self._respond({"error": "productId required"}, status=400)
+            cart["items"].append({
+                "id": uuid.uuid4().hex[:8],
+                "productId": str(body["productId"]),
+                "skuId": body.get("skuId"),
+                "quantity": int(body.get("quantity", 1)),
+            })
+        elif self.path == endpoints.remove:
+            cart["items"] = [item for item in cart["items"] if item["id"] != body.get("itemId")]
+        elif self.path == endpoints.clear:
+            cart["items"] = []
+        else:
+            return self._respond({"error": "not found"}, status=404)
+        self._respond(cart)
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            return {}
+
+    def _cart(self) -> dict:
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        self._session = cookie[SESSION_COOKIE].value if SESSION_COOKIE in cookie else uuid.uuid4().hex
+        with self.server.lock:
+            return self.server.carts.setdefault(self._session, {"items": []})
+
+    def _respond(self, payload: dict, status: int = 200) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if getattr(self, "_session", None):
+            self.send_header("Set-Cookie", f"{SESSION_COOKIE}={self._session}; Path=/")
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class CartStubServer:
+    """Threaded in-memory cart server, usable as a context manager."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, endpoints: CartEndpoints = None):
+        """
+        Initialize CartStubServer.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0: any free port)
+            endpoints: Endpoint paths to serve (default: STUB_ENDPOINTS)
+        """
+        self.httpd = ThreadingHTTPServer((host, port), _CartHandler)
+        self.httpd.endpoints = endpoints or STUB_ENDPOINTS
+        self.httpd.carts = {}
+        self.httpd.lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def carts(self) -> dict:
+        """Session id -> cart, for assertions."""
+        return self.httpd.carts
+
+    def start(self) -> "CartStubServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "CartStubServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Serve an in-memory stand-in for the cart endpoints")
+    parser.add_argument("--port", type=int, default=8011)
+    args = parser.parse_args(argv)
+    server = CartStubServer(port=args.port)
+    print(f"🛒 Cart stub listening on {server.base_url}", flush=True)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
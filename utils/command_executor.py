@@ -0,0 +1,364 @@
+"""
+Pooled keep-alive WebDriver command executor with per-command latency.
+
+Every WebDriver command is an HTTP request to chromedriver or a grid.
+Selenium's default executor keeps a small urllib3 pool per driver. With many
+drivers in one process, or many sessions behind one grid host, connections
+get discarded and reopened and commands wait on connection setup.
+``PooledRemoteConnection`` makes the pool tunable through ``ExecutorSettings``:
+connections kept per host, blocking when all are busy, connect/read timeouts
+and connect retries. With ``shared`` set, all drivers of the process use one
+pool manager.
+
+Every command is timed into ``CommandStats``. Before use, the executor
+measures a transport floor: the median round trip of ``GET /status``, which
+the server answers without touching a browser. For each command:
+
+- browser time is the HTTP round trip minus the floor
+- transport time is everything else (floor, connection setup, client-side
+  encoding)
+
+The stats also count the connections each command had to open.
+
+``configure_command_executor`` installs settings that ``create_driver``
+applies to every new driver, which is what ``plugins.webdriver_executor``
+does.
+
+Benchmark against the grid stand-in (or any grid/chromedriver URL):
+
+    python -m utils.command_executor --drivers 8 --commands 50 --latency-ms 5
+    python -m utils.command_executor --drivers 8 --no-keep-alive
+"""
+import argparse
+import logging
+import statistics
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional
+
+import urllib3
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+from selenium.webdriver.remote.client_config import ClientConfig
+
+from utils.latency import DEFAULT_WINDOW, LatencyRecorder
+
+TRANSPORT_PROBES = 5
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ExecutorSettings:
+    """Connection pool and timeout settings of the command executor."""
+
+    pool_size: int = 4  # connections kept per host
+    pool_block: bool = False  # wait for a free connection instead of opening a throwaway one
+    num_pools: int = 10  # hosts kept in one pool manager
+    connect_timeout: float = 5.0
+    read_timeout: float = 120.0  # must exceed the page load and script timeouts
+    connect_retries: int = 1  # commands are not idempotent: only failed connects are retried
+    keep_alive: bool = True
+    shared: bool = False  # one pool manager for every driver in the process
+
+    def pool_manager_args(self) -> dict:
+        return {
+            "maxsize": self.pool_size,
+            "block": self.pool_block,
+            "num_pools": self.num_pools,
+            "retries": urllib3.Retry(total=None, connect=self.connect_retries, read=False, status=0, redirect=3),
+        }
+
+    def timeout(self) -> urllib3.Timeout:
+        return urllib3.Timeout(connect=self.connect_timeout, read=self.read_timeout)
+
+
+class CommandStats:
+    """Thread-safe per-command totals, split into browser and transport time."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        """
+        Initialize CommandStats.
+
+        Args:
+            window: Recent samples kept per command for percentiles
+        """
+        self.total = LatencyRecorder(window)
+        self.browser = LatencyRecorder(window)
+        self.transport = LatencyRecorder(window)
+        self.new_connections: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, command: str, total: float, round_trip: float, floor: float,
+               new_connections: int = 0, ok: bool = True) -> None:
+        """
+        Add one command.
+
+        Args:
+            command: WebDriver command name
+            total: Wall time of the whole command
+            round_trip: Time spent in HTTP requests
+            floor: Transport floor of the connection
+            new_connections: Connections opened for the command
+            ok: False when the command failed
+        """
+        browser = max(0.0, round_trip - floor)
+        self.total.record(command, total, ok)
+        self.browser.record(command, browser, ok)
+        self.transport.record(command, max(0.0, total - browser), ok)
+        with self._lock:
+            self.new_connections[command] = self.new_connections.get(command, 0) + new_connections
+
+    def summary(self) -> Dict[str, Dict]:
+        """Command -> count, errors, p50/p95 of total, browser and transport time (ms), new connections."""
+        total, browser, transport = self.total.summary(), self.browser.summary(), self.transport.summary()
+        with self._lock:
+            connections = dict(self.new_connections)
+        return {
+            command: {
+                "count": row["count"],
+                "errors": row["errors"],
+                "p50_ms": row["p50_ms"],
+                "p95_ms": row["p95_ms"],
+                "browser_p50_ms": browser[command]["p50_ms"],
+                "transport_p50_ms": transport[command]["p50_ms"],
+                "transport_p95_ms": transport[command]["p95_ms"],
+                "new_connections": connections.get(command, 0),
+            }
+            for command, row in total.items()
+        }
+
+    def format_table(self, limit: Optional[int] = None) -> str:
+        """Plain-text table, commands with the most total time first."""
+        def busiest(item):
+            return -self.total.steps[item[0]].total
+
+        columns = ("count", "errors", "p50_ms", "p95_ms", "browser_p50_ms", "transport_p50_ms", "new_connections")
+        headers = ("count", "errors", "p50", "p95", "browser", "transport", "conns")
+        lines = [f"{'command':<28}" + "".join(f"{h:>10}" for h in headers) + "  (ms)"]
+        for command, row in sorted(self.summary().items(), key=busiest)[:limit]:
+            values = [row[c] if row[c] is not None else "-" for c in columns]
+            lines.append(f"{command:<28}" + "".join(f"{v:>10}" for v in values))
+        return "\n".join(lines)
+
+
+_stats = CommandStats()
+_settings: Optional[ExecutorSettings] = None
+_shared_managers: Dict[ExecutorSettings, urllib3.PoolManager] = {}
+_shared_lock = threading.Lock()
+
+
+def get_command_stats() -> CommandStats:
+    """Process-wide stats of every pooled executor."""
+    return _stats
+
+
+def configure_command_executor(settings: Optional[ExecutorSettings]) -> None:
+    """Install (or with None remove) the settings ``create_driver`` applies to new drivers."""
+    global _settings
+    _settings = settings
+
+
+def get_executor_settings() -> Optional[ExecutorSettings]:
+    return _settings
+
+
+class PooledRemoteConnection(ChromiumRemoteConnection):
+    """Chrome command executor with a tunable keep-alive pool and per-command timing."""
+
+    def __init__(self, remote_server_addr: str, settings: Optional[ExecutorSettings] = None,
+                 stats: Optional[CommandStats] = None, ignore_proxy: bool = False):
+        """
+        Initialize PooledRemoteConnection.
+
+        Args:
+            remote_server_addr: chromedriver service URL or grid URL
+            settings: Pool and timeout settings (defaults when None)
+            stats: Where commands are recorded (the process-wide stats when None)
+            ignore_proxy: Ignore the HTTP(S)_PROXY environment variables
+        """
+        # The base class builds its pool manager in __init__, so settings come first
+        self.settings = settings or ExecutorSettings()
+        self.stats = stats or get_command_stats()
+        self.transport_floor = 0.0
+        self._local = threading.local()
+        client_config = ClientConfig(
+            remote_server_addr=remote_server_addr,
+            keep_alive=self.settings.keep_alive,
+            timeout=self.settings.timeout(),
+            init_args_for_pool_manager={"init_args_for_pool_manager": self.settings.pool_manager_args()},
+        )
+        super().__init__(remote_server_addr, vendor_prefix="goog", browser_name="chrome",
+                         ignore_proxy=ignore_proxy, client_config=client_config)
+
+    @property
+    def remote_server_addr(self) -> str:
+        return self._client_config.remote_server_addr
+
+    def _get_connection_manager(self):
+        if not self.settings.shared:
+            return super()._get_connection_manager()
+        with _shared_lock:
+            manager = _shared_managers.get(self.settings)
+            if manager is None:
+                manager = _shared_managers[self.settings] = super()._get_connection_manager()
+            return manager
+
+    def close(self):
+        # A shared pool outlives the drivers using it
+        if not self.settings.shared:
+            super().close()
+
+    def probe_transport(self, samples: int = TRANSPORT_PROBES) -> float:
+        """
+        Measure the transport floor with ``GET /status`` round trips.
+
+        Args:
+            samples: Round trips to take the median of
+
+        Returns:
+            float: Floor in seconds (also stored on the executor)
+        """
+        timings = []
+        for _ in range(samples):
+            started = time.perf_counter()
+            try:
+                self._request("GET", f"{self.remote_server_addr}/status")
+            except Exception as e:
+                logger.warning(f"Transport probe failed: {e}")
+                return self.transport_floor
+            timings.append(time.perf_counter() - started)
+        # The first probe may include connection setup; the median ignores it
+        self.transport_floor = statistics.median(timings)
+        return self.transport_floor
+
+    def execute(self, command, params):
+        local = self._local
+        local.round_trip, local.new_connections = 0.0, 0
+        started = time.perf_counter()
+        ok = False
+        try:
+            response = super().execute(command, params)
+            ok = not (isinstance(response, dict) and response.get("status") not in (None, 0))
+            return response
+        finally:
+            self.stats.record(command, time.perf_counter() - started, local.round_trip, self.transport_floor,
+                              local.new_connections, ok)
+
+    def _request(self, method, url, body=None) -> dict:
+        local = self._local
+        depth = getattr(local, "depth", 0)
+        if depth:  # redirect followed by the base class; timed by the outer call
+            return super()._request(method, url, body)
+        pool = self._conn.connection_from_url(url) if self.settings.keep_alive else None
+        opened = pool.num_connections if pool is not None else 0
+        local.depth = 1
+        started = time.perf_counter()
+        try:
+            return super()._request(method, url, body)
+        finally:
+            local.depth = 0
+            local.round_trip = getattr(local, "round_trip", 0.0) + time.perf_counter() - started
+            created = pool.num_connections - opened if pool is not None else 1
+            local.new_connections = getattr(local, "new_connections", 0) + created
+
+
+def install_executor(driver, settings: Optional[ExecutorSettings] = None,
+                     stats: Optional[CommandStats] = None) -> PooledRemoteConnection:
+    """
+    Replace a started driver's command executor with a pooled one.
+
+    The new-session command has already gone through selenium's executor
+    (webdriver.Chrome builds its own); every later command uses the pool.
+
+    Args:
+        driver: Chrome WebDriver
+        settings: Pool and timeout settings
+        stats: Where commands are recorded
+
+    Returns:
+        PooledRemoteConnection: The installed executor
+    """
+    previous = driver.command_executor
+    executor = PooledRemoteConnection(previous._client_config.remote_server_addr, settings, stats,
+                                      ignore_proxy=getattr(previous, "_proxy_url", None) is None)
+    executor.probe_transport()
+    driver.command_executor = executor
+    previous.close()
+    return executor
+
+
+# ------------------
+# Benchmark
+# ------------------
+def _drive(remote_url: str, settings: ExecutorSettings, commands: int, url: str, errors: list) -> None:
+    from selenium import webdriver
+    from selenium.webdriver.common.by import By
+    from utils.driver_factory import build_chrome_options
+
+    try:
+        executor = PooledRemoteConnection(remote_url, settings)
+        executor.probe_transport()
+        driver = webdriver.Remote(command_executor=executor, options=build_chrome_options(headless=True))
+    except Exception as e:
+        errors.append(f"session: {e}")
+        return
+    try:
+        for _ in range(commands):
+            driver.get(url)
+            driver.title
+            driver.find_element(By.CSS_SELECTOR, "body").text
+            driver.execute_script("return document.readyState")
+    except Exception as e:
+        errors.append(f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}")
+    finally:
+        driver.quit()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the pooled WebDriver command executor")
+    parser.add_argument("--remote-url", default=None, help="chromedriver/grid URL (default: local grid stand-in)")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="browser time simulated by the stand-in")
+    parser.add_argument("--drivers", type=int, default=8, help="sessions driven concurrently")
+    parser.add_argument("--commands", type=int, default=50, help="command rounds per session")
+    parser.add_argument("--url", default="about:blank")
+    parser.add_argument("--pool-size", type=int, default=ExecutorSettings.pool_size)
+    parser.add_argument("--pool-block", action="store_true")
+    parser.add_argument("--shared-pool", action="store_true")
+    parser.add_argument("--no-keep-alive", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    server = None
+    remote_url = args.remote_url
+    if remote_url is None:
+        from utils.grid_stub_server import GridStubServer
+        server = GridStubServer(latency_ms=args.latency_ms).start()
+        remote_url = server.base_url
+    settings = ExecutorSettings(pool_size=args.pool_size, pool_block=args.pool_block,
+                                shared=args.shared_pool, keep_alive=not args.no_keep_alive)
+    errors: list = []
+    started = time.monotonic()
+    threads = [threading.Thread(target=_drive, args=(remote_url, settings, args.commands, args.url, errors))
+               for _ in range(args.drivers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    stats = get_command_stats()
+    print(stats.format_table())
+    commands = sum(row["count"] for row in stats.summary().values())
+    connections = sum(stats.new_connections.values())
+    print(f"⏱️ {commands} commands in {elapsed:.2f}s ({commands / elapsed:.0f}/s), "
+          f"{connections} connections opened, settings: {asdict(settings)}")
+    if server is not None:
+        print(f"🔌 Stand-in accepted {server.connections} connections")
+        server.stop()
+    for error in errors:
+        print(f"❌ {error}")
+
+
+if __name__ == "__main__":
+    main()
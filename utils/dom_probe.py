@@ -0,0 +1,142 @@
+"""
+Non-raising batch presence / visibility probes.
+
+All locators are checked in a single ``execute_script`` call, so negative
+probes cost no exception round trip and a page can inspect all of its
+conditional UI at once.
+"""
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from selenium.common.exceptions import JavascriptException, WebDriverException
+from selenium.webdriver.common.by import By
+
+from utils.locator_health import LocatorSet
+
+logger = logging.getLogger(__name__)
+
+EMPTY_PROBE = {"present": False, "visible": False, "first_visible": False, "count": 0}
+
+_PROBE_SCRIPT = """
+const queries = arguments[0];
+function isVisible(el) {
+    if (!(el.offsetWidth || el.offsetHeight || el.getClientRects().length)) return false;
+    const style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none' && style.opacity !== '0';
+}
+function findAll(q) {
+    if (q.kind === 'css') return Array.from(document.querySelectorAll(q.value));
+    if (q.kind === 'xpath') {
+        const snap = document.evaluate(q.value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        const out = [];
+        for (let i = 0; i < snap.snapshotLength; i++) out.push(snap.snapshotItem(i));
+        return out;
+    }
+    const links = Array.from(document.querySelectorAll('a'));
+    if (q.kind === 'link') return links.filter(a => a.innerText.trim() === q.value);
+    return links.filter(a => a.innerText.includes(q.value));
+}
+return queries.map(q => {
+    try {
+        const els = findAll(q);
+        return {count: els.length, visible: els.some(isVisible),
+                firstVisible: els.length > 0 && isVisible(els[0]), error: null};
+    } catch (e) {
+        return {count: 0, visible: false, firstVisible: false, error: String(e)};
+    }
+});
+"""
+
+
+def _css_string(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def to_probe_query(locator: Tuple[str, str]) -> Optional[dict]:
+    """
+    Translate a Selenium (By, value) locator into a query the probe script understands.
+
+    Args:
+        locator: Tuple of (By, value)
+
+    Returns:
+        Optional[dict]: ``{"kind": ..., "value": ...}`` query, None for strategies the script cannot run
+    """
+    by, value = locator
+    if by == By.CSS_SELECTOR:
+        return {"kind": "css", "value": value}
+    if by == By.XPATH:
+        return {"kind": "xpath", "value": value}
+    if by == By.ID:
+        return {"kind": "css", "value": f'[id="{_css_string(value)}"]'}
+    if by == By.NAME:
+        return {"kind": "css", "value": f'[name="{_css_string(value)}"]'}
+    if by == By.CLASS_NAME:
+        return {"kind": "css", "value": "." + ".".join(value.split())}
+    if by == By.TAG_NAME:
+        return {"kind": "css", "value": value}
+    if by == By.LINK_TEXT:
+        return {"kind": "link", "value": value}
+    if by == By.PARTIAL_LINK_TEXT:
+        return {"kind": "partial_link", "value": value}
+    return None
+
+
+def probe_locators(driver, locators: Iterable) -> Dict[tuple, dict]:
+    """
+    Check presence, visibility and count of many locators in one script call.
+
+    For a LocatorSet the first alternative that matches is reported.
+    ``visible`` is true when any match is visible, ``first_visible`` when
+    the first match is (what ``find_element(...).is_displayed()`` checks).
+    Never raises: when the script throws in the page or the driver fails,
+    every locator is reported as absent, and so is a locator whose strategy
+    the probe cannot run.
+
+    Args:
+        driver: WebDriver instance
+        locators: (By, value) tuples and/or LocatorSets
+
+    Returns:
+        Dict[tuple, dict]: locator -> {"present": bool, "visible": bool, "first_visible": bool, "count": int}
+    """
+    locators = list(dict.fromkeys(locators))
+    flat: List[Tuple[str, str]] = []
+    for locator in locators:
+        flat.extend(locator if isinstance(locator, LocatorSet) else [locator])
+    flat = list(dict.fromkeys(flat))
+
+    by_locator = {}
+    queries = {}
+    for locator in flat:
+        query = to_probe_query(locator)
+        if query is None:
+            logger.warning(f"Unsupported locator strategy for probe, reported as absent: {locator}")
+            by_locator[locator] = dict(EMPTY_PROBE)
+        else:
+            queries[locator] = query
+
+    try:
+        raw = driver.execute_script(_PROBE_SCRIPT, list(queries.values())) if queries else []
+    except JavascriptException as e:
+        # The script itself threw in the page (e.g. a page overriding built-ins), not a query
+        logger.warning(f"Probe script raised in the page: {e.msg}")
+        return {locator: dict(EMPTY_PROBE) for locator in locators}
+    except WebDriverException as e:
+        logger.warning(f"Probe script failed: {e}")
+        return {locator: dict(EMPTY_PROBE) for locator in locators}
+
+    for locator, item in zip(queries, raw):
+        if item.get("error"):
+            logger.warning(f"Probe query failed for {locator}: {item['error']}")
+        by_locator[locator] = {"present": item["count"] > 0, "visible": bool(item["visible"]),
+                               "first_visible": bool(item["firstVisible"]), "count": item["count"]}
+
+    results = {}
+    for locator in locators:
+        if isinstance(locator, LocatorSet):
+            matches = [by_locator[l] for l in locator if by_locator[l]["present"]]
+            results[locator] = matches[0] if matches else by_locator[locator[0]]
+        else:
+            results[locator] = by_locator[locator]
+    return results
@@ -0,0 +1,205 @@
+"""
+Read-only DOM snapshots parsed locally.
+
+A ``DomSnapshot`` fetches the serialized DOM once (``page_source``) and
+parses it with lxml, so any number of read-only queries (counts, texts,
+attributes) run locally without WebDriver round trips. A snapshot is only
+valid for the page state it was taken from: it must be invalidated when
+anything acts on the page, after which every query raises
+``StaleSnapshotError`` instead of silently answering from old HTML.
+
+Snapshots see markup, not layout: text comes from ``text_content()``
+(hidden text included), and visibility is limited to what the markup says
+(``hidden_by_markup``).
+"""
+import logging
+import re
+import time
+import weakref
+from typing import List, Optional
+
+import lxml.html
+from lxml.cssselect import CSSSelector
+from selenium.webdriver.common.by import By
+
+from utils.locator_health import LocatorSet
+
+
+# Driver -> its active snapshot, shared by every page object on that driver
+_active = weakref.WeakKeyDictionary()
+
+
+class StaleSnapshotError(Exception):
+    """Raised when an invalidated snapshot is queried."""
+
+
+_HIDING_STYLE = re.compile(r"display\s*:\s*none|visibility\s*:\s*hidden")
+
+
+def xpath_literal(value: str) -> str:
+    """
+    Quote a string as an XPath 1.0 literal. XPath has no escapes, so a
+    value with both quote kinds is built with ``concat()``.
+    """
+    if '"' not in value:
+        return f'"{value}"'
+    if "'" not in value:
+        return f"'{value}'"
+    parts = value.split('"')
+    return "concat(" + ", '\"', ".join(f'"{part}"' for part in parts) + ")"
+
+
+def _to_xpath(locator) -> str:
+    """Translate a (By, value) locator into an XPath expression."""
+    by, value = locator
+    if by == By.XPATH:
+        return value
+    if by == By.CSS_SELECTOR:
+        return CSSSelector(value).path
+    if by == By.ID:
+        return f"//*[@id={xpath_literal(value)}]"
+    if by == By.NAME:
+        return f"//*[@name={xpath_literal(value)}]"
+    if by == By.CLASS_NAME:
+        return f'//*[contains(concat(" ", normalize-space(@class), " "), {xpath_literal(f" {value} ")})]'
+    if by == By.TAG_NAME:
+        return f"//{value}"
+    if by == By.LINK_TEXT:
+        return f"//a[normalize-space(.)={xpath_literal(value)}]"
+    if by == By.PARTIAL_LINK_TEXT:
+        return f"//a[contains(., {xpath_literal(value)})]"
+    raise ValueError(f"Unsupported locator strategy for snapshots: {by}")
+
+
+class DomSnapshot:
+    """Locally parsed copy of the page's DOM."""
+
+    def __init__(self, html: str, url: str = ""):
+        """
+        Initialize DomSnapshot.
+
+        Args:
+            html: Serialized DOM
+            url: URL the DOM was taken from
+        """
+        self.url = url
+        self.tree = lxml.html.fromstring(html or "<html></html>")
+        self.taken_at = time.monotonic()
+        self.valid = True
+        self._xpaths = {}
+
+    @classmethod
+    def capture(cls, driver) -> "DomSnapshot":
+        """
+        Take a snapshot of the driver's current page (one round trip).
+
+        Args:
+            driver: WebDriver instance
+
+        Returns:
+            DomSnapshot: Parsed snapshot
+        """
+        started = time.monotonic()
+        snapshot = cls(driver.page_source, driver.current_url)
+        logging.getLogger(__name__).debug(
+            f"DOM snapshot of {snapshot.url} taken in {(time.monotonic() - started) * 1000:.0f}ms"
+        )
+        return snapshot
+
+    def invalidate(self) -> None:
+        """Mark the snapshot as outdated; further queries raise StaleSnapshotError."""
+        self.valid = False
+
+    def __enter__(self) -> "DomSnapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.invalidate()
+
+    # ------------------
+    # Queries
+    # ------------------
+    def find_all(self, locator) -> List:
+        """
+        All elements matching a locator; for a LocatorSet the first
+        alternative with matches wins.
+
+        Args:
+            locator: Tuple of (By, value) or LocatorSet
+
+        Returns:
+            List of lxml elements
+        """
+        if not self.valid:
+            raise StaleSnapshotError(f"Snapshot of {self.url} was invalidated by a page action")
+        alternatives = locator if isinstance(locator, LocatorSet) else (locator,)
+        for alternative in alternatives:
+            xpath = self._xpaths.get(alternative)
+            if xpath is None:
+                xpath = self._xpaths[alternative] = _to_xpath(alternative)
+            elements = self.tree.xpath(xpath)
+            if elements:
+                return elements
+        return []
+
+    def find(self, locator):
+        """First matching element or None."""
+        elements = self.find_all(locator)
+        return elements[0] if elements else None
+
+    def count(self, locator) -> int:
+        """Number of matching elements."""
+        return len(self.find_all(locator))
+
+    def exists(self, locator) -> bool:
+        """True when at least one element matches."""
+        return bool(self.find_all(locator))
+
+    def text(self, locator) -> str:
+        """Whitespace-normalized text of the first match ('' when absent)."""
+        element = self.find(locator)
+        return normalize_text(element) if element is not None else ""
+
+    def texts(self, locator) -> List[str]:
+        """Whitespace-normalized texts of all matches."""
+        return [normalize_text(element) for element in self.find_all(locator)]
+
+    def attribute(self, locator, name: str) -> Optional[str]:
+        """Attribute of the first match (None when absent)."""
+        element = self.find(locator)
+        return element.get(name) if element is not None else None
+
+
+def normalize_text(element) -> str:
+    """Text content of an lxml element with whitespace collapsed."""
+    return " ".join(element.text_content().split())
+
+
+def hidden_by_markup(element) -> bool:
+    """True when the element or an ancestor is hidden by a ``hidden`` attribute or inline style."""
+    node = element
+    while node is not None:
+        if node.get("hidden") is not None or _HIDING_STYLE.search(node.get("style") or ""):
+            return True
+        node = node.getparent()
+    return False
+
+
+def take_snapshot(driver) -> DomSnapshot:
+    """Capture a snapshot and make it the driver's active one."""
+    invalidate_snapshot(driver)
+    snapshot = _active[driver] = DomSnapshot.capture(driver)
+    return snapshot
+
+
+def active_snapshot(driver) -> Optional[DomSnapshot]:
+    """The driver's valid active snapshot, or None."""
+    snapshot = _active.get(driver)
+    return snapshot if snapshot is not None and snapshot.valid else None
+
+
+def invalidate_snapshot(driver) -> None:
+    """Invalidate and drop the driver's active snapshot."""
+    snapshot = _active.pop(driver, None)
+    if snapshot is not None:
+        snapshot.invalidate()
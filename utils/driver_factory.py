@@ -0,0 +1,111 @@
+"""
+WebDriver factory shared by the pytest fixtures and the browser pool.
+"""
+import logging
+from typing import Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+from utils.command_executor import PooledRemoteConnection, get_executor_settings, install_executor
+from utils.launch_gate import forget_on_quit, launch_slot
+
+PAGE_LOAD_TIMEOUT = 30
+SCRIPT_TIMEOUT = 30
+
+logger = logging.getLogger(__name__)
+
+_driver_path: Optional[str] = None
+
+
+def build_chrome_options(headless: bool = False) -> Options:
+    """
+    Build Chrome options used by every browser in the suite.
+
+    Args:
+        headless: Run Chrome without a window
+
+    Returns:
+        Options: Configured Chrome options
+    """
+    chrome_options = Options()
+    chrome_options.add_argument("--start-maximized")
+    chrome_options.add_argument("--disable-notifications")
+    chrome_options.add_argument("--disable-popup-blocking")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-web-security")
+    chrome_options.add_argument("--allow-running-insecure-content")
+    chrome_options.add_argument("--disable-features=VizDisplayCompositor")
+    if headless:
+        chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--window-size=1920,1080")
+
+    # Performance preferences
+    chrome_options.add_experimental_option("prefs", {
+        "profile.default_content_setting_values.notifications": 2,
+        "profile.default_content_settings.popups": 0
+    })
+    return chrome_options
+
+
+def chromedriver_path() -> str:
+    """Resolve the chromedriver binary once per process."""
+    global _driver_path
+    if _driver_path is None:
+        _driver_path = ChromeDriverManager().install()
+    return _driver_path
+
+
+def create_driver(headless: bool = False, options: Optional[Options] = None):
+    """
+    Create a Chrome WebDriver with the suite's default timeouts.
+
+    Args:
+        headless: Run Chrome without a window (ignored when options are given)
+        options: Optional pre-built Chrome options
+
+    Returns:
+        WebDriver: Chrome WebDriver instance
+    """
+    service = Service(chromedriver_path())
+    # Waits for free memory when a launch gate is configured (plugins.auto_workers)
+    with launch_slot() as launch_id:
+        driver = webdriver.Chrome(service=service, options=options or build_chrome_options(headless))
+    forget_on_quit(driver, launch_id)
+
+    # Pooled keep-alive executor with command timing (plugins.webdriver_executor)
+    settings = get_executor_settings()
+    if settings is not None:
+        install_executor(driver, settings)
+
+    # Set timeouts for better stability
+    driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+    driver.set_script_timeout(SCRIPT_TIMEOUT)
+
+    # DO NOT use implicit wait - it can cause issues with explicit waits
+    return driver
+
+
+def create_remote_driver(remote_url: str, headless: bool = False, options: Optional[Options] = None):
+    """
+    Create a Chrome session on a grid (or remote chromedriver) through the pooled executor.
+
+    Args:
+        remote_url: Grid URL, e.g. http://127.0.0.1:4444
+        headless: Run Chrome without a window (ignored when options are given)
+        options: Optional pre-built Chrome options
+
+    Returns:
+        WebDriver: Remote WebDriver instance
+    """
+    executor = PooledRemoteConnection(remote_url, get_executor_settings())
+    executor.probe_transport()
+    driver = webdriver.Remote(command_executor=executor, options=options or build_chrome_options(headless))
+    driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+    driver.set_script_timeout(SCRIPT_TIMEOUT)
+    return driver
@@ -0,0 +1,238 @@
+"""
+Filter/sort combination matrix runner.
+
+Expands keyword × brand × sort × free-shipping combinations and runs each
+one on a pooled browser. Steps whose URL encoding is already known (see
+``utils.listing_url``) are applied directly to the search URL by
+``SearchResultPage.open_listing``, so a case usually costs a single
+navigation; the remaining steps are clicked and learned for the next cases.
+Results are streamed into the SimpleReporter as they complete.
+"""
+import argparse
+import itertools
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from pages.product_card import ProductCard
+from utils.browser_pool import BrowserPool
+from utils.listing_url import UrlEncodings, get_url_encodings
+from utils.sort_verifier import check_sort_order
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_CHECK_COUNT = 24
+
+# Sort option (".item.i<N>") -> (ProductCard field, descending) it must produce
+SORT_FIELDS = {
+    4: ("comment_count", True),
+}
+
+
+@dataclass(frozen=True)
+class MatrixCase:
+    """One filter/sort combination."""
+
+    keyword: str
+    brand_index: Optional[int] = None
+    sort_option: Optional[int] = None
+    free_shipping: bool = False
+
+    @property
+    def name(self) -> str:
+        parts = [self.keyword]
+        if self.brand_index is not None:
+            parts.append(f"brand{self.brand_index}")
+        if self.sort_option is not None:
+            parts.append(f"sort{self.sort_option}")
+        if self.free_shipping:
+            parts.append("free")
+        return f"matrix[{'|'.join(parts)}]"
+
+
+def expand_matrix(keyword: str, brands: Sequence[Optional[int]], sorts: Sequence[Optional[int]],
+                  cargo: Sequence[bool] = (False, True)) -> List[MatrixCase]:
+    """
+    Build every brand × sort × cargo combination for a keyword.
+
+    Args:
+        keyword: Search keyword
+        brands: Brand checkbox indexes (None: no brand filter)
+        sorts: Sort option numbers (None: default order)
+        cargo: Free shipping settings to combine
+
+    Returns:
+        List[MatrixCase]: All combinations
+    """
+    return [
+        MatrixCase(keyword, brand, sort, free)
+        for brand, sort, free in itertools.product(brands, sorts, cargo)
+    ]
+
+
+def check_cards(case: MatrixCase, cards: List[ProductCard]) -> str:
+    """
+    Check the listing of a case.
+
+    Returns:
+        str: Error message, empty when the listing matches the case
+    """
+    if not cards:
+        return "no products listed"
+    if case.sort_option in SORT_FIELDS:
+        field, descending = SORT_FIELDS[case.sort_option]
+        result = check_sort_order([cards], field, descending=descending)
+        if not result.ok:
+            return f"sort order broken: {result.violation}"
+    if case.free_shipping:
+        missing = [card.position for card in cards if not card.free_shipping]
+        if missing:
+            return f"products without free shipping at positions {missing}"
+    return ""
+
+
+class FilterMatrixRunner:
+    """Runs matrix cases concurrently on pooled browsers."""
+
+    def __init__(self, pool: Optional[BrowserPool] = None, concurrency: int = DEFAULT_CONCURRENCY,
+                 encodings: Optional[UrlEncodings] = None, check_count: int = DEFAULT_CHECK_COUNT):
+        """
+        Initialize FilterMatrixRunner.
+
+        Args:
+            pool: Browser pool (default: new headless pool)
+            concurrency: Number of cases run at the same time
+            encodings: Learned URL encodings (default: process-wide encodings)
+            check_count: Number of products checked per case
+        """
+        self.pool = pool
+        self.concurrency = concurrency
+        self.encodings = encodings or get_url_encodings()
+        self.check_count = check_count
+        self.logger = logging.getLogger(__name__)
+        self.summary: Dict = {}
+
+    def _get_pool(self) -> BrowserPool:
+        if self.pool is None:
+            from utils.driver_factory import create_driver
+            self.pool = BrowserPool(factory=lambda: create_driver(headless=True), max_idle=self.concurrency)
+        return self.pool
+
+    def run_case(self, case: MatrixCase) -> dict:
+        """
+        Reach the case's listing state and check its products.
+
+        Args:
+            case: Combination to run
+
+        Returns:
+            dict: name, ok, error, duration, url, clicks and products of the case
+        """
+        from pages.search_result_page import SearchResultPage
+        pool = self._get_pool()
+        driver = pool.acquire()
+        started = time.monotonic()
+        result = {"name": case.name, "ok": False, "error": "", "url": "", "clicks": 0, "products": 0}
+        healthy = True
+        try:
+            page = SearchResultPage.open_listing(driver, case.keyword, case.brand_index, case.sort_option,
+                                                 case.free_shipping, self.encodings)
+            result["clicks"] = len(page.clicked_steps)
+            result["url"] = driver.current_url
+
+            cards = [card for batch in page.iter_product_batches(self.check_count, self.check_count) for card in batch]
+            result["products"] = len(cards)
+            result["error"] = check_cards(case, cards)
+            result["ok"] = not result["error"]
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}".splitlines()[0]
+            healthy = BrowserPool.is_healthy(driver)
+        finally:
+            pool.release(driver, reusable=healthy)
+        result["duration"] = time.monotonic() - started
+        return result
+
+    def run(self, cases: List[MatrixCase], reporter=None) -> Iterator[dict]:
+        """
+        Run cases concurrently, yielding each result as soon as it finishes.
+
+        Args:
+            cases: Matrix cases
+            reporter: Optional SimpleReporter each result is added to
+
+        Yields:
+            dict: Result of one case
+        """
+        started = time.monotonic()
+        failed = 0
+        clicks = 0
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [executor.submit(self.run_case, case) for case in cases]
+            for future in as_completed(futures):
+                result = future.result()
+                failed += not result["ok"]
+                clicks += result["clicks"]
+                if reporter is not None:
+                    report_result(reporter, result)
+                yield result
+
+        self.encodings.save()
+        elapsed = time.monotonic() - started
+        self.summary = {
+            "cases": len(cases),
+            "failed": failed,
+            "ui_clicks": clicks,
+            "elapsed_s": round(elapsed, 1),
+            "concurrency": self.concurrency,
+        }
+        self.logger.info(f"📊 Matrix: {len(cases)} cases, {failed} failed, {clicks} UI steps in {elapsed:.1f}s")
+
+    def close(self) -> None:
+        """Quit the runner's browsers."""
+        if self.pool is not None:
+            self.pool.close_all()
+
+
+def report_result(reporter, result: dict) -> None:
+    """Add one matrix result to the reporter and refresh the live report."""
+    extra = {key: result[key] for key in ("url", "clicks", "products")}
+    reporter.add_result(result["name"], "PASS" if result["ok"] else "FAIL",
+                        result["duration"], result["error"], extra=extra)
+    reporter.generate_html("reports/live_report.html")
+
+
+def _parse_indexes(value: str) -> List[Optional[int]]:
+    """"1,2,-" -> [1, 2, None] ("-" means: step not applied)."""
+    return [None if item.strip() == "-" else int(item) for item in value.split(",") if item.strip()]
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Run brand × sort × cargo combinations in parallel")
+    parser.add_argument("--keyword", default="telefon")
+    parser.add_argument("--brands", default="1,2,3", help="brand indexes, '-' for no brand filter")
+    parser.add_argument("--sorts", default="4", help="sort option numbers, '-' for default order")
+    parser.add_argument("--cargo", choices=["both", "on", "off"], default="both")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--check-count", type=int, default=DEFAULT_CHECK_COUNT)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    cargo = {"both": (False, True), "on": (True,), "off": (False,)}[args.cargo]
+    cases = expand_matrix(args.keyword, _parse_indexes(args.brands), _parse_indexes(args.sorts), cargo)
+
+    from simple_report import SimpleReporter
+    reporter = SimpleReporter()
+    runner = FilterMatrixRunner(concurrency=args.concurrency, check_count=args.check_count)
+    try:
+        for result in runner.run(cases, reporter):
+            status = "✅" if result["ok"] else "❌"
+            print(f"{status} {result['name']} ({result['duration']:.1f}s, {result['clicks']} clicks) {result['error']}",
+                  flush=True)
+    finally:
+        runner.close()
+    reporter.set_stat("Filter matrix", args.keyword, runner.summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Local stand-in for a Selenium grid (W3C WebDriver over HTTP).
+
+Creates sessions without browsers and answers the commands the suite's
+drivers send with plausible W3C payloads. ``--latency-ms`` delays every
+session command to simulate browser time, while ``GET /status`` answers
+at once, just as a grid or chromedriver does. That keeps the executor's
+transport floor measurement meaningful. The server counts accepted TCP
+connections, so connection churn is visible:
+
+    with GridStubServer(latency_ms=5) as grid:
+        driver = webdriver.Remote(command_executor=PooledRemoteConnection(grid.base_url), options=options)
+"""
+import argparse
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# W3C web element reference key
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+
+class _GridHandler(BaseHTTPRequestHandler):
+    server_version = "GridStub/1.0"
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; without this, keep-alive clients wait on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+    def _handle(self, method: str) -> None:
+        body = self._read_json()
+        parts = [part for part in self.path.split("?")[0].split("/") if part]
+        if parts == ["status"]:
+            return self._respond({"ready": True, "message": "Grid stand-in ready"})
+        if parts == ["session"] and method == "POST":
+            return self._respond(self._new_session(body))
+        if len(parts) < 2 or parts[0] != "session":
+            return self._error(404, "unknown command", f"{method} {self.path}")
+        sessions = self.server.sessions
+        session = sessions.get(parts[1])
+        if session is None:
+            return self._error(404, "invalid session id", parts[1])
+        if self.server.latency_ms:
+            time.sleep(self.server.latency_ms / 1000.0)
+        self._respond(self._command(method, parts[1], parts[2:], session, body))
+
+    def _new_session(self, body: dict) -> dict:
+        session_id = uuid.uuid4().hex
+        with self.server.lock:
+            self.server.sessions[session_id] = {"url": "about:blank"}
+        requested = body.get("capabilities", {}).get("alwaysMatch", {})
+        capabilities = {"browserName": requested.get("browserName", "chrome"), "browserVersion": "stub",
+                        "platformName": "linux", "pageLoadStrategy": "normal"}
+        return {"sessionId": session_id, "capabilities": capabilities}
+
+    def _command(self, method: str, session_id: str, command: list, session: dict, body: dict):
+        if not command:
+            with self.server.lock:
+                self.server.sessions.pop(session_id, None)
+            return None
+        name = command[0]
+        if name == "url":
+            if method == "POST":
+                session["url"] = body.get("url", "about:blank")
+                return None
+            return session["url"]
+        if name == "title":
+            return f"Stub: {session['url']}"
+        if name == "element" and len(command) == 1:
+            return {ELEMENT_KEY: uuid.uuid4().hex}
+        if name == "elements":
+            return [{ELEMENT_KEY: uuid.uuid4().hex} for _ in range(3)]
+        if name == "element" and command[-1] == "text":
+            return "stub text"
+        if name == "window" and method == "GET":
+            return "stub-window"
+        return None
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            return {}
+
+    def _error(self, status: int, error: str, message: str) -> None:
+        self._respond({"error": error, "message": message, "stacktrace": ""}, status)
+
+    def _respond(self, value, status: int = 200) -> None:
+        data = json.dumps({"value": value}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class GridStubServer:
+    """Threaded browserless W3C WebDriver endpoint, usable as a context manager."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0):
+        """
+        Initialize GridStubServer.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0: any free port)
+            latency_ms: Simulated browser time of every session command
+        """
+        self.httpd = ThreadingHTTPServer((host, port), _GridHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.latency_ms = latency_ms
+        self.httpd.sessions = {}
+        self.httpd.connections = 0
+        self.httpd.lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def connections(self) -> int:
+        """TCP connections accepted so far."""
+        return self.httpd.connections
+
+    @property
+    def sessions(self) -> dict:
+        return self.httpd.sessions
+
+    def start(self) -> "GridStubServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "GridStubServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Serve a browserless stand-in for a Selenium grid")
+    parser.add_argument("--port", type=int, default=4444)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    args = parser.parse_args(argv)
+    server = GridStubServer(port=args.port, latency_ms=args.latency_ms)
+    print(f"🕸️ Grid stub listening on {server.base_url}", flush=True)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
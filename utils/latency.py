@@ -0,0 +1,196 @@
+"""
+Per-step latency and error statistics.
+
+``LatencyRecorder`` collects timings of named steps from many threads.
+Each step keeps cumulative histogram buckets (for export) and a bounded
+window of recent passed samples for p50/p95/p99, so memory stays constant
+in long-running processes. Failed runs (often timeouts) are counted and
+timed separately and never enter the percentiles. ``format_prometheus`` renders a recorder in the
+Prometheus text exposition format.
+"""
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+# Upper bounds (seconds) of the histogram buckets; +Inf is implicit
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+DEFAULT_WINDOW = 10000
+
+
+def percentile(samples: List[float], pct: float) -> Optional[float]:
+    """
+    Nearest-rank percentile.
+
+    Args:
+        samples: Values (any order)
+        pct: Percentile in 0..100
+
+    Returns:
+        Optional[float]: Percentile, None for no samples
+    """
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class StepStats:
+    """Counters, buckets and recent samples of one step."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.buckets = [0] * len(BUCKETS)
+        # Failed runs (often timeouts) separately, so exports can keep them out of pass latency
+        self.failed_total = 0.0
+        self.failed_buckets = [0] * len(BUCKETS)
+        self.samples = deque(maxlen=window)  # passed runs only
+
+    def add(self, seconds: float, ok: bool) -> None:
+        self.count += 1
+        self.total += seconds
+        if not ok:
+            self.errors += 1
+            self.failed_total += seconds
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                if not ok:
+                    self.failed_buckets[i] += 1
+        if ok:
+            self.samples.append(seconds)
+
+    def summary(self) -> Dict:
+        """Counts and error rate of all runs; latency percentiles of passed runs, failed runs' mean separately."""
+        samples = list(self.samples)
+        p50, p95, p99 = (percentile(samples, pct) for pct in (50, 95, 99))
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / self.count, 3) if self.count else 0.0,
+            "p50_ms": round(p50 * 1000) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000) if p95 is not None else None,
+            "p99_ms": round(p99 * 1000) if p99 is not None else None,
+            "max_ms": round(max(samples) * 1000) if samples else None,
+            "error_avg_ms": round(self.failed_total / self.errors * 1000) if self.errors else None,
+        }
+
+
+class LatencyRecorder:
+    """Thread-safe collection of StepStats by step name."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        """
+        Initialize LatencyRecorder.
+
+        Args:
+            window: Recent samples kept per step for percentiles
+        """
+        self.window = window
+        self.steps: Dict[str, StepStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, step: str, seconds: float, ok: bool = True) -> None:
+        """
+        Add one timing.
+
+        Args:
+            step: Step name
+            seconds: Duration
+            ok: False when the step failed
+        """
+        with self._lock:
+            stats = self.steps.get(step)
+            if stats is None:
+                stats = self.steps[step] = StepStats(self.window)
+            stats.add(seconds, ok)
+
+    @contextmanager
+    def measure(self, step: str):
+        """Time the ``with`` block as ``step``; exceptions count as errors and propagate."""
+        started = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.record(step, time.perf_counter() - started, ok)
+
+    def summary(self) -> Dict[str, Dict]:
+        """Step name -> count, errors, error rate, p50/p95/p99/max of passed runs and mean of failed runs in ms."""
+        with self._lock:
+            return {step: stats.summary() for step, stats in self.steps.items()}
+
+    def format_table(self) -> str:
+        """Plain-text table of the summary."""
+        lines = [f"{'step':<24}{'count':>8}{'errors':>8}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>8}{'err avg':>8}"
+                 "  (ms; percentiles of passed runs)"]
+        for step, s in sorted(self.summary().items()):
+            values = [s[key] if s[key] is not None else "-"
+                      for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms", "error_avg_ms")]
+            lines.append(f"{step:<24}{s['count']:>8}{s['errors']:>8}" + "".join(f"{v:>8}" for v in values))
+        return "\n".join(lines)
+
+    def snapshot(self) -> Dict[str, Dict[str, Tuple[int, float, List[int]]]]:
+        """Step name -> result ("pass"/"fail") -> (count, total seconds, cumulative bucket counts)."""
+        with self._lock:
+            return {
+                step: {
+                    "pass": (stats.count - stats.errors, stats.total - stats.failed_total,
+                             [a - f for a, f in zip(stats.buckets, stats.failed_buckets)]),
+                    "fail": (stats.errors, stats.failed_total, list(stats.failed_buckets)),
+                }
+                for step, stats in self.steps.items()
+            }
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_prometheus(recorder: LatencyRecorder, prefix: str = "n11") -> str:
+    """
+    Render a recorder in the Prometheus text exposition format.
+
+    Step names "<journey>.<step>" become ``journey``/``step`` labels; a
+    name without a dot is the whole journey and gets ``step="total"``.
+    Durations carry a ``result`` label, so failed runs (often timeouts)
+    do not skew the latency of passing ones.
+
+    Args:
+        recorder: Recorder to export
+        prefix: Metric name prefix
+
+    Returns:
+        str: ``<prefix>_step_duration_seconds{result="pass|fail"}`` histogram and
+        ``<prefix>_step_runs_total{result="pass|fail"}`` counters
+    """
+    duration, runs = f"{prefix}_step_duration_seconds", f"{prefix}_step_runs_total"
+    lines = [
+        f"# HELP {duration} Duration of journey steps by result.",
+        f"# TYPE {duration} histogram",
+    ]
+    snapshot = sorted(recorder.snapshot().items())
+    for name, by_result in snapshot:
+        journey, _, step = name.partition(".")
+        for result, (count, total, buckets) in by_result.items():
+            if result == "fail" and not count:
+                continue
+            labels = f'journey="{_label(journey)}",step="{_label(step or "total")}",result="{result}"'
+            for bound, cumulative in zip(BUCKETS, buckets):
+                lines.append(f'{duration}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{duration}_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"{duration}_sum{{{labels}}} {total:.6f}")
+            lines.append(f"{duration}_count{{{labels}}} {count}")
+    lines += [f"# HELP {runs} Step runs by result.", f"# TYPE {runs} counter"]
+    for name, by_result in snapshot:
+        journey, _, step = name.partition(".")
+        labels = f'journey="{_label(journey)}",step="{_label(step or "total")}"'
+        for result, (count, _, _) in by_result.items():
+            lines.append(f'{runs}{{{labels},result="{result}"}} {count}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,212 @@
+"""
+Memory-aware gate for browser launches.
+
+When ``configure_launch_gate`` has been called (``plugins.auto_workers``
+does so in xdist workers), ``create_driver`` starts Chrome only inside
+``launch_slot()``: a launch waits until the host has room for one more
+browser plus a reserve. The wait is serialized across processes with a
+lock file, so workers that would otherwise start browsers at the same
+moment and push the host into swap start them one after another, as memory
+allows. The lock is released before Chrome starts.
+
+A browser that was just started is still far below its footprint, so the
+free memory it is about to take is not visible yet. The lock file keeps a
+ledger of recent launches, and each launch counts against available memory
+with its footprint, fading out over ``WARMUP_SECONDS``. A launch that fails,
+or a driver that quits, drops its entry again.
+"""
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+import psutil
+
+try:
+    import fcntl
+except ImportError:  # Windows: launches are gated on memory only
+    fcntl = None
+
+DEFAULT_LOCK_FILE = "reports/.browser_launch.lock"
+DEFAULT_TIMEOUT = 120.0
+POLL_INTERVAL = 1.0
+WARMUP_SECONDS = 30.0  # time for a new browser to grow to its footprint
+
+_MB = 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+def available_memory_mb() -> float:
+    """Memory available to new processes without swapping."""
+    return psutil.virtual_memory().available / _MB
+
+
+class LaunchGate:
+    """Holds browser launches back while memory is short, one waiting launch at a time across processes."""
+
+    def __init__(self, footprint_mb: float, reserve_mb: float, timeout: float = DEFAULT_TIMEOUT,
+                 lock_file: str = DEFAULT_LOCK_FILE):
+        """
+        Initialize LaunchGate.
+
+        Args:
+            footprint_mb: Expected peak RSS of one browser
+            reserve_mb: Memory that must stay free after the launch
+            timeout: Longest wait for memory; the launch then proceeds with a warning
+            lock_file: Lock file shared by all processes launching browsers
+        """
+        self.footprint_mb = footprint_mb
+        self.reserve_mb = reserve_mb
+        self.timeout = timeout
+        self.lock_file = lock_file
+        self.launches = 0
+        self.waited = 0.0
+        self._ledger = []  # ledger without a lock file (Windows)
+
+    @property
+    def required_mb(self) -> float:
+        return self.footprint_mb + self.reserve_mb
+
+    @contextmanager
+    def slot(self):
+        """
+        Wait for memory under the launch lock and record the launch, then
+        let the caller start its browser (outside the lock).
+
+        Yields:
+            str: Ledger id of the launch, for ``forget``
+        """
+        with self._lock() as ledger:
+            started = time.monotonic()
+            launches = self._read_ledger(ledger)
+            available = self.available_mb(launches)
+            if available < self.required_mb:
+                logger.info(
+                    f"⏳ Holding browser launch: {available:.0f} MB available, {self.required_mb:.0f} MB needed"
+                )
+            while available < self.required_mb and time.monotonic() - started < self.timeout:
+                time.sleep(POLL_INTERVAL)
+                available = self.available_mb(launches)
+            if available < self.required_mb:
+                logger.warning(f"Launching browser with only {available:.0f} MB available after {self.timeout:.0f}s")
+            self.waited += time.monotonic() - started
+            self.launches += 1
+            launch_id = f"{os.getpid()}-{self.launches}"
+            self._write_ledger(ledger, launches + [(time.time(), launch_id)])
+        try:
+            yield launch_id
+        except BaseException:
+            self.forget(launch_id)
+            raise
+
+    def forget(self, launch_id: str) -> None:
+        """Drop a launch from the ledger: the browser failed to start or has quit."""
+        with self._lock() as ledger:
+            launches = self._read_ledger(ledger)
+            self._write_ledger(ledger, [launch for launch in launches if launch[1] != launch_id])
+
+    def available_mb(self, launches) -> float:
+        """
+        Available memory minus what recently launched browsers are still expected to take.
+
+        Args:
+            launches: ``(wall-clock time, launch id)`` of recent launches (all processes)
+
+        Returns:
+            float: Memory in MB a new browser can count on
+        """
+        now = time.time()
+        pending = sum(self.footprint_mb * max(0.0, 1.0 - (now - launched) / WARMUP_SECONDS) for launched, _ in launches)
+        return available_memory_mb() - pending
+
+    def _read_ledger(self, ledger) -> List[Tuple[float, str]]:
+        cutoff = time.time() - WARMUP_SECONDS
+        if ledger is None:
+            launches = self._ledger
+        else:
+            ledger.seek(0)
+            launches = []
+            for line in ledger.read().splitlines():
+                try:
+                    launched, launch_id = line.split()
+                    launches.append((float(launched), launch_id))
+                except ValueError:
+                    pass
+        return [launch for launch in launches if launch[0] > cutoff]
+
+    def _write_ledger(self, ledger, launches) -> None:
+        if ledger is None:
+            self._ledger = launches
+            return
+        ledger.seek(0)
+        ledger.truncate()
+        ledger.write("".join(f"{launched:.3f} {launch_id}\n" for launched, launch_id in launches))
+        ledger.flush()
+
+    @contextmanager
+    def _lock(self):
+        """Hold the cross-process lock; yields the lock file, which is also the launch ledger (None without fcntl)."""
+        if fcntl is None:
+            yield None
+            return
+        directory = os.path.dirname(self.lock_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.lock_file, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield f
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+_gate: Optional[LaunchGate] = None
+
+
+def configure_launch_gate(gate: Optional[LaunchGate]) -> None:
+    """Install (or with None remove) the gate used by ``create_driver``."""
+    global _gate
+    _gate = gate
+
+
+def get_launch_gate() -> Optional[LaunchGate]:
+    return _gate
+
+
+@contextmanager
+def launch_slot():
+    """
+    Gate a browser launch; a no-op unless a gate is configured.
+
+    Yields:
+        Optional[str]: Ledger id of the launch (None without a gate)
+    """
+    if _gate is None:
+        yield None
+        return
+    with _gate.slot() as launch_id:
+        yield launch_id
+
+
+def forget_on_quit(driver, launch_id: Optional[str]) -> None:
+    """
+    Drop the driver's launch from the ledger once it quits, since its memory is free again.
+
+    Args:
+        driver: WebDriver started inside ``launch_slot``
+        launch_id: Id yielded by ``launch_slot``
+    """
+    gate = _gate
+    if gate is None or launch_id is None:
+        return
+    quit_driver = driver.quit
+
+    def quit_and_forget():
+        try:
+            quit_driver()
+        finally:
+            gate.forget(launch_id)
+
+    driver.quit = quit_and_forget
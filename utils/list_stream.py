@@ -0,0 +1,168 @@
+"""
+Streaming iterator over lazily loaded / paginated lists.
+
+``ListStream`` reads list rows in batches with one script call per batch.
+When the rows in the DOM run out it scrolls to trigger lazy loading, and
+when the page has a "next" link it fetches the next page in the background
+(``fetch`` + ``DOMParser``) while the caller is still processing the
+current batch. Only one batch is held in Python and at most one prefetched
+page in the browser, so memory stays bounded however long the list is.
+"""
+import logging
+from typing import Iterator, List, Optional
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from utils.dom_snapshot import invalidate_snapshot
+
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_LAZY_TIMEOUT = 3
+
+LIVE = "live"
+PREFETCHED = "prefetched"
+
+_EXTRACT_SCRIPT = """
+const [rowSelector, start, count, source] = arguments;
+const mapper = __MAPPER__;
+const root = source === 'prefetched' ? window.__listStream.doc : document;
+const rows = root.querySelectorAll(rowSelector);
+const records = Array.from(rows).slice(start, start + count).map(el => {
+    try { return mapper(el); } catch (e) { return null; }
+});
+return {total: rows.length, records: records};
+"""
+
+_PREFETCH_SCRIPT = """
+const [nextSelector, source] = arguments;
+if (window.__listStreamNext) return true;
+const root = source === 'prefetched' ? window.__listStream.doc : document;
+const base = source === 'prefetched' ? window.__listStream.url : location.href;
+const link = root.querySelector(nextSelector);
+const href = link && link.getAttribute('href');
+if (!href) return false;
+const url = new URL(href, base).href;
+window.__listStreamNext = fetch(url, {credentials: 'include'})
+    .then(r => r.ok ? r.text() : Promise.reject(r.status))
+    .then(html => ({url: url, doc: new DOMParser().parseFromString(html, 'text/html')}));
+return true;
+"""
+
+_AWAIT_PAGE_SCRIPT = """
+const done = arguments[arguments.length - 1];
+const pending = window.__listStreamNext;
+window.__listStreamNext = null;
+if (!pending) { done(null); return; }
+pending.then(page => { window.__listStream = page; done(page.url); })
+       .catch(e => done(null));
+"""
+
+_SCROLL_SCRIPT = "window.scrollTo(0, document.body.scrollHeight);"
+
+_COUNT_SCRIPT = "return document.querySelectorAll(arguments[0]).length;"
+
+
+class ListStream:
+    """Batched, prefetching iterator over list rows of the current page."""
+
+    def __init__(self, driver, row_selector: str, mapper_js: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                 next_selector: Optional[str] = None, lazy_timeout: float = DEFAULT_LAZY_TIMEOUT,
+                 max_items: Optional[int] = None):
+        """
+        Initialize ListStream.
+
+        Args:
+            driver: WebDriver instance
+            row_selector: CSS selector of one list row
+            mapper_js: JavaScript ``function(el) {...}`` turning a row into a record
+            batch_size: Records per batch
+            next_selector: CSS selector of the "next page" link (None: no pagination)
+            lazy_timeout: Seconds to wait for lazily loaded rows after scrolling
+            max_items: Stop after this many records
+        """
+        self.driver = driver
+        self.row_selector = row_selector
+        self.batch_size = batch_size
+        self.next_selector = next_selector
+        self.lazy_timeout = lazy_timeout
+        self.max_items = max_items
+        self.logger = logging.getLogger(__name__)
+        self._extract_script = _EXTRACT_SCRIPT.replace("__MAPPER__", mapper_js)
+        self.pages = 1
+
+    def __iter__(self) -> Iterator[List[dict]]:
+        return self.batches()
+
+    def batches(self) -> Iterator[List[dict]]:
+        """
+        Yield lists of records, one batch at a time.
+
+        Yields:
+            List[dict]: Records of the next batch (rows the mapper rejected are dropped)
+        """
+        source = LIVE
+        offset = 0
+        produced = 0
+        self.driver.execute_script("window.__listStream = null; window.__listStreamNext = null;")
+        while True:
+            size = self.batch_size
+            if self.max_items is not None:
+                size = min(size, self.max_items - produced)
+                if size <= 0:
+                    return
+
+            data = self.driver.execute_script(self._extract_script, self.row_selector, offset, size, source)
+            records = data["records"]
+            if records:
+                offset += len(records)
+                if data["total"] - offset < self.batch_size:
+                    # Start loading what comes next while the caller works on this batch
+                    self._prefetch(source)
+                batch = [record for record in records if record]
+                produced += len(records)
+                yield batch
+                continue
+
+            if source == LIVE and self._wait_for_lazy_rows(offset):
+                continue
+            if self._advance_page(source):
+                source, offset = PREFETCHED, 0
+                continue
+            self.logger.info(f"List stream finished: {produced} records over {self.pages} page(s)")
+            return
+
+    def _prefetch(self, source: str) -> None:
+        if source == LIVE:
+            self._scroll()
+        if self.next_selector:
+            self.driver.execute_script(_PREFETCH_SCRIPT, self.next_selector, source)
+
+    def _scroll(self) -> None:
+        """Scroll to the bottom; the page may change, so the snapshot is dropped."""
+        invalidate_snapshot(self.driver)
+        self.driver.execute_script(_SCROLL_SCRIPT)
+
+    def _wait_for_lazy_rows(self, offset: int) -> bool:
+        """Scroll to the bottom and wait until more rows than ``offset`` exist."""
+        self._scroll()
+        try:
+            WebDriverWait(self.driver, self.lazy_timeout, poll_frequency=0.2).until(
+                lambda d: d.execute_script(_COUNT_SCRIPT, self.row_selector) > offset
+            )
+            return True
+        except TimeoutException:
+            return False
+
+    def _advance_page(self, source: str) -> bool:
+        """Switch to the (pre)fetched next page; False when there is none."""
+        if not self.next_selector:
+            return False
+        if not self.driver.execute_script(_PREFETCH_SCRIPT, self.next_selector, source):
+            return False
+        url = self.driver.execute_async_script(_AWAIT_PAGE_SCRIPT)
+        if not url:
+            self.logger.warning("Could not fetch next list page")
+            return False
+        self.pages += 1
+        self.logger.debug(f"List stream moved to page {self.pages}: {url}")
+        return True
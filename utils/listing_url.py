@@ -0,0 +1,213 @@
+"""
+Listing URL helpers and learned filter/sort URL encodings.
+
+The site's query parameters for a filter or sort choice are not hard-coded
+here: the first time a UI step (brand checkbox, sort option, free shipping)
+is clicked, the query parameters it added to the URL are recorded under a
+step key. Later runs apply those parameters straight to the URL instead of
+clicking. Steps whose click changed the URL but not the query (path
+changes) are remembered as not encodable and keep being clicked; a click
+that did not change the URL at all teaches nothing. Every encoding expires
+after a TTL and is learned again, so site changes are picked up.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+SEARCH_URL = "https://www.n11.com/arama"
+DEFAULT_ENCODINGS_FILE = "reports/url_encodings.json"
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+
+
+def search_url(keyword: str) -> str:
+    """Search result URL for a keyword."""
+    return f"{SEARCH_URL}?{urlencode({'q': keyword})}"
+
+
+def listing_steps(keyword: str, brand_index: Optional[int] = None, sort_option: Optional[int] = None,
+                  free_shipping: bool = False) -> List[str]:
+    """
+    Step keys of a listing state, in the order they are applied in the UI.
+
+    Brand indexes depend on the keyword's brand list, so brand keys carry
+    the keyword; sort and shipping keys are shared by all keywords.
+
+    Returns:
+        List[str]: e.g. ["brand:telefon:2", "sort:4", "free_shipping"]
+    """
+    steps = []
+    if brand_index is not None:
+        steps.append(f"brand:{keyword}:{brand_index}")
+    if sort_option is not None:
+        steps.append(f"sort:{sort_option}")
+    if free_shipping:
+        steps.append("free_shipping")
+    return steps
+
+
+def with_params(url: str, params: Dict[str, str]) -> str:
+    """
+    Return ``url`` with ``params`` set in its query (existing keys are replaced).
+
+    Args:
+        url: Base URL
+        params: Query parameters to set
+
+    Returns:
+        str: New URL
+    """
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query, keep_blank_values=True))
+    query.update(params)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), parts.fragment))
+
+
+def param_delta(before: str, after: str) -> Optional[Dict[str, str]]:
+    """
+    Query parameters added or changed between two URLs.
+
+    Args:
+        before: URL before the UI step
+        after: URL after the UI step
+
+    Returns:
+        Optional[Dict[str, str]]: Changed parameters, None when the step is not
+        expressible as query parameters (path changed or query unchanged)
+    """
+    old, new = urlsplit(before), urlsplit(after)
+    if (old.scheme, old.netloc, old.path) != (new.scheme, new.netloc, new.path):
+        return None
+    old_query = dict(parse_qsl(old.query, keep_blank_values=True))
+    new_query = dict(parse_qsl(new.query, keep_blank_values=True))
+    delta = {key: value for key, value in new_query.items() if old_query.get(key) != value}
+    return delta or None
+
+
+def is_unfiltered(url: str) -> bool:
+    """True when a listing URL carries nothing but the search keyword."""
+    return set(dict(parse_qsl(urlsplit(url).query, keep_blank_values=True))) <= {"q"}
+
+
+class UrlEncodings:
+    """Persistent, thread-safe map of UI step key -> query parameters, each with a learn time."""
+
+    def __init__(self, encodings_file: str = DEFAULT_ENCODINGS_FILE, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        """
+        Initialize UrlEncodings.
+
+        Args:
+            encodings_file: JSON file the encodings are loaded from and saved to
+            ttl_seconds: Age after which an encoding is learned again
+        """
+        self.encodings_file = encodings_file
+        self.ttl_seconds = ttl_seconds
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        # Step key -> {"params": query parameters or None, "learned_at": epoch seconds}
+        self.steps: Dict[str, dict] = {}
+        self._changed = set()
+        self.load()
+
+    def load(self) -> None:
+        """Load encodings from disk (missing or broken files start empty)."""
+        try:
+            if os.path.exists(self.encodings_file):
+                with open(self.encodings_file, 'r', encoding='utf-8') as f:
+                    steps = json.load(f)
+                # Entries without a learn time (older files) count as expired
+                self.steps = {
+                    key: entry if isinstance(entry, dict) and "learned_at" in entry
+                    else {"params": entry, "learned_at": 0}
+                    for key, entry in steps.items()
+                }
+        except Exception as e:
+            self.logger.warning(f"Could not load URL encodings: {e}")
+            self.steps = {}
+
+    def save(self) -> None:
+        """Write the steps learned or forgotten in this process over the file's current content."""
+        with self._lock:
+            changed, self._changed = self._changed, set()
+            updates = {key: self.steps.get(key) for key in changed}
+        if not updates:
+            return
+        os.makedirs(os.path.dirname(self.encodings_file) or '.', exist_ok=True)
+        steps = {}
+        if os.path.exists(self.encodings_file):
+            try:
+                with open(self.encodings_file, 'r', encoding='utf-8') as f:
+                    steps = json.load(f)
+            except ValueError:
+                steps = {}
+        for key, entry in updates.items():
+            if entry is None:
+                steps.pop(key, None)
+            else:
+                steps[key] = entry
+        tmp_file = f"{self.encodings_file}.{os.getpid()}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(steps, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_file, self.encodings_file)
+
+    def _fresh(self, key: str) -> Optional[dict]:
+        entry = self.steps.get(key)
+        if entry and time.time() - entry["learned_at"] < self.ttl_seconds:
+            return entry
+        return None
+
+    def is_known(self, key: str) -> bool:
+        """True when the step was learned (encodable or not) within the TTL."""
+        with self._lock:
+            return self._fresh(key) is not None
+
+    def get(self, key: str) -> Optional[Dict[str, str]]:
+        """Query parameters of a step, None when unknown, expired or not encodable."""
+        with self._lock:
+            entry = self._fresh(key)
+            return entry["params"] if entry else None
+
+    def learn(self, key: str, before: str, after: str) -> Optional[Dict[str, str]]:
+        """
+        Record the query parameters a UI step added.
+
+        Only call this after the step's click was confirmed to change the URL.
+
+        Args:
+            key: Step key, e.g. "sort:4"
+            before: URL before the step
+            after: URL after the step
+
+        Returns:
+            Optional[Dict[str, str]]: Learned parameters (None: not encodable)
+        """
+        delta = param_delta(before, after)
+        with self._lock:
+            self.steps[key] = {"params": delta, "learned_at": time.time()}
+            self._changed.add(key)
+        if delta:
+            self.logger.info(f"🔗 Learned URL encoding for {key}: {delta}")
+        else:
+            self.logger.info(f"Step {key} is not expressible in the URL, it will be clicked")
+        return delta
+
+    def forget(self, key: str) -> None:
+        """Drop a step's encoding so it is clicked and learned again."""
+        with self._lock:
+            self.steps.pop(key, None)
+            self._changed.add(key)
+        self.logger.info(f"Forgot URL encoding for {key}")
+
+
+_encodings = None
+
+
+def get_url_encodings() -> UrlEncodings:
+    """Process-wide learned URL encodings."""
+    global _encodings
+    if _encodings is None:
+        _encodings = UrlEncodings()
+    return _encodings
@@ -0,0 +1,289 @@
+"""
+Concurrent synthetic-user load mode.
+
+Replays the functional journeys with the page objects as virtual users:
+
+* ``search_cart``: HomePage -> search -> SearchResultPage -> add to cart
+* ``phone_filter``: brand-filtered listing -> comment sort -> sort order
+  -> free shipping filter
+* ``stores``: StoresPage -> letter filter -> random store result page
+
+Each user drives its own headless browser; users start spread over the
+ramp-up period, wait a random think time between steps and loop until the
+run duration ends. Every step is timed into a ``LatencyRecorder`` and the
+run ends with p50/p95/p99 of the passed runs and the error count, rate
+and mean failed-run time per step. Point it at staging or
+at ``utils.site_stub_server`` with ``--base-url`` (or ``N11_BASE_URL``).
+"""
+import argparse
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.latency import LatencyRecorder
+from utils.site import get_base_url, set_base_url
+
+DEFAULT_USERS = 4
+DEFAULT_DURATION = 60
+DEFAULT_RAMP_UP = 10
+DEFAULT_THINK = (1.0, 3.0)
+
+
+# ------------------
+# Journeys
+# ------------------
+def search_cart_journey(keyword: str = "telefon") -> List[Tuple[str, Callable]]:
+    """Steps of the search -> add to cart journey; each step gets the previous step's page."""
+    def home(driver, _):
+        from pages.home_page import HomePage
+        return HomePage(driver)
+
+    def search(driver, home_page):
+        from pages.search_result_page import SearchResultPage
+        home_page.search_for_product(keyword)
+        return SearchResultPage(driver)
+
+    def add_to_cart(driver, result_page):
+        result_page.click_add_to_cart_button(1)
+        skus = result_page.resolve_skus()
+        if skus:
+            result_page.select_skus([1, len(skus)])
+            result_page.click_js_add_basket_sku()
+        if not result_page.is_product_added_to_cart():
+            raise AssertionError("product was not added to cart")
+        return result_page
+
+    return [("home", home), ("search", search), ("add_to_cart", add_to_cart)]
+
+
+def phone_filter_journey(keyword: str = "telefon", brand_index: int = 2) -> List[Tuple[str, Callable]]:
+    """Steps of the brand filter -> sort -> free shipping journey."""
+    def listing(driver, _):
+        from pages.search_result_page import SearchResultPage
+        return SearchResultPage.open_listing(driver, keyword, brand_index=brand_index)
+
+    def sort(driver, result_page):
+        result_page.click_sort_by_icon()
+        result_page.click_sort_option(4)
+        result = result_page.verify_sort_order("comment_count", count=5)
+        if not result.ok:
+            raise AssertionError(f"products are not sorted by comment count: {result.violation}")
+        return result_page
+
+    def free_shipping(driver, result_page):
+        result_page.click_cargo_filter()
+        result_page.click_free_shipment_option()
+        if not result_page.verify_cargo_badge_field_all_products():
+            raise AssertionError("not every product has a cargo badge")
+        return result_page
+
+    return [("listing", listing), ("sort", sort), ("free_shipping", free_shipping)]
+
+
+def stores_journey(letter: str = "S") -> List[Tuple[str, Callable]]:
+    """Steps of the store directory journey."""
+    def stores(driver, _):
+        from pages.stores_page import StoresPage
+        return StoresPage(driver)
+
+    def filter_letter(driver, stores_page):
+        stores_page.click_letter(letter)
+        return stores_page
+
+    def open_store(driver, stores_page):
+        result_page = stores_page.click_store(stores_page.pick_random_store(letter))
+        result_page.wait_for_store_page_load()
+        return result_page
+
+    return [("stores", stores), ("filter_letter", filter_letter), ("open_store", open_store)]
+
+
+JOURNEYS: Dict[str, Callable[[], List[Tuple[str, Callable]]]] = {
+    "search_cart": search_cart_journey,
+    "phone_filter": phone_filter_journey,
+    "stores": stores_journey,
+}
+
+
+def run_journey(driver, name: str, steps: List[Tuple[str, Callable]], recorder: LatencyRecorder,
+                think: Tuple[float, float] = (0.0, 0.0), stop: Optional[threading.Event] = None) -> bool:
+    """
+    Run one journey, timing every step as "<journey>.<step>".
+
+    The journey stops at the first failing step; its total time is
+    recorded as "<journey>".
+
+    Returns:
+        bool: True when every step passed
+    """
+    logger = logging.getLogger(__name__)
+    started = time.perf_counter()
+    page = None
+    ok = True
+    for step_name, step in steps:
+        try:
+            with recorder.measure(f"{name}.{step_name}"):
+                page = step(driver, page)
+        except Exception as e:
+            logger.warning(f"❌ {name}.{step_name}: {type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}")
+            ok = False
+            break
+        if think[1] > 0:
+            pause = random.uniform(*think)
+            if stop is not None:
+                stop.wait(pause)
+            else:
+                time.sleep(pause)
+    recorder.record(name, time.perf_counter() - started, ok)
+    return ok
+
+
+# ------------------
+# Load runner
+# ------------------
+class LoadRunner:
+    """Runs virtual users with ramp-up and think time."""
+
+    def __init__(self, journeys: List[str], users: int = DEFAULT_USERS, duration: float = DEFAULT_DURATION,
+                 ramp_up: float = DEFAULT_RAMP_UP, think: Tuple[float, float] = DEFAULT_THINK,
+                 driver_factory: Optional[Callable] = None):
+        """
+        Initialize LoadRunner.
+
+        Args:
+            journeys: Journey names from JOURNEYS, run in turn by every user
+            users: Number of concurrent virtual users (browsers)
+            duration: Run length in seconds after the first user starts
+            ramp_up: Seconds over which user start times are spread
+            think: (min, max) think time in seconds between steps
+            driver_factory: Callable returning a new WebDriver (default: headless Chrome)
+        """
+        unknown = [name for name in journeys if name not in JOURNEYS]
+        if unknown:
+            raise ValueError(f"Unknown journeys {unknown}, expected some of {sorted(JOURNEYS)}")
+        self.journeys = journeys
+        self.users = users
+        self.duration = duration
+        self.ramp_up = ramp_up
+        self.think = think
+        self.driver_factory = driver_factory
+        self.recorder = LatencyRecorder()
+        self.iterations = 0
+        self.logger = logging.getLogger(__name__)
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def _new_driver(self):
+        if self.driver_factory is not None:
+            return self.driver_factory()
+        from utils.driver_factory import create_driver
+        return create_driver(headless=True)
+
+    def _user(self, user_index: int, deadline: float) -> None:
+        start_delay = self.ramp_up * user_index / self.users if self.users > 1 else 0.0
+        if self._stop.wait(start_delay):
+            return
+        try:
+            with self.recorder.measure("browser_start"):
+                driver = self._new_driver()
+        except Exception as e:
+            # Recorded as a failed browser_start; only this user ends, the run goes on
+            self.logger.error(f"❌ User {user_index} could not start a browser: {type(e).__name__}: {e}")
+            return
+        try:
+            iteration = 0
+            while time.monotonic() < deadline and not self._stop.is_set():
+                name = self.journeys[(user_index + iteration) % len(self.journeys)]
+                ok = run_journey(driver, name, JOURNEYS[name](), self.recorder, self.think, self._stop)
+                iteration += 1
+                if not ok:
+                    # Back off so a broken target is not hammered in a tight loop
+                    self._stop.wait(max(self.think[1], 1.0))
+                with self._lock:
+                    self.iterations += 1
+        finally:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def run(self) -> Dict[str, Dict]:
+        """
+        Run all users until the duration ends.
+
+        Returns:
+            Dict[str, Dict]: Per-step latency summary
+        """
+        self.logger.info(
+            f"🚦 Load run: {self.users} users, {self.duration}s, ramp-up {self.ramp_up}s, "
+            f"journeys {self.journeys} against {get_base_url()}"
+        )
+        deadline = time.monotonic() + self.duration
+        with ThreadPoolExecutor(max_workers=self.users) as executor:
+            futures = [executor.submit(self._user, i, deadline) for i in range(self.users)]
+            try:
+                for user_index, future in enumerate(futures):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        # One broken user must not discard the others' results
+                        self.logger.error(f"❌ User {user_index} ended: {type(e).__name__}: {e}")
+            except KeyboardInterrupt:
+                self._stop.set()
+                raise
+        self.logger.info(f"Load run finished: {self.iterations} journeys")
+        return self.recorder.summary()
+
+    def stop(self) -> None:
+        """Ask all users to stop after their current step."""
+        self._stop.set()
+
+
+def _parse_think(value: str) -> Tuple[float, float]:
+    low, _, high = value.partition("-")
+    return float(low), float(high or low)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Run the functional journeys as concurrent synthetic users")
+    parser.add_argument("--journeys", default="search_cart,stores", help=f"comma separated: {','.join(JOURNEYS)}")
+    parser.add_argument("--users", type=int, default=DEFAULT_USERS)
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="seconds")
+    parser.add_argument("--ramp-up", type=float, default=DEFAULT_RAMP_UP, help="seconds")
+    parser.add_argument("--think", default="1-3", help="think time range in seconds, e.g. 0.5-2")
+    parser.add_argument("--base-url", default=None, help="site origin (default: N11_BASE_URL or production)")
+    parser.add_argument("--stub", action="store_true", help="start the local site stand-in and target it")
+    parser.add_argument("--stub-latency-ms", type=float, default=0)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    stub = None
+    if args.stub:
+        from utils.site_stub_server import SiteStubServer
+        stub = SiteStubServer(latency_ms=args.stub_latency_ms).start()
+        set_base_url(stub.base_url)
+    elif args.base_url:
+        set_base_url(args.base_url)
+
+    runner = LoadRunner(
+        journeys=[j.strip() for j in args.journeys.split(",") if j.strip()],
+        users=args.users, duration=args.duration, ramp_up=args.ramp_up, think=_parse_think(args.think),
+    )
+    try:
+        summary = runner.run()
+    finally:
+        if stub is not None:
+            stub.stop()
+
+    print(runner.recorder.format_table())
+    from simple_report import SimpleReporter
+    reporter = SimpleReporter()
+    for step, values in summary.items():
+        reporter.set_stat("Load test", step, values)
+
+
+if __name__ == "__main__":
+    main()
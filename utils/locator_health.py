@@ -0,0 +1,310 @@
+"""
+Locator health index.
+
+Page objects can declare several alternative locators for one element with
+``LocatorSet``. Every resolution records latency and success per locator in a
+persistent JSON index, so later runs try the fastest locator that still works
+first and a warning is logged when a locator starts degrading.
+
+Only sessions that resolved locators write the index. Writes merge this
+process's attempts into the file under a file lock, so xdist workers add
+to each other's statistics instead of overwriting them.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves are not serialized between processes
+    fcntl = None
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+DEFAULT_INDEX_FILE = "reports/locator_health.json"
+RECENT_WINDOW = 20
+MIN_SUCCESS_RATE = 0.8
+SLOWDOWN_FACTOR = 2.0
+MIN_SLOW_MS = 50.0
+EWMA_ALPHA = 0.3
+
+Locator = Tuple[str, str]
+
+
+class LocatorSet(tuple):
+    """
+    Alternative locators for one element, in declaration order.
+
+    Example:
+        _STORE_ROWS = LocatorSet(
+            "store rows",
+            (By.CSS_SELECTOR, ".allSellers .sellerListHolder > ul > li"),
+            (By.CSS_SELECTOR, "div.tabPanel.allSellers > div.sellerListHolder > ul > li"),
+        )
+    """
+
+    def __new__(cls, name: str, *locators: Locator):
+        if not locators:
+            raise ValueError(f"LocatorSet '{name}' needs at least one locator")
+        instance = super().__new__(cls, locators)
+        instance.name = name
+        return instance
+
+    def __repr__(self) -> str:
+        return f"LocatorSet({self.name!r}, {len(self)} alternatives)"
+
+
+def locator_key(locator: Locator) -> str:
+    """Return the index key for a locator."""
+    return f"{locator[0]}|{locator[1]}"
+
+
+class LocatorHealthIndex:
+    """Persistent per-locator latency and success statistics."""
+
+    def __init__(self, index_file: str = DEFAULT_INDEX_FILE):
+        """
+        Initialize LocatorHealthIndex.
+
+        Args:
+            index_file: JSON file the index is loaded from and saved to
+        """
+        self.index_file = index_file
+        self.logger = logging.getLogger(__name__)
+        self.entries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._warned = set()
+        # Key -> attempts, successes and outcomes recorded by this process since the last save
+        self._pending: Dict[str, dict] = {}
+        self.load()
+
+    # ------------------
+    # Persistence
+    # ------------------
+    def load(self) -> None:
+        """Load the index from disk (missing or broken files start empty)."""
+        try:
+            if os.path.exists(self.index_file):
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+        except Exception as e:
+            self.logger.warning(f"Could not load locator health index: {e}")
+            self.entries = {}
+
+    def save(self) -> bool:
+        """
+        Merge this process's new attempts into the index file.
+
+        Returns:
+            bool: False when nothing was resolved since the last save (the file is left alone)
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            latest = {key: dict(self.entries[key]) for key in pending}
+        if not pending:
+            return False
+        try:
+            os.makedirs(os.path.dirname(self.index_file) or '.', exist_ok=True)
+            with open(self.index_file + ".lock", "a") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    entries = {}
+                    if os.path.exists(self.index_file):
+                        with open(self.index_file, 'r', encoding='utf-8') as f:
+                            entries = json.load(f)
+                    for key, delta in pending.items():
+                        entries[key] = self._merge(entries.get(key), latest[key], delta)
+                    tmp_file = f"{self.index_file}.{os.getpid()}.tmp"
+                    with open(tmp_file, 'w', encoding='utf-8') as f:
+                        json.dump(entries, f, indent=2)
+                    os.replace(tmp_file, self.index_file)
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+            with self._lock:
+                for key, entry in entries.items():
+                    if key not in self._pending:
+                        self.entries[key] = entry
+        except Exception as e:
+            self.logger.warning(f"Could not save locator health index: {e}")
+        return True
+
+    @staticmethod
+    def _merge(stored: dict, latest: dict, delta: dict) -> dict:
+        """Add one process's attempts to the entry on disk; timings come from the latest measurement."""
+        if stored is None:
+            return latest
+        merged = dict(latest)
+        merged["attempts"] = stored["attempts"] + delta["attempts"]
+        merged["successes"] = stored["successes"] + delta["successes"]
+        merged["recent"] = (stored["recent"] + delta["recent"])[-RECENT_WINDOW:]
+        if stored.get("best_ms") is not None and (merged["best_ms"] is None or stored["best_ms"] < merged["best_ms"]):
+            merged["best_ms"] = stored["best_ms"]
+        return merged
+
+    # ------------------
+    # Statistics
+    # ------------------
+    def record(self, locator: Locator, success: bool, latency_ms: float = 0.0) -> None:
+        """
+        Record one resolution attempt.
+
+        Args:
+            locator: Tuple of (By, value) that was tried
+            success: Whether the locator matched
+            latency_ms: Time spent in find_elements
+        """
+        key = locator_key(locator)
+        with self._lock:
+            entry = self.entries.setdefault(key, {
+                "attempts": 0, "successes": 0, "ewma_ms": None, "best_ms": None, "recent": [],
+            })
+            entry["attempts"] += 1
+            entry["recent"] = (entry["recent"] + [1 if success else 0])[-RECENT_WINDOW:]
+            delta = self._pending.setdefault(key, {"attempts": 0, "successes": 0, "recent": []})
+            delta["attempts"] += 1
+            delta["successes"] += 1 if success else 0
+            delta["recent"] = (delta["recent"] + [1 if success else 0])[-RECENT_WINDOW:]
+            if success:
+                entry["successes"] += 1
+                ewma = entry["ewma_ms"]
+                entry["ewma_ms"] = latency_ms if ewma is None else EWMA_ALPHA * latency_ms + (1 - EWMA_ALPHA) * ewma
+                if entry["best_ms"] is None or entry["ewma_ms"] < entry["best_ms"]:
+                    entry["best_ms"] = entry["ewma_ms"]
+        self._warn_if_degrading(locator)
+
+    def success_rate(self, locator: Locator) -> float:
+        """Success rate over the recent window (1.0 when unknown)."""
+        recent = self.entries.get(locator_key(locator), {}).get("recent", [])
+        return sum(recent) / len(recent) if recent else 1.0
+
+    def is_degrading(self, locator: Locator) -> bool:
+        """True when a locator fails often or got much slower than its best."""
+        entry = self.entries.get(locator_key(locator))
+        if not entry:
+            return False
+        if len(entry["recent"]) >= 5 and self.success_rate(locator) < MIN_SUCCESS_RATE:
+            return True
+        ewma, best = entry["ewma_ms"], entry["best_ms"]
+        return bool(ewma and best and ewma > MIN_SLOW_MS and ewma > SLOWDOWN_FACTOR * best)
+
+    def rank(self, locators: LocatorSet) -> List[Locator]:
+        """
+        Order alternatives: healthy before failing, then fastest first.
+
+        Locators without history keep their declaration order and are tried
+        before measured ones so every alternative gets measured once.
+        """
+        def _score(item):
+            position, locator = item
+            entry = self.entries.get(locator_key(locator))
+            if not entry or entry["ewma_ms"] is None:
+                return (0, 0.0, position)
+            healthy = self.success_rate(locator) >= MIN_SUCCESS_RATE
+            return (1 if healthy else 2, entry["ewma_ms"], position)
+        return [locator for _, locator in sorted(enumerate(locators), key=_score)]
+
+    def summary(self) -> Dict[str, dict]:
+        """Report-friendly view of the index."""
+        rows = {}
+        for key, entry in sorted(self.entries.items()):
+            recent = entry["recent"]
+            rows[key] = {
+                "attempts": entry["attempts"],
+                "success_rate": f"{100.0 * sum(recent) / len(recent):.0f}%" if recent else "-",
+                "avg_ms": f"{entry['ewma_ms']:.1f}" if entry["ewma_ms"] is not None else "-",
+                "best_ms": f"{entry['best_ms']:.1f}" if entry["best_ms"] is not None else "-",
+            }
+        return rows
+
+    # ------------------
+    # Resolution
+    # ------------------
+    def resolve(self, driver, locators: LocatorSet, timeout: float) -> Locator:
+        """
+        Return the best alternative that currently matches.
+
+        Alternatives are tried in ranked order on every poll. Every
+        alternative that missed on any poll before the winner matched is
+        recorded as one failure; if nothing matches within ``timeout`` all
+        of them are, the top-ranked locator is returned and the caller's own
+        wait reports the timeout.
+
+        Args:
+            driver: WebDriver instance
+            locators: Alternatives to choose from
+            timeout: Maximum wait time in seconds
+
+        Returns:
+            Tuple[str, str]: The chosen (By, value) locator
+        """
+        return self.resolve_elements(driver, locators, timeout)[0]
+
+    def resolve_elements(self, driver, locators: LocatorSet, timeout: float) -> Tuple[Locator, list]:
+        """
+        Like ``resolve``, also returning the elements the chosen locator matched.
+
+        Callers that need the matches anyway save a second ``find_elements``.
+
+        Args:
+            driver: WebDriver instance
+            locators: Alternatives to choose from
+            timeout: Maximum wait time in seconds
+
+        Returns:
+            Tuple[Locator, list]: The chosen locator and its matches (empty on timeout)
+        """
+        ranked = self.rank(locators)
+        # Alternatives that missed on any poll so far, each recorded once per resolution
+        missed = []
+
+        def _first_match(drv):
+            for candidate in ranked:
+                started = time.perf_counter()
+                found = drv.find_elements(*candidate)
+                latency_ms = (time.perf_counter() - started) * 1000
+                if found:
+                    for miss in missed:
+                        if miss != candidate:
+                            self.record(miss, False)
+                    self.record(candidate, True, latency_ms)
+                    return candidate, found
+                if candidate not in missed:
+                    missed.append(candidate)
+            return False
+
+        try:
+            chosen, found = WebDriverWait(driver, timeout).until(_first_match)
+        except TimeoutException:
+            for miss in missed:
+                self.record(miss, False)
+            return ranked[0], []
+        if chosen != locators[0]:
+            self.logger.debug(f"Locator '{locators.name}' resolved to alternative: {chosen}")
+        return chosen, found
+
+    def _warn_if_degrading(self, locator: Locator) -> None:
+        key = locator_key(locator)
+        if key not in self._warned and self.is_degrading(locator):
+            self._warned.add(key)
+            entry = self.entries[key]
+            self.logger.warning(
+                f"⚠️ Locator degrading: {locator} "
+                f"(success rate {self.success_rate(locator):.0%}, avg {entry['ewma_ms'] or 0:.1f}ms, best {entry['best_ms'] or 0:.1f}ms)"
+            )
+
+
+_index = None
+
+
+def get_locator_index() -> LocatorHealthIndex:
+    """Process-wide locator health index."""
+    global _index
+    if _index is None:
+        _index = LocatorHealthIndex()
+    return _index
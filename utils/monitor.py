@@ -0,0 +1,236 @@
+"""
+Scheduled synthetic monitoring.
+
+Runs the functional journeys of ``utils.load_runner`` (``search_cart``,
+``phone_filter``, ``stores``; the flows of the three e2e tests) every
+``--interval`` seconds from one long-lived process. Browsers come from a
+``BrowserPool`` and stay warm between cycles, so each cycle pays only for
+the journeys themselves, not for a pytest start and a cold Chrome. The
+browsers are headless unless ``--headed`` is given.
+
+Step timings and pass/fail counts accumulate in a ``LatencyRecorder`` and
+are exported in the Prometheus text format, to a file (for the
+node_exporter textfile collector) and/or a local ``/metrics`` endpoint:
+
+    python -m utils.monitor --interval 300 --metrics-file reports/n11.prom --port 9111
+"""
+import argparse
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+from utils.browser_pool import BrowserPool
+from utils.driver_factory import create_driver
+from utils.latency import LatencyRecorder, format_prometheus
+from utils.load_runner import JOURNEYS, run_journey
+from utils.site import set_base_url
+
+DEFAULT_INTERVAL = 300
+DEFAULT_METRICS_FILE = "reports/monitor_metrics.prom"
+METRIC_PREFIX = "n11"
+
+
+class MonitorDaemon:
+    """Runs journeys on a fixed schedule and exports their metrics."""
+
+    def __init__(self, journeys: List[str], interval: float = DEFAULT_INTERVAL,
+                 metrics_file: Optional[str] = DEFAULT_METRICS_FILE, pool: Optional[BrowserPool] = None):
+        """
+        Initialize MonitorDaemon.
+
+        Args:
+            journeys: Journey names from JOURNEYS, run in order every cycle
+            interval: Seconds between cycle starts (overrunning cycles skip missed slots)
+            metrics_file: Prometheus text file rewritten after every cycle (None: no file)
+            pool: Browser pool keeping browsers warm between cycles (default: one headless browser)
+        """
+        unknown = [name for name in journeys if name not in JOURNEYS]
+        if unknown:
+            raise ValueError(f"Unknown journeys {unknown}, expected some of {sorted(JOURNEYS)}")
+        self.journeys = journeys
+        self.interval = interval
+        self.metrics_file = metrics_file
+        self.pool = pool or BrowserPool(factory=lambda: create_driver(headless=True), max_idle=1)
+        self.recorder = LatencyRecorder()
+        self.cycles = 0
+        self.last_cycle_end: Optional[float] = None
+        self.last_cycle_seconds: Optional[float] = None
+        self.logger = logging.getLogger(__name__)
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def run_cycle(self) -> bool:
+        """
+        Run every journey once on a pooled browser.
+
+        Returns:
+            bool: True when every journey passed
+        """
+        started = time.perf_counter()
+        passed = True
+        for name in self.journeys:
+            if self._stop.is_set():
+                break
+            ok = self._run_journey(name)
+            passed = passed and ok
+        with self._lock:
+            self.cycles += 1
+            self.last_cycle_end = time.time()
+            self.last_cycle_seconds = time.perf_counter() - started
+        self.logger.info(
+            f"{'✅' if passed else '❌'} Monitor cycle {self.cycles} finished in {self.last_cycle_seconds:.1f}s"
+        )
+        self.write_metrics()
+        return passed
+
+    def _run_journey(self, name: str) -> bool:
+        """Run one journey on a pooled browser; a browser that fails to start fails only this run."""
+        started = time.perf_counter()
+        try:
+            with self.recorder.measure(f"{name}.browser_start"):
+                driver = self.pool.acquire()
+        except Exception as e:
+            self.logger.error(f"❌ {name}: browser did not start: {type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}")
+            self.recorder.record(name, time.perf_counter() - started, ok=False)
+            return False
+        try:
+            return run_journey(driver, name, JOURNEYS[name](), self.recorder)
+        finally:
+            # A failed journey may have left the browser broken; the pool's reset decides
+            self.pool.release(driver)
+
+    def run(self, cycles: Optional[int] = None) -> None:
+        """
+        Run cycles on the schedule until stopped.
+
+        Args:
+            cycles: Stop after this many cycles (None: run until ``stop()``)
+        """
+        self.logger.info(f"📡 Monitoring {self.journeys} every {self.interval}s")
+        next_start = time.monotonic()
+        try:
+            while not self._stop.is_set():
+                self.run_cycle()
+                if cycles is not None and self.cycles >= cycles:
+                    break
+                next_start += self.interval
+                now = time.monotonic()
+                if next_start < now:
+                    skipped = int((now - next_start) // self.interval) + 1
+                    self.logger.warning(f"⏭️ Cycle overran the interval, skipping {skipped} slot(s)")
+                    next_start += skipped * self.interval
+                self._stop.wait(next_start - now)
+        finally:
+            self.pool.close_all()
+
+    def stop(self) -> None:
+        """Stop after the current journey."""
+        self._stop.set()
+
+    # ------------------
+    # Metrics export
+    # ------------------
+    def metrics(self) -> str:
+        """Current metrics in the Prometheus text format."""
+        with self._lock:
+            cycles, last_end, last_seconds = self.cycles, self.last_cycle_end, self.last_cycle_seconds
+        lines = [
+            f"# HELP {METRIC_PREFIX}_monitor_cycles_total Completed monitoring cycles.",
+            f"# TYPE {METRIC_PREFIX}_monitor_cycles_total counter",
+            f"{METRIC_PREFIX}_monitor_cycles_total {cycles}",
+        ]
+        if last_end is not None:
+            lines += [
+                f"# HELP {METRIC_PREFIX}_monitor_last_cycle_timestamp_seconds End of the last cycle.",
+                f"# TYPE {METRIC_PREFIX}_monitor_last_cycle_timestamp_seconds gauge",
+                f"{METRIC_PREFIX}_monitor_last_cycle_timestamp_seconds {last_end:.3f}",
+                f"# HELP {METRIC_PREFIX}_monitor_last_cycle_duration_seconds Duration of the last cycle.",
+                f"# TYPE {METRIC_PREFIX}_monitor_last_cycle_duration_seconds gauge",
+                f"{METRIC_PREFIX}_monitor_last_cycle_duration_seconds {last_seconds:.3f}",
+            ]
+        return format_prometheus(self.recorder, METRIC_PREFIX) + "\n".join(lines) + "\n"
+
+    def write_metrics(self) -> None:
+        """Atomically rewrite the metrics file so scrapers never read a partial file."""
+        if not self.metrics_file:
+            return
+        directory = os.path.dirname(self.metrics_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.metrics_file}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(self.metrics())
+            os.replace(tmp_path, self.metrics_file)
+        except OSError as e:
+            self.logger.warning(f"Could not write metrics file {self.metrics_file}: {e}")
+
+    def serve_metrics(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """
+        Serve ``/metrics`` from a background thread.
+
+        Args:
+            port: Port to bind (0: any free port)
+            host: Interface to bind
+
+        Returns:
+            ThreadingHTTPServer: Running server (``shutdown()`` to stop)
+        """
+        daemon = self
+
+        class _MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = daemon.metrics().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        self.logger.info(f"📈 Serving metrics on http://{host}:{server.server_address[1]}/metrics")
+        return server
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Run the journeys on a schedule and export Prometheus metrics")
+    parser.add_argument("--journeys", default=",".join(JOURNEYS), help=f"comma separated: {','.join(JOURNEYS)}")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help="seconds between cycles")
+    parser.add_argument("--metrics-file", default=DEFAULT_METRICS_FILE, help="'' to disable")
+    parser.add_argument("--port", type=int, default=None, help="serve /metrics on this port")
+    parser.add_argument("--cycles", type=int, default=None, help="stop after N cycles")
+    parser.add_argument("--base-url", default=None, help="site origin (default: N11_BASE_URL or production)")
+    parser.add_argument("--headed", action="store_true", help="show the browser window (default: headless)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.base_url:
+        set_base_url(args.base_url)
+    daemon = MonitorDaemon(
+        journeys=[j.strip() for j in args.journeys.split(",") if j.strip()],
+        interval=args.interval,
+        metrics_file=args.metrics_file or None,
+        pool=BrowserPool(factory=lambda: create_driver(headless=not args.headed), max_idle=1),
+    )
+    server = daemon.serve_metrics(args.port) if args.port is not None else None
+    try:
+        daemon.run(cycles=args.cycles)
+    except KeyboardInterrupt:
+        daemon.stop()
+    finally:
+        if server is not None:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""
+Browser process resource sampling.
+
+``ResourceSampler`` follows the process tree of one WebDriver session
+(chromedriver and every Chrome process it spawned) from a background
+thread and records summed RSS and CPU. JS heap usage comes from CDP
+``Performance.getMetrics`` and is read on the caller's thread, so the
+sampler never sends WebDriver commands concurrently with the test.
+
+For pooled browsers ``LeakTracker`` keeps the idle RSS of every session
+after each test (the pool has reset it to a blank page by then); a session
+whose idle RSS grows test after test is reported as leaking.
+"""
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import psutil
+
+DEFAULT_INTERVAL = 0.5
+LEAK_WINDOW = 4  # consecutive idle measurements that must keep growing
+LEAK_MIN_GROWTH_MB = 50.0  # total growth over the window
+
+_MB = 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+def driver_pid(driver) -> Optional[int]:
+    """PID of the session's chromedriver, None for remote sessions."""
+    process = getattr(getattr(driver, "service", None), "process", None)
+    return getattr(process, "pid", None)
+
+
+def tree_rss_mb(pid: int) -> Optional[float]:
+    """
+    Summed RSS of a process and all its descendants.
+
+    Returns:
+        Optional[float]: RSS in MB, None when the process is gone
+    """
+    try:
+        root = psutil.Process(pid)
+        processes = [root] + root.children(recursive=True)
+    except psutil.Error:
+        return None
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            continue
+    return total / _MB
+
+
+def js_heap_mb(driver) -> Optional[float]:
+    """Used JS heap of the current page in MB (None when CDP is unavailable)."""
+    try:
+        driver.execute_cdp_cmd("Performance.enable", {})
+        metrics = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+    except Exception as e:
+        logger.debug(f"Could not read JS heap: {e}")
+        return None
+    used = next((m["value"] for m in metrics if m["name"] == "JSHeapUsedSize"), None)
+    return used / _MB if used is not None else None
+
+
+@dataclass
+class ResourceUsage:
+    """Peak and average browser resource usage over a sampling period."""
+
+    samples: int
+    peak_rss_mb: float
+    avg_rss_mb: float
+    peak_cpu_pct: float
+    avg_cpu_pct: float
+    processes: int
+    js_heap_mb: Optional[float] = None
+    js_heap_delta_mb: Optional[float] = None
+
+    def as_stats(self) -> Dict:
+        stats = {
+            "peak_rss_mb": round(self.peak_rss_mb),
+            "avg_rss_mb": round(self.avg_rss_mb),
+            "peak_cpu_pct": round(self.peak_cpu_pct),
+            "avg_cpu_pct": round(self.avg_cpu_pct),
+        }
+        if self.js_heap_mb is not None:
+            stats["js_heap_mb"] = round(self.js_heap_mb, 1)
+        return stats
+
+    def __str__(self) -> str:
+        text = (f"RSS peak {self.peak_rss_mb:.0f} MB / avg {self.avg_rss_mb:.0f} MB, "
+                f"CPU peak {self.peak_cpu_pct:.0f}% / avg {self.avg_cpu_pct:.0f}% ({self.processes} processes)")
+        if self.js_heap_mb is not None:
+            text += f", JS heap {self.js_heap_mb:.1f} MB"
+            if self.js_heap_delta_mb is not None:
+                text += f" ({self.js_heap_delta_mb:+.1f})"
+        return text
+
+
+class ResourceSampler:
+    """Samples RSS and CPU of one session's process tree in the background."""
+
+    def __init__(self, driver, interval: float = DEFAULT_INTERVAL):
+        """
+        Initialize ResourceSampler.
+
+        Args:
+            driver: Local Chrome WebDriver (remote sessions cannot be sampled)
+            interval: Seconds between samples
+        """
+        self.driver = driver
+        self.interval = interval
+        self.pid = driver_pid(driver)
+        self.rss: List[float] = []
+        self.cpu: List[float] = []
+        self.max_processes = 0
+        self._processes: Dict[int, psutil.Process] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._heap_start: Optional[float] = None
+
+    @property
+    def available(self) -> bool:
+        return self.pid is not None
+
+    def start(self) -> "ResourceSampler":
+        """Read the starting JS heap and start sampling."""
+        if not self.available:
+            return self
+        self._heap_start = js_heap_mb(self.driver)
+        self._refresh_tree()
+        self._thread = threading.Thread(target=self._run, name="resource-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> Optional[ResourceUsage]:
+        """
+        Stop sampling and read the final JS heap.
+
+        Returns:
+            Optional[ResourceUsage]: Usage summary, None when nothing could be sampled
+        """
+        if self._thread is None:
+            return None
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        if not self.rss:
+            return None
+        heap = js_heap_mb(self.driver)
+        return ResourceUsage(
+            samples=len(self.rss),
+            peak_rss_mb=max(self.rss),
+            avg_rss_mb=sum(self.rss) / len(self.rss),
+            peak_cpu_pct=max(self.cpu),
+            avg_cpu_pct=sum(self.cpu) / len(self.cpu),
+            processes=self.max_processes,
+            js_heap_mb=heap,
+            js_heap_delta_mb=heap - self._heap_start if heap is not None and self._heap_start is not None else None,
+        )
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def _refresh_tree(self) -> None:
+        """Track new renderer/GPU processes; cached Process objects keep their CPU counters."""
+        try:
+            root = psutil.Process(self.pid)
+            current = [root] + root.children(recursive=True)
+        except psutil.Error:
+            self._processes = {}
+            return
+        known = self._processes
+        self._processes = {}
+        for process in current:
+            if process.pid in known:
+                self._processes[process.pid] = known[process.pid]
+            else:
+                try:
+                    process.cpu_percent(None)  # first call only primes the counter
+                except psutil.Error:
+                    continue
+                self._processes[process.pid] = process
+
+    def _sample(self) -> None:
+        self._refresh_tree()
+        rss = cpu = 0.0
+        for process in list(self._processes.values()):
+            try:
+                with process.oneshot():
+                    rss += process.memory_info().rss
+                    cpu += process.cpu_percent(None)
+            except psutil.Error:
+                continue
+        if self._processes:
+            self.rss.append(rss / _MB)
+            self.cpu.append(cpu)
+            self.max_processes = max(self.max_processes, len(self._processes))
+
+
+class LeakTracker:
+    """Idle RSS history of pooled sessions, keyed by chromedriver PID."""
+
+    def __init__(self, window: int = LEAK_WINDOW, min_growth_mb: float = LEAK_MIN_GROWTH_MB):
+        """
+        Initialize LeakTracker.
+
+        Args:
+            window: Consecutive idle measurements that must keep growing
+            min_growth_mb: Growth over the window needed to call it a leak
+        """
+        self.window = window
+        self.min_growth_mb = min_growth_mb
+        self.history: Dict[int, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def record_idle(self, pid: int) -> Optional[float]:
+        """
+        Measure a session's idle RSS between tests.
+
+        Returns:
+            Optional[float]: RSS in MB, None when the session has been quit
+        """
+        rss = tree_rss_mb(pid)
+        with self._lock:
+            if rss is None:
+                self.history.pop(pid, None)
+                return None
+            history = self.history.setdefault(pid, [])
+            history.append(rss)
+            del history[:-self.window]
+        return rss
+
+    def is_leaking(self, pid: Optional[int]) -> bool:
+        """True when the last ``window`` idle measurements all grew and grew enough in total."""
+        with self._lock:
+            history = list(self.history.get(pid, ()))
+        if len(history) < self.window:
+            return False
+        growing = all(later > earlier for earlier, later in zip(history, history[1:]))
+        return growing and history[-1] - history[0] >= self.min_growth_mb
+
+    def growth_mb(self, pid: Optional[int]) -> float:
+        with self._lock:
+            history = self.history.get(pid, ())
+            return history[-1] - history[0] if len(history) > 1 else 0.0
+
+    def forget(self, pid: Optional[int]) -> None:
+        with self._lock:
+            self.history.pop(pid, None)
+
+
+_leak_tracker = LeakTracker()
+
+
+def get_leak_tracker() -> LeakTracker:
+    """Process-wide leak tracker."""
+    return _leak_tracker
+
+
+def leak_suspected(driver) -> bool:
+    """
+    True when the driver's pooled session keeps growing in memory across
+    tests. The caller retires a flagged session, so its history is dropped.
+    """
+    pid = driver_pid(driver)
+    if not _leak_tracker.is_leaking(pid):
+        return False
+    _leak_tracker.forget(pid)
+    return True
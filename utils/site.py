@@ -0,0 +1,46 @@
+"""
+Target site origin.
+
+Page objects keep the production URLs as constants; every navigation goes
+through ``site_url`` which moves them onto the configured origin. Set
+``N11_BASE_URL`` (or call ``set_base_url``) to run the same flows against
+a staging deployment or a local stand-in server.
+"""
+import os
+
+PRODUCTION_BASE_URL = "https://www.n11.com"
+
+_base_url = os.environ.get("N11_BASE_URL", PRODUCTION_BASE_URL).rstrip("/")
+
+
+def get_base_url() -> str:
+    """Origin all navigations are sent to."""
+    return _base_url
+
+
+def set_base_url(url: str) -> None:
+    """
+    Point page objects and helpers at another origin.
+
+    Args:
+        url: Origin such as "http://127.0.0.1:8012"
+    """
+    global _base_url
+    _base_url = url.rstrip("/")
+
+
+def site_url(url: str) -> str:
+    """
+    Move a production URL or a site path onto the configured origin.
+
+    Args:
+        url: Production URL ("https://www.n11.com/...") or path ("/magazalar")
+
+    Returns:
+        str: URL on the configured origin (other URLs are returned unchanged)
+    """
+    if url.startswith("/"):
+        return _base_url + url
+    if url.startswith(PRODUCTION_BASE_URL):
+        return _base_url + url[len(PRODUCTION_BASE_URL):]
+    return url
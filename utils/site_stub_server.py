@@ -0,0 +1,152 @@
+"""
+Local stand-in for the n11 pages the journeys use.
+
+Serves a home page with the search form, search/store result listings,
+the store directory and the cart endpoints of ``utils.cart_stub_server``,
+using the same markup hooks (ids and classes) as the page objects. With
+``--latency-ms`` every response is delayed, so load and monitoring runs
+can be exercised locally:
+
+    python -m utils.site_stub_server --port 8012
+    N11_BASE_URL=http://127.0.0.1:8012 python -m utils.load_runner --users 4
+"""
+import argparse
+import html
+import json
+import time
+from urllib.parse import parse_qs, quote, urlsplit
+
+from utils.cart_api import CartEndpoints
+from utils.cart_stub_server import CartStubServer, _CartHandler
+
+LETTERS = "ABCDEFGHIJKLMNOPRSTUVYZ"
+STORES_PER_LETTER = 30
+PRODUCTS_PER_PAGE = 24
+
+_HOME_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>n11 stand-in</title></head><body>
+<form action="/arama" method="get">
+  <input id="searchData" name="q" autocomplete="off">
+  <button class="searchBtn" type="submit">Ara</button>
+</form>
+</body></html>"""
+
+_RESULT_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title></head><body>
+<div class="resultView"><h1 class="resultText">{title}</h1></div>
+<div class="searchResults"><ul class="productList">{products}</ul></div>
+<div class="items-info" style="display:none">Ürün sepete eklendi</div>
+<script>
+document.querySelectorAll('.btnBasket').forEach(button => button.addEventListener('click', () => {{
+  fetch({add_path}, {{method: 'POST', headers: {{'Content-Type': 'application/json'}},
+                     body: JSON.stringify({{productId: button.dataset.id}})}})
+    .then(() => {{ document.querySelector('.items-info').style.display = 'block'; }});
+}}));
+</script>
+</body></html>"""
+
+_PRODUCT = """<li class="column"><div class="productItem">
+  <a href="/urun/{id}" title="Ürün {id}"><h3 class="productName">Ürün {id}</h3></a>
+  <div class="imgHolder"><span class="cargoBadgeField"><span class="cargoBadgeText">Ücretsiz Kargo</span></span></div>
+  <span class="newPrice"><ins>{price} TL</ins></span>
+  <div class="ratingCont"><span class="rating r80"></span><span class="ratingText">({comments})</span></div>
+  <button class="btnBasket" data-id="{id}">Sepete Ekle</button>
+</div></li>"""
+
+_STORES_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Mağazalar</title></head><body>
+<div class="letters">{letters}</div>
+<div class="tabPanel allSellers"><div class="sellerListHolder"><ul>{stores}</ul></div></div>
+<script>
+document.querySelectorAll('.letters span').forEach(span => span.addEventListener('click', () => {{
+  location.search = '?harf=' + encodeURIComponent(span.dataset.hasSeller);
+}}));
+</script>
+</body></html>"""
+
+
+class _SiteHandler(_CartHandler):
+    server_version = "SiteStub/1.0"
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if url.path == "/":
+            self._html(_HOME_PAGE)
+        elif url.path == "/arama":
+            self._html(self._result_page(query))
+        elif url.path == "/magazalar":
+            self._html(self._stores_page(query.get("harf", LETTERS[0])))
+        else:
+            super().do_GET()
+
+    def do_POST(self):
+        time.sleep(self.server.latency)
+        super().do_POST()
+
+    def _result_page(self, query: dict) -> str:
+        title = query.get("s") or query.get("q") or ""
+        seed = sum(map(ord, title))
+        products = "".join(
+            _PRODUCT.format(
+                id=seed * 100 + i,
+                price=f"{(seed % 90 + 10) * (i + 1)},90",
+                comments=(PRODUCTS_PER_PAGE - i) * 7,
+            )
+            for i in range(PRODUCTS_PER_PAGE)
+        )
+        return _RESULT_PAGE.format(title=html.escape(title), products=products,
+                                   add_path=json.dumps(self.server.endpoints.add))
+
+    def _stores_page(self, letter: str) -> str:
+        letters = "".join(f'<span data-has-seller="{l}">{l}</span>' for l in LETTERS)
+        stores = "".join(
+            f'<li><a href="/arama?s={quote(name)}" title="{name}">{name}</a></li>'
+            for name in (f"{letter.lower()}magaza{i}" for i in range(1, STORES_PER_LETTER + 1))
+        )
+        return _STORES_PAGE.format(letters=letters, stores=stores)
+
+    def _html(self, body: str) -> None:
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class SiteStubServer(CartStubServer):
+    """Threaded stand-in for the journey pages plus the cart endpoints."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, endpoints: CartEndpoints = None,
+                 latency_ms: float = 0):
+        """
+        Initialize SiteStubServer.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0: any free port)
+            endpoints: Cart endpoint paths to serve (default: STUB_ENDPOINTS)
+            latency_ms: Artificial delay added to every response
+        """
+        super().__init__(host, port, endpoints)
+        self.httpd.RequestHandlerClass = _SiteHandler
+        self.httpd.latency = latency_ms / 1000.0
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Serve a local stand-in of the n11 journey pages")
+    parser.add_argument("--port", type=int, default=8012)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    args = parser.parse_args(argv)
+    server = SiteStubServer(port=args.port, latency_ms=args.latency_ms)
+    print(f"🏪 Site stub listening on {server.base_url}", flush=True)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
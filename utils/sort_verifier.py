@@ -0,0 +1,91 @@
+"""
+Multi-page sort-order verification.
+
+Checks that a stream of ``ProductCard`` batches is ordered by one field
+(ascending or descending) over the first N cards. Cards are read in
+batches by ``SearchResultPage.iter_product_batches`` so the comparison
+itself never touches WebDriver; the check stops at the first violation,
+which also stops the stream from loading further pages.
+"""
+import logging
+import operator
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+from pages.product_card import ProductCard
+
+SORTABLE_FIELDS = ("price", "rating", "comment_count")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SortViolation:
+    """The first adjacent pair that breaks the expected order."""
+
+    field: str
+    previous: ProductCard
+    current: ProductCard
+
+    def __str__(self) -> str:
+        return (
+            f"{self.field}: #{self.previous.position} '{self.previous.title}' = {getattr(self.previous, self.field)} "
+            f"followed by #{self.current.position} '{self.current.title}' = {getattr(self.current, self.field)}"
+        )
+
+
+@dataclass
+class SortCheckResult:
+    """Outcome of a sort check."""
+
+    field: str
+    descending: bool
+    checked: int
+    skipped: int
+    violation: Optional[SortViolation] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.violation is None
+
+
+def check_sort_order(batches: Iterable[List[ProductCard]], field: str, descending: bool = True,
+                     limit: Optional[int] = None) -> SortCheckResult:
+    """
+    Verify that cards are ordered by ``field``; equal values are allowed.
+
+    Cards without a value for the field (e.g. no rating yet) are skipped
+    and counted, the order is checked between the remaining cards.
+
+    Args:
+        batches: Iterable of ProductCard batches
+        field: One of SORTABLE_FIELDS
+        descending: Expect biggest first (default) or smallest first
+        limit: Number of cards to check (default: all)
+
+    Returns:
+        SortCheckResult: Result with the offending pair on failure
+
+    Raises:
+        ValueError: If the field is not sortable
+    """
+    if field not in SORTABLE_FIELDS:
+        raise ValueError(f"Unsupported sort field '{field}', expected one of {SORTABLE_FIELDS}")
+
+    in_order = operator.ge if descending else operator.le
+    result = SortCheckResult(field=field, descending=descending, checked=0, skipped=0)
+    previous = None
+    for batch in batches:
+        for card in batch:
+            if limit is not None and result.checked + result.skipped >= limit:
+                return result
+            value = getattr(card, field)
+            if value is None:
+                result.skipped += 1
+                continue
+            result.checked += 1
+            if previous is not None and not in_order(getattr(previous, field), value):
+                result.violation = SortViolation(field, previous, card)
+                return result
+            previous = card
+    return result
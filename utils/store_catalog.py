@@ -0,0 +1,283 @@
+"""
+Store directory crawler and persistent store catalog.
+
+The crawler walks every letter of the stores page (``.letters
+span[data-has-seller]``) on several pooled browsers at once and stores
+name, URL and letter of every store in a JSON catalog indexed by letter.
+Random store selection and lookups are then served from the catalog in
+O(1); the live site is only touched to confirm the chosen store.
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional
+
+from utils.browser_pool import BrowserPool
+
+DEFAULT_CATALOG_FILE = "reports/store_catalog.json"
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_WORKERS = 4
+
+
+class StoreCatalog:
+    """Persistent store catalog indexed by letter and by store name."""
+
+    def __init__(self, catalog_file: str = DEFAULT_CATALOG_FILE, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        """
+        Initialize StoreCatalog.
+
+        Args:
+            catalog_file: JSON file the catalog is loaded from and saved to
+            ttl_seconds: Age after which a letter's stores are considered stale
+        """
+        self.catalog_file = catalog_file
+        self.ttl_seconds = ttl_seconds
+        self.logger = logging.getLogger(__name__)
+        self.letters: Dict[str, dict] = {}
+        # Several stores may share a name; each name keeps all of them
+        self._by_name: Dict[str, List[dict]] = {}
+        self.load()
+
+    # ------------------
+    # Persistence
+    # ------------------
+    def load(self) -> None:
+        """Load the catalog from disk (missing or broken files start empty)."""
+        try:
+            if os.path.exists(self.catalog_file):
+                with open(self.catalog_file, 'r', encoding='utf-8') as f:
+                    self.letters = json.load(f).get("letters", {})
+        except Exception as e:
+            self.logger.warning(f"Could not load store catalog: {e}")
+            self.letters = {}
+        self._reindex()
+
+    def save(self) -> None:
+        """Write the catalog to disk."""
+        os.makedirs(os.path.dirname(self.catalog_file) or '.', exist_ok=True)
+        with open(self.catalog_file, 'w', encoding='utf-8') as f:
+            json.dump({"letters": self.letters}, f, ensure_ascii=False, indent=2)
+        total = sum(len(entry["stores"]) for entry in self.letters.values())
+        self.logger.info(f"Store catalog saved: {self.catalog_file} ({total} stores)")
+
+    def _reindex(self) -> None:
+        self._by_name = {}
+        for entry in self.letters.values():
+            self._index(entry["stores"])
+
+    def _index(self, stores: List[dict]) -> None:
+        for store in stores:
+            self._by_name.setdefault(store["name"], []).append(store)
+
+    def _unindex(self, stores: List[dict]) -> None:
+        for store in stores:
+            named = self._by_name.get(store["name"], [])
+            named[:] = [other for other in named if other is not store]
+            if not named:
+                self._by_name.pop(store["name"], None)
+
+    # ------------------
+    # Updates
+    # ------------------
+    def put_letter(self, letter: str, stores: List[dict]) -> None:
+        """
+        Replace the stores of one letter.
+
+        Args:
+            letter: Directory letter
+            stores: Records with name, url, letter and index
+        """
+        self._unindex(self.stores(letter))
+        self.letters[letter] = {"fetched_at": time.time(), "stores": stores}
+        self._index(stores)
+
+    # ------------------
+    # Queries
+    # ------------------
+    def is_fresh(self, letter: str) -> bool:
+        """True when the letter was crawled within the TTL."""
+        entry = self.letters.get(letter)
+        return bool(entry) and time.time() - entry["fetched_at"] < self.ttl_seconds
+
+    def stale_letters(self, letters: Iterable[str]) -> List[str]:
+        """Letters that are missing or older than the TTL."""
+        return [letter for letter in letters if not self.is_fresh(letter)]
+
+    def stores(self, letter: str) -> List[dict]:
+        """All catalogued stores of a letter (empty when unknown)."""
+        return self.letters.get(letter, {}).get("stores", [])
+
+    def count(self, letter: str) -> int:
+        """Number of catalogued stores for a letter."""
+        return len(self.stores(letter))
+
+    def get(self, name: str) -> Optional[dict]:
+        """Look up a store by (lower-case) name; the first one when several share it."""
+        named = self._by_name.get(name.lower())
+        return named[0] if named else None
+
+    def find(self, name: str) -> List[dict]:
+        """All stores with the given (lower-case) name."""
+        return list(self._by_name.get(name.lower(), []))
+
+    def random_store(self, letter: str) -> dict:
+        """
+        Pick a random store of a letter.
+
+        Raises:
+            LookupError: If the letter has no fresh stores in the catalog
+        """
+        if not self.is_fresh(letter):
+            raise LookupError(f"No fresh catalog entry for letter '{letter}', crawl it first")
+        stores = self.stores(letter)
+        if not stores:
+            raise LookupError(f"No stores catalogued for letter '{letter}'")
+        return random.choice(stores)
+
+
+class StoreCrawler:
+    """Crawls the store directory letter by letter on pooled browsers."""
+
+    def __init__(self, pool: Optional[BrowserPool] = None, workers: int = DEFAULT_WORKERS):
+        """
+        Initialize StoreCrawler.
+
+        Args:
+            pool: Browser pool to take browsers from (default: new headless pool)
+            workers: Number of letters fetched concurrently
+        """
+        self.workers = workers
+        self.pool = pool
+        self.logger = logging.getLogger(__name__)
+
+    def _get_pool(self) -> BrowserPool:
+        if self.pool is None:
+            from utils.driver_factory import create_driver
+            self.pool = BrowserPool(factory=lambda: create_driver(headless=True), max_idle=self.workers)
+        return self.pool
+
+    def list_letters(self) -> List[str]:
+        """Read the available letters from the live stores page."""
+        from pages.stores_page import StoresPage
+        pool = self._get_pool()
+        driver = pool.acquire()
+        try:
+            return StoresPage(driver).get_available_letters()
+        finally:
+            pool.release(driver)
+
+    def fetch_letter(self, letter: str) -> List[dict]:
+        """Open the stores page, filter by ``letter`` and stream all store records."""
+        from pages.stores_page import StoresPage
+        pool = self._get_pool()
+        driver = pool.acquire()
+        healthy = True
+        try:
+            stores_page = StoresPage(driver)
+            stores_page.click_letter(letter)
+            # Streamed so lazily loaded rows and later list pages are included
+            return [store for batch in stores_page.iter_store_batches(letter) for store in batch]
+        except Exception:
+            healthy = False
+            raise
+        finally:
+            pool.release(driver, reusable=healthy)
+
+    def crawl(self, catalog: StoreCatalog, letters: Optional[List[str]] = None, force: bool = False) -> Dict[str, int]:
+        """
+        Crawl letters concurrently into the catalog and save it.
+
+        Args:
+            catalog: Catalog to fill
+            letters: Letters to crawl (default: all letters on the page)
+            force: Re-crawl letters that are still fresh
+
+        Returns:
+            Dict[str, int]: Letter -> number of stores fetched (-1 on failure)
+        """
+        letters = letters or self.list_letters()
+        todo = letters if force else catalog.stale_letters(letters)
+        self.logger.info(f"🕷️ Crawling {len(todo)} of {len(letters)} letters with {self.workers} workers")
+
+        results = {}
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self.fetch_letter, letter): letter for letter in todo}
+            for future in as_completed(futures):
+                letter = futures[future]
+                try:
+                    stores = future.result()
+                    catalog.put_letter(letter, stores)
+                    results[letter] = len(stores)
+                    self.logger.info(f"✅ Letter '{letter}': {len(stores)} stores")
+                except Exception as e:
+                    results[letter] = -1
+                    self.logger.error(f"❌ Letter '{letter}' failed: {e}")
+
+        catalog.save()
+        self.logger.info(f"Crawl finished in {time.monotonic() - started:.1f}s")
+        return results
+
+    def close(self) -> None:
+        """Quit the crawler's browsers."""
+        if self.pool is not None:
+            self.pool.close_all()
+
+
+def open_and_confirm(driver, store: dict):
+    """
+    Open a catalogued store and confirm it against the live page.
+
+    Args:
+        driver: WebDriver instance
+        store: Catalog record (name, url, ...)
+
+    Returns:
+        Tuple[SearchResultPage, bool]: Store result page and whether the
+        result text contains the store name
+    """
+    from pages.search_result_page import SearchResultPage
+    result_page = SearchResultPage.open(driver, store["url"])
+    return result_page, confirm_store_page(result_page, store)
+
+
+def confirm_store_page(result_page, store: dict) -> bool:
+    """
+    Confirm a loaded store result page against its catalog record.
+
+    Args:
+        result_page: SearchResultPage on the store's result URL
+        store: Catalog record (name, url, ...)
+
+    Returns:
+        bool: Whether the result text contains the store name
+    """
+    result_page.wait_for_store_page_load()
+    return store["name"].lower() in result_page.get_result_text().lower()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Crawl the n11 store directory into a local catalog")
+    parser.add_argument("--letters", default="", help="comma separated letters (default: all)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--catalog", default=DEFAULT_CATALOG_FILE)
+    parser.add_argument("--ttl", type=float, default=DEFAULT_TTL_SECONDS, help="seconds before a letter is re-crawled")
+    parser.add_argument("--force", action="store_true", help="re-crawl fresh letters too")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    catalog = StoreCatalog(args.catalog, ttl_seconds=args.ttl)
+    crawler = StoreCrawler(workers=args.workers)
+    try:
+        letters = [l.strip() for l in args.letters.split(",") if l.strip()] or None
+        crawler.crawl(catalog, letters, force=args.force)
+    finally:
+        crawler.close()
+
+
+if __name__ == "__main__":
+    main()
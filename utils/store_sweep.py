@@ -0,0 +1,311 @@
+"""
+Parallel store-page smoke sweep.
+
+Checks every catalogued store of one or more letters (or a stratified
+sample) against its ``arama?s=`` result page on a pool of browsers.
+With ``--tabs K`` every browser keeps K tabs loading at once
+(``utils.tab_fanout``), so fewer browsers reach the same throughput.
+Results are streamed as they finish and a summary with throughput
+(stores per minute) and the failures is produced at the end.
+"""
+import argparse
+import logging
+import math
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional
+
+from utils.browser_pool import BrowserPool
+from utils.store_catalog import (
+    DEFAULT_CATALOG_FILE,
+    StoreCatalog,
+    StoreCrawler,
+    confirm_store_page,
+    open_and_confirm,
+)
+from utils.tab_fanout import TabFanout, TabTask
+
+DEFAULT_CONCURRENCY = 4
+
+
+def select_stores(catalog: StoreCatalog, letters: List[str], sample: Optional[int] = None,
+                  seed: Optional[int] = None) -> List[dict]:
+    """
+    Pick the stores to sweep.
+
+    Without ``sample`` every store of the letters is returned. With
+    ``sample`` each letter gets a quota in proportion to its size (largest
+    remainder, at least one per non-empty letter while the sample allows)
+    and its stores are drawn at random.
+
+    Args:
+        catalog: Store catalog
+        letters: Letters to sweep
+        sample: Optional total number of stores
+        seed: Random seed for reproducible samples
+
+    Returns:
+        List[dict]: Store records
+    """
+    per_letter = {letter: catalog.stores(letter) for letter in letters}
+    if sample is None:
+        return [store for stores in per_letter.values() for store in stores]
+
+    rng = random.Random(seed)
+    per_letter = {letter: stores for letter, stores in per_letter.items() if stores}
+    total = sum(len(stores) for stores in per_letter.values())
+    sample = min(sample, total)
+    if not sample:
+        return []
+    exact = {letter: sample * len(stores) / total for letter, stores in per_letter.items()}
+    quotas = {letter: math.floor(share) for letter, share in exact.items()}
+    by_remainder = sorted(exact, key=lambda letter: (quotas[letter] - exact[letter], letter))
+    for letter in by_remainder[:sample - sum(quotas.values())]:
+        quotas[letter] += 1
+    # Small letters get one store each, taken from the largest quotas
+    for letter in [letter for letter in per_letter if not quotas[letter]]:
+        donor = max(quotas, key=lambda other: (quotas[other], other))
+        if quotas[donor] <= 1:
+            break
+        quotas[donor] -= 1
+        quotas[letter] = 1
+    selected = []
+    for letter, stores in per_letter.items():
+        selected.extend(rng.sample(stores, quotas[letter]))
+    return selected
+
+
+class StoreSweep:
+    """Runs store smoke checks concurrently on pooled browsers."""
+
+    def __init__(self, pool: Optional[BrowserPool] = None, concurrency: int = DEFAULT_CONCURRENCY,
+                 tabs: int = 1):
+        """
+        Initialize StoreSweep.
+
+        Args:
+            pool: Browser pool (default: new headless pool)
+            concurrency: Number of browsers checking stores at the same time
+            tabs: Tabs per browser; above 1 each browser fans its stores out over tabs
+        """
+        self.concurrency = concurrency
+        self.tabs = tabs
+        self.pool = pool
+        self.logger = logging.getLogger(__name__)
+        self.summary: Dict = {}
+
+    def _get_pool(self) -> BrowserPool:
+        if self.pool is None:
+            from utils.driver_factory import create_driver
+            self.pool = BrowserPool(factory=lambda: create_driver(headless=True), max_idle=self.concurrency)
+        return self.pool
+
+    def check_store(self, store: dict) -> dict:
+        """
+        Open one store and verify its result page.
+
+        Args:
+            store: Catalog record
+
+        Returns:
+            dict: name, url, ok, error and duration of the check
+        """
+        pool = self._get_pool()
+        driver = pool.acquire()
+        started = time.monotonic()
+        result = {"name": store["name"], "url": store["url"], "ok": False, "error": ""}
+        healthy = True
+        try:
+            result_page, confirmed = open_and_confirm(driver, store)
+            result.update(self._verdict(result_page, confirmed))
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}".splitlines()[0]
+            healthy = BrowserPool.is_healthy(driver)
+        finally:
+            pool.release(driver, reusable=healthy)
+        result["duration"] = time.monotonic() - started
+        return result
+
+    @staticmethod
+    def _verdict(result_page, confirmed: bool) -> dict:
+        """ok/error of a store whose result page is loaded."""
+        visible = result_page.verify_result_view_element()
+        if not confirmed:
+            return {"ok": False, "error": "store name not in result text"}
+        if not visible:
+            return {"ok": False, "error": "result view not visible"}
+        return {"ok": True, "error": ""}
+
+    def check_stores_in_tabs(self, stores: List[dict]) -> Iterator[dict]:
+        """
+        Check stores on one pooled browser, fanned out over ``self.tabs`` tabs.
+
+        Args:
+            stores: Store records
+
+        Yields:
+            dict: name, url, ok, error and duration of each check
+        """
+        from pages.search_result_page import SearchResultPage
+
+        def inspect(store):
+            def run(driver):
+                result_page = SearchResultPage(driver)
+                return self._verdict(result_page, confirm_store_page(result_page, store))
+            return run
+
+        by_url = {store["url"]: store for store in stores}
+        reported = set()
+        driver = None
+        healthy = True
+        try:
+            pool = self._get_pool()
+            driver = pool.acquire()
+            with TabFanout(driver, tabs=self.tabs) as fanout:
+                tasks = [TabTask(store["url"], store["url"], inspect(store)) for store in stores]
+                for tab_result in fanout.run(tasks):
+                    store = by_url[tab_result.key]
+                    reported.add(tab_result.key)
+                    result = {"name": store["name"], "url": store["url"], "duration": tab_result.duration}
+                    result.update(tab_result.value if tab_result.ok else {"ok": False, "error": tab_result.error})
+                    yield result
+        except Exception as e:
+            # The browser itself failed (or never started); report the stores it never got to
+            healthy = driver is not None and BrowserPool.is_healthy(driver)
+            error = f"{type(e).__name__}: {e}".splitlines()[0]
+            for store in stores:
+                if store["url"] not in reported:
+                    yield {"name": store["name"], "url": store["url"], "ok": False, "error": error, "duration": 0.0}
+        finally:
+            if driver is not None:
+                self.pool.release(driver, reusable=healthy)
+
+    def _sweep_tabs(self, stores: List[dict]) -> Iterator[dict]:
+        """Run ``check_stores_in_tabs`` on ``self.concurrency`` browsers, merging their results."""
+        chunks = [stores[i::self.concurrency] for i in range(self.concurrency)]
+        chunks = [chunk for chunk in chunks if chunk]
+        results: "queue.Queue" = queue.Queue()
+        stop = threading.Event()
+
+        def run(chunk):
+            try:
+                for result in self.check_stores_in_tabs(chunk):
+                    results.put(result)
+                    # Closing the generator releases the browser and its tabs
+                    if stop.is_set():
+                        break
+            finally:
+                results.put(None)
+
+        executor = ThreadPoolExecutor(max_workers=max(1, len(chunks)))
+        try:
+            futures = [executor.submit(run, chunk) for chunk in chunks]
+            finished = 0
+            while finished < len(chunks):
+                result = results.get()
+                if result is None:
+                    finished += 1
+                else:
+                    yield result
+            # Errors outside the per-store handling must not end as a silently empty sweep
+            for future in futures:
+                future.result()
+        finally:
+            # A consumer that stops early only waits for the tab results in flight
+            stop.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def sweep(self, stores: List[dict]) -> Iterator[dict]:
+        """
+        Check stores concurrently, yielding each result as soon as it finishes.
+
+        ``self.summary`` holds totals, throughput and failures once the
+        generator is exhausted.
+
+        Args:
+            stores: Store records to check
+
+        Yields:
+            dict: Result of one store check
+        """
+        started = time.monotonic()
+        failures = []
+        checked = 0
+        for result in self._results(stores):
+            checked += 1
+            if not result["ok"]:
+                failures.append(result)
+            yield result
+
+        elapsed = time.monotonic() - started
+        self.summary = {
+            "checked": checked,
+            "failed": len(failures),
+            "elapsed_s": round(elapsed, 1),
+            "stores_per_min": round(60.0 * checked / elapsed, 1) if elapsed else 0.0,
+            "concurrency": self.concurrency,
+            "tabs": self.tabs,
+            "failures": failures,
+        }
+        self.logger.info(
+            f"📊 Sweep: {checked} stores, {len(failures)} failed, "
+            f"{self.summary['stores_per_min']} stores/min with concurrency {self.concurrency} x {self.tabs} tabs"
+        )
+
+    def _results(self, stores: List[dict]) -> Iterator[dict]:
+        if self.tabs > 1:
+            yield from self._sweep_tabs(stores)
+            return
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        try:
+            futures = [executor.submit(self.check_store, store) for store in stores]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # A consumer that stops early only waits for the checks already running
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def close(self) -> None:
+        """Quit the sweep's browsers."""
+        if self.pool is not None:
+            self.pool.close_all()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Smoke-check catalogued stores in parallel")
+    parser.add_argument("--letters", default="S", help="comma separated letters to sweep")
+    parser.add_argument("--sample", type=int, default=None, help="stratified sample size (default: all stores)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="browsers")
+    parser.add_argument("--tabs", type=int, default=1, help="tabs per browser")
+    parser.add_argument("--catalog", default=DEFAULT_CATALOG_FILE)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    letters = [l.strip() for l in args.letters.split(",") if l.strip()]
+    catalog = StoreCatalog(args.catalog)
+    sweep = StoreSweep(concurrency=args.concurrency, tabs=args.tabs)
+    try:
+        stale = catalog.stale_letters(letters)
+        if stale:
+            StoreCrawler(pool=sweep._get_pool(), workers=args.concurrency).crawl(catalog, stale)
+        stores = select_stores(catalog, letters, args.sample, args.seed)
+        for result in sweep.sweep(stores):
+            status = "✅" if result["ok"] else "❌"
+            print(f"{status} {result['name']} ({result['duration']:.1f}s) {result['error']}", flush=True)
+    finally:
+        sweep.close()
+
+    from simple_report import SimpleReporter
+    summary = dict(sweep.summary)
+    failures = summary.pop("failures", [])
+    summary["failed_stores"] = ", ".join(f["name"] for f in failures)
+    SimpleReporter().set_stat("Store sweep", ",".join(letters), summary)
+    print(f"📊 {summary['checked']} stores, {summary['failed']} failed, {summary['stores_per_min']} stores/min")
+
+
+if __name__ == "__main__":
+    main()
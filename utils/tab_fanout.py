@@ -0,0 +1,266 @@
+"""
+Multi-tab fan-out inside one WebDriver session.
+
+Read-heavy checks (store pages, product pages, keyword searches) spend most
+of their time waiting for navigations. ``TabFanout`` keeps K tabs of one
+browser busy: a tab's navigation is started without blocking
+(``location.assign``), so while one tab is being inspected the others are
+loading. Tasks are independent ``TabTask``s (a URL plus a page-object
+inspection run on the loaded document); results are yielded as they
+finish.
+
+A failing inspection only fails its own task. A tab that crashes, hangs
+past the timeout or gets closed is replaced by a new tab, and the other
+tabs carry on.
+"""
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Optional
+
+from selenium.common.exceptions import NoSuchWindowException, WebDriverException
+
+from utils.dom_snapshot import invalidate_snapshot
+from utils.site import site_url
+
+DEFAULT_TABS = 4
+DEFAULT_PAGE_TIMEOUT = 30.0
+POLL_INTERVAL = 0.05
+
+# The pending flag lives on the old document; a new, fully loaded document no longer has it.
+# A URL that differs from the current one only by its fragment would be a same-document
+# navigation (no load, the flag would never clear), so it is loaded with a reload instead.
+_START_NAVIGATION_SCRIPT = """
+const target = new URL(arguments[0], location.href);
+const sameDocument = target.hash !== '' && target.href.split('#')[0] === location.href.split('#')[0];
+window.__tabFanoutPending = true;
+if (sameDocument) {
+    history.replaceState(history.state, '', target.href);
+    location.reload();
+} else {
+    location.assign(target.href);
+}
+"""
+_READY_SCRIPT = "return !window.__tabFanoutPending && document.readyState === 'complete';"
+
+
+@dataclass
+class TabTask:
+    """One independent check: load ``url`` in a tab, then run ``inspect(driver)`` on it."""
+
+    key: str
+    url: str
+    inspect: Callable[[Any], Any]
+
+
+@dataclass
+class TabResult:
+    """Outcome of a TabTask."""
+
+    key: str
+    value: Any = None
+    error: Optional[str] = None
+    duration: float = 0.0
+    tab: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class _Tab:
+    index: int
+    handle: str
+    task: Optional[TabTask] = None
+    started: float = 0.0
+
+
+class TabFanout:
+    """Runs TabTasks across K tabs of one WebDriver session."""
+
+    def __init__(self, driver, tabs: int = DEFAULT_TABS, page_timeout: float = DEFAULT_PAGE_TIMEOUT):
+        """
+        Initialize TabFanout.
+
+        Args:
+            driver: WebDriver instance (its current tab is used as the first tab)
+            tabs: Number of tabs kept busy
+            page_timeout: Seconds a navigation may take before its task fails
+        """
+        self.driver = driver
+        self.tab_count = max(1, tabs)
+        self.page_timeout = page_timeout
+        self.logger = logging.getLogger(__name__)
+        self.tabs: List[_Tab] = []
+        self.home_handle: Optional[str] = None
+        self._current: Optional[str] = None
+
+    # ------------------
+    # Tab lifecycle
+    # ------------------
+    def open(self) -> "TabFanout":
+        """Open the extra tabs."""
+        self.home_handle = self.driver.current_window_handle
+        self._current = self.home_handle
+        self.tabs = [_Tab(0, self.home_handle)]
+        for index in range(1, self.tab_count):
+            self.tabs.append(_Tab(index, self._new_tab()))
+        return self
+
+    def close(self) -> None:
+        """Close the extra tabs and return to the original one."""
+        for tab in self.tabs:
+            if tab.handle == self.home_handle:
+                continue
+            try:
+                self._switch(tab.handle)
+                self.driver.close()
+            except WebDriverException:
+                pass
+        self.tabs = []
+        if self.home_handle is not None:
+            try:
+                self._switch(self.home_handle)
+            except WebDriverException as e:
+                self.logger.warning(f"Could not return to the original tab: {e}")
+
+    def __enter__(self) -> "TabFanout":
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _new_tab(self) -> str:
+        self.driver.switch_to.new_window("tab")
+        self._current = self.driver.current_window_handle
+        self._page_changed()
+        return self._current
+
+    def _switch(self, handle: str) -> None:
+        if handle != self._current:
+            self.driver.switch_to.window(handle)
+            self._current = handle
+            self._page_changed()
+
+    def _page_changed(self) -> None:
+        """Snapshots are per driver; another tab is another page."""
+        invalidate_snapshot(self.driver)
+
+    def _replace_tab(self, tab: _Tab) -> None:
+        """Throw away a broken tab and open a fresh one in its place."""
+        try:
+            self._switch(tab.handle)
+            self.driver.close()
+        except WebDriverException:
+            pass
+        self._current = None
+        if tab.handle == self.home_handle:
+            self.home_handle = None
+        # New tabs are opened from a live window
+        for other in self.tabs:
+            if other is not tab:
+                try:
+                    self._switch(other.handle)
+                    break
+                except WebDriverException:
+                    continue
+        tab.handle = self._new_tab()
+        if self.home_handle is None:
+            self.home_handle = tab.handle
+        self.logger.warning(f"🔁 Replaced tab {tab.index}")
+
+    # ------------------
+    # Scheduling
+    # ------------------
+    def _start(self, tab: _Tab, task: TabTask) -> None:
+        """Start the task's navigation in the tab without waiting for it."""
+        tab.task = task
+        tab.started = time.monotonic()
+        self._switch(tab.handle)
+        self.driver.execute_script(_START_NAVIGATION_SCRIPT, site_url(task.url))
+
+    def _is_ready(self, tab: _Tab) -> bool:
+        self._switch(tab.handle)
+        return bool(self.driver.execute_script(_READY_SCRIPT))
+
+    def _finish(self, tab: _Tab, value: Any = None, error: Optional[str] = None) -> TabResult:
+        task = tab.task
+        tab.task = None
+        return TabResult(task.key, value, error, time.monotonic() - tab.started, tab.index)
+
+    def run(self, tasks: Iterable[TabTask]) -> Iterator[TabResult]:
+        """
+        Run tasks across the tabs, yielding each result as soon as it finishes.
+
+        Args:
+            tasks: Independent tasks
+
+        Yields:
+            TabResult: Result of one task (errors are captured, never raised)
+        """
+        if not self.tabs:
+            self.open()
+        queue: Deque[TabTask] = deque(tasks)
+        while queue or any(tab.task for tab in self.tabs):
+            progressed = False
+            for tab in self.tabs:
+                if tab.task is None:
+                    if not queue:
+                        continue
+                    result = self._start_safely(tab, queue.popleft())
+                    progressed = True
+                    if result is not None:
+                        yield result
+                    continue
+                result = self._poll(tab)
+                if result is None:
+                    continue
+                progressed = True
+                yield result
+                # Refill the tab straight away so it loads while the others are inspected
+                if queue:
+                    result = self._start_safely(tab, queue.popleft())
+                    if result is not None:
+                        yield result
+            if not progressed:
+                time.sleep(POLL_INTERVAL)
+
+    def _start_safely(self, tab: _Tab, task: TabTask) -> Optional[TabResult]:
+        try:
+            self._start(tab, task)
+            return None
+        except WebDriverException as e:
+            tab.task, tab.started = task, time.monotonic()
+            result = self._finish(tab, error=f"navigation failed: {type(e).__name__}: {str(e).splitlines()[0]}")
+            self._replace_tab(tab)
+            return result
+
+    def _poll(self, tab: _Tab) -> Optional[TabResult]:
+        """Inspect the tab if its page has loaded; None while it is still loading."""
+        try:
+            ready = self._is_ready(tab)
+        except NoSuchWindowException:
+            result = self._finish(tab, error="tab was closed")
+            self._replace_tab(tab)
+            return result
+        except WebDriverException:
+            # Mid-navigation script failures are transient; the timeout below catches hangs
+            ready = False
+        if not ready:
+            if time.monotonic() - tab.started <= self.page_timeout:
+                return None
+            result = self._finish(tab, error=f"page did not load in {self.page_timeout:.0f}s")
+            self._replace_tab(tab)
+            return result
+        try:
+            value = tab.task.inspect(self.driver)
+            return self._finish(tab, value=value)
+        except NoSuchWindowException:
+            result = self._finish(tab, error="tab was closed")
+            self._replace_tab(tab)
+            return result
+        except Exception as e:
+            message = str(e).splitlines()[0] if str(e) else ""
+            return self._finish(tab, error=f"{type(e).__name__}: {message}")
@@ -0,0 +1,85 @@
+"""
+Network and CPU throttling profiles.
+
+Named constrained-client profiles applied to a Chrome session through CDP
+(``Network.emulateNetworkConditions`` and ``Emulation.setCPUThrottlingRate``).
+The network profiles use Chrome DevTools' presets (``NetworkManager``):
+latency and throughputs already include DevTools' adjustment factors, and
+kbps means 1000 bits per second. ``none`` is the unthrottled baseline,
+useful as the first profile of a comparison run.
+"""
+import logging
+from dataclasses import dataclass
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ThrottleProfile:
+    """Network latency/throughput limits and CPU slowdown of an emulated client."""
+
+    name: str
+    latency_ms: float = 0
+    download_kbps: float = -1  # -1: no limit
+    upload_kbps: float = -1
+    cpu_rate: float = 1  # 4: four times slower CPU
+
+    @property
+    def throttles_network(self) -> bool:
+        return self.latency_ms > 0 or self.download_kbps > 0 or self.upload_kbps > 0
+
+
+PROFILES: Dict[str, ThrottleProfile] = {
+    profile.name: profile
+    for profile in (
+        ThrottleProfile("none"),
+        ThrottleProfile("slow-3g", latency_ms=2000, download_kbps=400, upload_kbps=400),
+        # DevTools' former "Fast 3G" preset, renamed "Slow 4G"
+        ThrottleProfile("slow-4g", latency_ms=562.5, download_kbps=1440, upload_kbps=675),
+        ThrottleProfile("fast-4g", latency_ms=165, download_kbps=8100, upload_kbps=1350),
+        ThrottleProfile("cpu-4x", cpu_rate=4),
+        ThrottleProfile("mobile", latency_ms=562.5, download_kbps=1440, upload_kbps=675, cpu_rate=4),
+    )
+}
+
+
+def get_profile(name: str) -> ThrottleProfile:
+    """
+    Look up a profile by name.
+
+    Raises:
+        ValueError: For unknown names
+    """
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown throttle profile '{name}', expected one of {sorted(PROFILES)}") from None
+
+
+def _kbps_to_bytes_per_second(kbps: float) -> float:
+    return kbps * 1000 / 8 if kbps > 0 else -1
+
+
+def apply_profile(driver, profile: ThrottleProfile) -> None:
+    """
+    Throttle a Chrome session; the limits stay until ``clear_profile``.
+
+    Args:
+        driver: Chrome WebDriver
+        profile: Profile to apply
+    """
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.emulateNetworkConditions", {
+        "offline": False,
+        "latency": profile.latency_ms,
+        "downloadThroughput": _kbps_to_bytes_per_second(profile.download_kbps),
+        "uploadThroughput": _kbps_to_bytes_per_second(profile.upload_kbps),
+    })
+    driver.execute_cdp_cmd("Emulation.setCPUThrottlingRate", {"rate": profile.cpu_rate})
+    logger.info(f"🐢 Throttle profile '{profile.name}' applied")
+
+
+def clear_profile(driver) -> None:
+    """Remove network and CPU throttling (e.g. before a browser goes back to the pool)."""
+    apply_profile(driver, PROFILES["none"])
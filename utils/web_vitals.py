@@ -0,0 +1,264 @@
+"""
+Navigation Timing and Core Web Vitals per page-object transition.
+
+A collector script (PerformanceObserver for LCP, layout shifts, event
+timing and long tasks) is registered for every new document through CDP,
+or installed with buffered observers on the first harvest where CDP is not
+available. Page objects harvest the current document before each action
+(``BasePage._before_action``) and after each ``navigate_to``. A document
+belongs to the page object class that first harvested it; later harvests
+only update its metrics, so a page object constructed on (or navigating
+away from) an earlier document does not take it over. Every document is
+compared with its class's ``PERF_BUDGETS``, e.g.::
+
+    class HomePage(BasePage):
+        PERF_BUDGETS = {"lcp_ms": 2500, "cls": 0.1}
+
+Each harvest is one extra script round trip per click, type, scroll and
+navigation, so collection is off unless ``set_enabled(True)`` is called
+(``plugins.web_vitals`` does this for ``pytest --web-vitals``).
+"""
+import logging
+import weakref
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+_COLLECTOR_SCRIPT = """
+(function () {
+  if (window.__n11Vitals) { return; }
+  var v = window.__n11Vitals = {lcp: null, cls: 0, inp: null, longTasks: 0, longTaskMs: 0, observers: []};
+  function observe(type, onEntry, options) {
+    try {
+      var observer = new PerformanceObserver(function (list) { list.getEntries().forEach(onEntry); });
+      observer.observe(Object.assign({type: type, buffered: true}, options || {}));
+      v.observers.push([observer, onEntry]);
+    } catch (e) { /* entry type not supported by this browser */ }
+  }
+  observe('largest-contentful-paint', function (e) { v.lcp = e.renderTime || e.loadTime || e.startTime; });
+  observe('layout-shift', function (e) { if (!e.hadRecentInput) { v.cls += e.value; } });
+  observe('event', function (e) {
+    if (e.interactionId && (v.inp === null || e.duration > v.inp)) { v.inp = e.duration; }
+  }, {durationThreshold: 16});
+  observe('longtask', function (e) { v.longTasks += 1; v.longTaskMs += e.duration; });
+  try { performance.setResourceTimingBufferSize(1000); } catch (e) {}
+})();
+"""
+
+_HARVEST_SCRIPT = _COLLECTOR_SCRIPT + """
+var v = window.__n11Vitals;
+v.observers.forEach(function (pair) { pair[0].takeRecords().forEach(pair[1]); });
+var nav = performance.getEntriesByType('navigation')[0];
+var resources = performance.getEntriesByType('resource');
+var bytes = nav ? (nav.transferSize || 0) : 0;
+resources.forEach(function (r) { bytes += r.transferSize || 0; });
+return {
+  doc: String(performance.timeOrigin),
+  url: location.href,
+  ttfb: nav ? nav.responseStart : null,
+  dcl: nav && nav.domContentLoadedEventEnd ? nav.domContentLoadedEventEnd : null,
+  load: nav && nav.loadEventEnd ? nav.loadEventEnd : null,
+  lcp: v.lcp, cls: v.cls, inp: v.inp, longTasks: v.longTasks, longTaskMs: v.longTaskMs,
+  resources: resources.length, bytes: bytes
+};
+"""
+
+# Metrics a page class can put in PERF_BUDGETS (upper limits)
+BUDGET_METRICS = ("ttfb_ms", "dcl_ms", "load_ms", "lcp_ms", "cls", "inp_ms", "long_task_ms", "resources", "transfer_kb")
+
+_enabled = False
+
+
+def _ms(value) -> Optional[int]:
+    return round(value) if value is not None else None
+
+
+@dataclass
+class PageVitals:
+    """Timing and vitals of one document, attributed to a page object class."""
+
+    page: str
+    url: str
+    ttfb_ms: Optional[int] = None
+    dcl_ms: Optional[int] = None
+    load_ms: Optional[int] = None
+    lcp_ms: Optional[int] = None
+    cls: float = 0.0
+    inp_ms: Optional[int] = None
+    long_tasks: int = 0
+    long_task_ms: int = 0
+    resources: int = 0
+    transfer_kb: int = 0
+
+    @classmethod
+    def from_record(cls, page: str, record: dict) -> "PageVitals":
+        """Build from a harvest script result."""
+        return cls(
+            page=page,
+            url=record["url"],
+            ttfb_ms=_ms(record.get("ttfb")),
+            dcl_ms=_ms(record.get("dcl")),
+            load_ms=_ms(record.get("load")),
+            lcp_ms=_ms(record.get("lcp")),
+            cls=round(record.get("cls") or 0.0, 3),
+            inp_ms=_ms(record.get("inp")),
+            long_tasks=record.get("longTasks") or 0,
+            long_task_ms=_ms(record.get("longTaskMs")) or 0,
+            resources=record.get("resources") or 0,
+            transfer_kb=round((record.get("bytes") or 0) / 1024),
+        )
+
+    def as_dict(self) -> Dict:
+        return asdict(self)
+
+    def __str__(self) -> str:
+        parts = [f"{name} {getattr(self, name)}" for name in ("ttfb_ms", "lcp_ms", "cls", "inp_ms")
+                 if getattr(self, name) is not None]
+        return f"{self.page}: " + ", ".join(parts) + f", {self.resources} res/{self.transfer_kb} KB"
+
+
+@dataclass(frozen=True)
+class BudgetViolation:
+    """A metric of a page above its class budget."""
+
+    page: str
+    metric: str
+    value: float
+    budget: float
+
+    def __str__(self) -> str:
+        return f"{self.page} {self.metric} {self.value} > {self.budget}"
+
+
+def check_budgets(vitals: PageVitals, budgets: Dict[str, float]) -> List[BudgetViolation]:
+    """
+    Compare a page's metrics with its budgets.
+
+    Args:
+        vitals: Harvested metrics
+        budgets: Metric name -> upper limit (unknown names are ignored)
+
+    Returns:
+        List[BudgetViolation]: Metrics over budget (missing metrics never violate)
+    """
+    violations = []
+    for metric, budget in budgets.items():
+        value = getattr(vitals, metric, None) if metric in BUDGET_METRICS else None
+        if value is not None and value > budget:
+            violations.append(BudgetViolation(vitals.page, metric, value, budget))
+    return violations
+
+
+class VitalsTracker:
+    """Harvests and attributes the documents one driver visits."""
+
+    def __init__(self, driver):
+        """
+        Initialize VitalsTracker.
+
+        Args:
+            driver: WebDriver whose documents are tracked
+        """
+        self.driver = driver
+        self.logger = logging.getLogger(__name__)
+        self.page: Optional[str] = None
+        self.budgets: Dict[str, float] = {}
+        # Document id (performance.timeOrigin) -> (vitals, budgets of its page class)
+        self.records: Dict[str, Tuple[PageVitals, Dict[str, float]]] = {}
+        self._register_collector()
+
+    def _register_collector(self) -> None:
+        """Run the collector before page scripts of every new document (Chrome only)."""
+        try:
+            self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _COLLECTOR_SCRIPT})
+        except Exception as e:
+            self.logger.debug(f"Collector not registered through CDP, installing lazily: {e}")
+
+    def bind(self, page: str, budgets: Dict[str, float]) -> None:
+        """
+        Attribute the documents first harvested from now on to a page object class.
+
+        The current document's metrics are brought up to date for its owner
+        first; a document nobody has harvested yet (e.g. one a click just
+        loaded) is left for the new class.
+
+        Args:
+            page: Page object class name
+            budgets: The class's PERF_BUDGETS
+        """
+        if self.records:
+            self.harvest(claim=False)
+        self.page = page
+        self.budgets = dict(budgets)
+
+    def harvest(self, claim: bool = True) -> Optional[PageVitals]:
+        """
+        Read the current document's metrics. The first harvest of a document
+        attributes it to the bound page class; later harvests replace the
+        metrics (CLS and INP only grow) but keep the owner.
+
+        Args:
+            claim: Attribute a not yet recorded document to the bound class
+
+        Returns:
+            Optional[PageVitals]: Metrics, None for blank, unrecorded (without claim) or unreadable pages
+        """
+        if self.page is None:
+            return None
+        try:
+            record = self.driver.execute_script(_HARVEST_SCRIPT)
+        except Exception as e:
+            self.logger.debug(f"Could not harvest page metrics: {e}")
+            return None
+        if not record or not str(record.get("url", "")).startswith("http"):
+            return None
+        owner = self.records.get(record["doc"])
+        if owner is None and not claim:
+            return None
+        page, budgets = (owner[0].page, owner[1]) if owner else (self.page, self.budgets)
+        vitals = PageVitals.from_record(page, record)
+        self.records[record["doc"]] = (vitals, budgets)
+        return vitals
+
+    def collect(self) -> Tuple[List[PageVitals], List[BudgetViolation]]:
+        """
+        Harvest the current document and hand over everything recorded so far.
+
+        Returns:
+            Tuple[List[PageVitals], List[BudgetViolation]]: Documents in visit order and their budget violations
+        """
+        self.harvest()
+        records, self.records = list(self.records.values()), {}
+        vitals = [v for v, _ in records]
+        violations = [violation for v, budgets in records for violation in check_budgets(v, budgets)]
+        return vitals, violations
+
+
+_trackers: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def set_enabled(enabled: bool) -> None:
+    """Turn page metric collection on or off for drivers seen from now on."""
+    global _enabled
+    _enabled = enabled
+
+
+def bind_page(driver, page: str, budgets: Dict[str, float]) -> None:
+    """Attribute the driver's next documents to a page object class (no-op when disabled)."""
+    tracker = _trackers.get(driver)
+    if tracker is None:
+        if not _enabled:
+            return
+        tracker = _trackers[driver] = VitalsTracker(driver)
+    tracker.bind(page, budgets)
+
+
+def harvest_vitals(driver) -> Optional[PageVitals]:
+    """Harvest the driver's current document if it is tracked."""
+    tracker = _trackers.get(driver)
+    return tracker.harvest() if tracker is not None else None
+
+
+def collect_vitals(driver) -> Tuple[List[PageVitals], List[BudgetViolation]]:
+    """Hand over the driver's recorded documents (empty when untracked)."""
+    tracker = _trackers.get(driver)
+    return tracker.collect() if tracker is not None else ([], [])